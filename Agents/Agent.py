@@ -1,5 +1,6 @@
 # Agent.py
 from abc import ABC, abstractmethod
+from SimLogger import AgentLog
 
 class Agent(ABC):
     """
@@ -7,11 +8,14 @@ class Agent(ABC):
     Both LighthouseAgent and MazeAgent inherit from this.
     """
 
-    def __init__(self, name, env, start_pos):
+    def __init__(self, name, env, start_pos, verbose=True):
         self.name = name
         self.env = env
         self.x, self.y = start_pos
 
+        # Level-gated logger (see SimLogger); verbose=False silences this agent
+        self.log = AgentLog(name, verbose)
+
         # Register the agent in the environment
         self.env.add_agent(self)
 
@@ -69,19 +73,42 @@ class Agent(ABC):
         """
         pass
 
-    def _broadcast(self, msg):
+    def _broadcast(self, msg, topic="broadcast", radius=None):
+        """
+        Send a message to the other agents through the World's message bus
+        (see Environments/MessageBus.py). Delivery happens at the end of the
+        step; `topic` limits it to subscribers, `radius` to nearby agents.
+        """
+        self.env.bus.publish(self, msg, topic=topic, radius=radius)
+
+    def subscribe(self, topic):
+        self.env.bus.subscribe(self, topic)
+
+    # ------------------------------------------------------------------
+    # Scheduling hints (see Environments/Scheduler.EventScheduler)
+    # ------------------------------------------------------------------
+    def is_done(self):
+        """True when the agent will never act again (default: reached its goal)."""
+        return getattr(self, "reached_goal", False)
+
+    def is_idle(self):
+        """True when the agent can only resume after receiving a message."""
+        return False
+
+    def movimento_bloqueado(self, alvo):
         """
-        Send a message to all other agents in the environment.
+        Called by World.resolve_moves when the move to `alvo` decided in
+        age() was refused by a collision rule (simultaneous scheduling).
+        Agents that track their own moves should undo the last one here.
         """
-        for other in self.env.agents:
-            if other is not self:
-                other.comunica(msg, self)
+        pass
 
     # ------------------------------------------------------------------
     # Optional helper: update agent position (called by env after move)
     # ------------------------------------------------------------------
     def set_position(self, x, y):
         self.x, self.y = x, y
+        self.env.reindex_agent(self)
 
     def set_mode(self, mode):
         assert mode in ("train", "test")
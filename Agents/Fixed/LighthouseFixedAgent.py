@@ -1,6 +1,10 @@
 # LighthouseFixedAgent.py
 import random
 from Agents.Agent import Agent
+from Environments.World import MOVES8
+
+# Random-move candidates as indices into World.MOVES8: N, S, W, E, NW, NE, SW, SE
+_RANDOM_ORDER = (0, 1, 3, 2, 5, 4, 7, 6)
 
 class LighthouseFixedAgent(Agent):
     """
@@ -9,8 +13,8 @@ class LighthouseFixedAgent(Agent):
     caso contrário explora aleatoriamente incluindo diagonais.
     """
 
-    def __init__(self, name, env, start_pos):
-        super().__init__(name, env, start_pos)
+    def __init__(self, name, env, start_pos, verbose=True):
+        super().__init__(name, env, start_pos, verbose=verbose)
         self.reached_goal = False
         self.current_obs = None
         self.goal_known = None  # posição do farol quando detectado
@@ -25,7 +29,7 @@ class LighthouseFixedAgent(Agent):
     def observacao(self, obs):
         self.current_obs = obs
 
-        goals = obs.get("goals")
+        goals = getattr(obs, "goals", None)
         if goals:
             self.goal_known = goals[0]
 
@@ -53,12 +57,12 @@ class LighthouseFixedAgent(Agent):
         4) Nenhum movimento possível
         """
 
-        d = self.current_obs.get("direcao_farol")
-        print(f"   [{self.name}] Observed direction: {d}")
+        d = self.current_obs.direcao_farol
+        self.log.debug("Observed direction: %s", d)
 
         # Se no farol
         if d == "HERE":
-            print(f"   [{self.name}] 🎯 Reached lighthouse")
+            self.log.debug("🎯 Reached lighthouse")
             self.reached_goal = True
             return None
 
@@ -72,32 +76,30 @@ class LighthouseFixedAgent(Agent):
         # Regra 1 — mover direto
         # -------------------------------------------------
         if self.env.is_valid_position(*main):
-            print(f"   [{self.name}] Regra 1 → mover direto {main}")
+            self.log.debug("Regra 1 → mover direto %s", main)
             return main
         else:
-            print(f"   [{self.name}] Regra 1 BLOQUEADO {main}")
+            self.log.debug("Regra 1 BLOQUEADO %s", main)
 
         # -------------------------------------------------
         # Regra 2 — Movimento aleatório (8 direções)
         # -------------------------------------------------
-        print(f"   [{self.name}] Regra 2 → RANDOM")
+        self.log.debug("Regra 2 → RANDOM")
 
-        neighbors = [
-            (self.x - 1, self.y), (self.x + 1, self.y),
-            (self.x, self.y - 1), (self.x, self.y + 1),
-            (self.x - 1, self.y - 1), (self.x - 1, self.y + 1),
-            (self.x + 1, self.y - 1), (self.x + 1, self.y + 1)
+        mask = self.env.moves8(self.x, self.y)
+        valid = [
+            (self.x + MOVES8[bit][0], self.y + MOVES8[bit][1])
+            for bit in _RANDOM_ORDER if mask & (1 << bit)
         ]
-        valid = [n for n in neighbors if self.env.is_valid_position(*n)]
 
         if valid:
             choice = random.choice(valid)
-            print(f"   [{self.name}] RANDOM → {choice}")
+            self.log.debug("RANDOM → %s", choice)
             return choice
 
         # -------------------------------------------------
         # Sem movimentos válidos
         # -------------------------------------------------
-        print(f"   [{self.name}] ❌ Nenhum movimento possível")
+        self.log.debug("❌ Nenhum movimento possível")
         return None
 
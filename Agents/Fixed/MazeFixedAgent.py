@@ -19,8 +19,11 @@ class MazeFixedAgent(Agent):
       - no coordinates exchanged, all movement-only communication.
     """
 
-    def __init__(self, name, env, start_pos):
-        super().__init__(name, env, start_pos)
+    # Bit of each direction in World.moves4 masks (MOVES4 order)
+    _DIR_BIT = {"up": 1, "down": 2, "left": 4, "right": 8}
+
+    def __init__(self, name, env, start_pos, verbose=True):
+        super().__init__(name, env, start_pos, verbose=verbose)
 
         self.reached_goal = False
         self.current_obs = None
@@ -31,38 +34,42 @@ class MazeFixedAgent(Agent):
         self.planned_moves = deque()
         self.visited = set()
 
+        # how the last age() changed path_from_start / planned_moves,
+        # so a move refused by the scheduler can be undone
+        self._last_step = None
+
     # ------------------------------------------------------------
     # OBSERVATION
     # ------------------------------------------------------------
     def observacao(self, obs):
         self.current_obs = obs
-        pos = obs.get("posicao")
+        pos = obs.posicao
 
-        print(f"   [{self.name}] OBS → pos={pos}, mode={self.mode}")
+        self.log.debug("OBS → pos=%s, mode=%s", pos, self.mode)
 
         if pos is not None:
             self.visited.add(pos)
 
         # Goal detection (standing on the goal)
-        goals = obs.get("goals", [])
+        goals = obs.goals
         if goals and pos == goals[0]:
             if not self.reached_goal:
-                print(f"   [{self.name}] 🎯 Reached goal!")
+                self.log.debug("🎯 Reached goal!")
             self.reached_goal = True
 
     # ------------------------------------------------------------
     # COMMUNICATION: prefix alignment + backtracking + suffix
     # ------------------------------------------------------------
     def comunica(self, mensagem, de_agente):
-        print(f"   [{self.name}] 📩 Received message from {de_agente.name}: {mensagem}")
+        self.log.debug("📩 Received message from %s: %s", de_agente.name, mensagem)
 
         if "path_from_start_to_goal" not in mensagem:
             return
 
         goal_path = mensagem["path_from_start_to_goal"]
 
-        print(f"   [{self.name}] ✔ Received goal-path: {goal_path}")
-        print(f"   [{self.name}] 🔍 My own path so far: {self.path_from_start}")
+        self.log.debug("✔ Received goal-path: %s", goal_path)
+        self.log.debug("🔍 My own path so far: %s", self.path_from_start)
 
         # Compute the common prefix
         prefix_len = 0
@@ -72,15 +79,15 @@ class MazeFixedAgent(Agent):
             else:
                 break
 
-        print(f"   [{self.name}] 📏 Common prefix length = {prefix_len}")
+        self.log.debug("📏 Common prefix length = %s", prefix_len)
 
         my_suffix   = self.path_from_start[prefix_len:]
         goal_suffix = goal_path[prefix_len:]
 
         # Reverse my_suffix for backtracking
         backtrack_moves = [self._opposite(d) for d in reversed(my_suffix)]
-        print(f"   [{self.name}] 🔄 Backtracking moves to rejoin partner path: {backtrack_moves}")
-        print(f"   [{self.name}] 🧭 Then follow partner suffix: {goal_suffix}")
+        self.log.debug("🔄 Backtracking moves to rejoin partner path: %s", backtrack_moves)
+        self.log.debug("🧭 Then follow partner suffix: %s", goal_suffix)
 
         # Combined plan
         full_plan = backtrack_moves + goal_suffix
@@ -88,43 +95,40 @@ class MazeFixedAgent(Agent):
         self.planned_moves = deque(full_plan)
         self.mode = "follow_plan"
 
-        print(f"   [{self.name}] ✅ Loaded plan of {len(full_plan)} moves.")
+        self.log.debug("✅ Loaded plan of %s moves.", len(full_plan))
 
     # ------------------------------------------------------------
     # DECISION (with priority goal-adjacency detection)
     # ------------------------------------------------------------
     def age(self):
+        self._last_step = None
 
         # ---------------- PRIORITY: goal adjacent check ----------------
-        goals = self.current_obs.get("goals", [])
+        goals = self.current_obs.goals
         if goals and not self.reached_goal:
             gx, gy = goals[0]
-            x, y = self.current_obs["posicao"]
+            x, y = self.current_obs.posicao
 
             if (x-1, y) == (gx, gy):
-                print(f"   [{self.name}] 🎯 Goal detected UP — stepping into goal!")
-                self.path_from_start.append("up")
-                return self._apply_dir("up")
+                self.log.debug("🎯 Goal detected UP — stepping into goal!")
+                return self._push("up")
 
             if (x+1, y) == (gx, gy):
-                print(f"   [{self.name}] 🎯 Goal detected DOWN — stepping into goal!")
-                self.path_from_start.append("down")
-                return self._apply_dir("down")
+                self.log.debug("🎯 Goal detected DOWN — stepping into goal!")
+                return self._push("down")
 
             if (x, y-1) == (gx, gy):
-                print(f"   [{self.name}] 🎯 Goal detected LEFT — stepping into goal!")
-                self.path_from_start.append("left")
-                return self._apply_dir("left")
+                self.log.debug("🎯 Goal detected LEFT — stepping into goal!")
+                return self._push("left")
 
             if (x, y+1) == (gx, gy):
-                print(f"   [{self.name}] 🎯 Goal detected RIGHT — stepping into goal!")
-                self.path_from_start.append("right")
-                return self._apply_dir("right")
+                self.log.debug("🎯 Goal detected RIGHT — stepping into goal!")
+                return self._push("right")
 
         # ---------------- Standing on the goal ----------------
         if self.reached_goal:
             if self.mode == "explore":
-                print(f"   [{self.name}] 📨 Broadcasting found-path: {self.path_from_start}")
+                self.log.debug("📨 Broadcasting found-path: %s", self.path_from_start)
                 self._broadcast({"path_from_start_to_goal": list(self.path_from_start)})
                 self.mode = "wait"
             return None
@@ -133,11 +137,12 @@ class MazeFixedAgent(Agent):
         if self.mode == "follow_plan":
             if self.planned_moves:
                 direction = self.planned_moves.popleft()
-                print(f"   [{self.name}] 🧭 Following planned step: {direction}")
-                self.path_from_start.append(direction)
-                return self._apply_dir(direction)
+                self.log.debug("🧭 Following planned step: %s", direction)
+                move = self._push(direction)
+                self._last_step = ("plan", direction)
+                return move
             else:
-                print(f"   [{self.name}] ✅ Finished executing plan. Entering WAIT mode.")
+                self.log.debug("✅ Finished executing plan. Entering WAIT mode.")
                 self.mode = "wait"
                 return None
 
@@ -148,9 +153,9 @@ class MazeFixedAgent(Agent):
     # EXPLORATION (DFS)
     # ------------------------------------------------------------
     def _explore_step(self):
-        x, y = self.current_obs["posicao"]
+        x, y = self.current_obs.posicao
 
-        print(f"   [{self.name}] 🔍 Exploring from {(x, y)}")
+        self.log.debug("🔍 Exploring from %s", (x, y))
 
         directions = [
             ("up",    (x - 1, y)),
@@ -162,25 +167,58 @@ class MazeFixedAgent(Agent):
         random.shuffle(directions)
 
         # Prefer unvisited, non-blocked cells
+        free = self.env.moves4(x, y)
         for d, (nx, ny) in directions:
-            if not self.env.is_blocked(nx, ny) and (nx, ny) not in self.visited:
-                print(f"   [{self.name}] ➡ NEW move: {d}")
-                self.path_from_start.append(d)
+            if free & self._DIR_BIT[d] and (nx, ny) not in self.visited:
+                self.log.debug("➡ NEW move: %s", d)
+                self._push(d)
                 return (nx, ny)
 
         # Backtracking
         if self.path_from_start:
             last = self.path_from_start.pop()
             reverse = self._opposite(last)
-            print(f"   [{self.name}] ↩ Backtracking: {last} → {reverse}")
+            self.log.debug("↩ Backtracking: %s → %s", last, reverse)
+            self._last_step = ("pop", last)
             return self._apply_dir(reverse)
 
-        print(f"   [{self.name}] ❌ No moves left")
+        self.log.debug("❌ No moves left")
         return None
 
+    # ------------------------------------------------------------
+    # SCHEDULING: done once the found path was broadcast; idle while
+    # waiting for a partner's path
+    # ------------------------------------------------------------
+    def is_done(self):
+        return self.reached_goal and self.mode != "explore"
+
+    def is_idle(self):
+        return self.mode == "wait" and not self.reached_goal
+
+    # ------------------------------------------------------------
+    # BLOCKED MOVE (simultaneous scheduler): undo the bookkeeping
+    # ------------------------------------------------------------
+    def movimento_bloqueado(self, alvo):
+        step, self._last_step = self._last_step, None
+        if step is None:
+            return
+        kind, direction = step
+        self.log.debug("⛔ Move to %s blocked, undoing %s %s", alvo, kind, direction)
+        if kind == "pop":
+            self.path_from_start.append(direction)
+            return
+        self.path_from_start.pop()
+        if kind == "plan":
+            self.planned_moves.appendleft(direction)
+
     # ------------------------------------------------------------
     # HELPERS
     # ------------------------------------------------------------
+    def _push(self, direction):
+        self.path_from_start.append(direction)
+        self._last_step = ("push", direction)
+        return self._apply_dir(direction)
+
     def _apply_dir(self, direction):
         if direction == "up":
             return (self.x - 1, self.y)
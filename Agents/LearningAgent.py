@@ -38,6 +38,7 @@ class LearningAgent(Agent):
         # reward shapers may use this
         if hasattr(self, "visited_positions"):
             self.visited_positions.clear()
+        self.goal_distance = None
 
         # recurrent genome brain
         if hasattr(self.brain, "reset") and callable(getattr(self.brain, "reset")):
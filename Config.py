@@ -16,8 +16,10 @@ MAZE_MAP  = os.path.join(BASE_DIR, "Resources", MAZE_MAP_NAME)
 # ----------------------------
 # Output files (keep consistent)
 # ----------------------------
-FAROL_POLICY = os.path.join(BASE_DIR, "policy_farol.json")
-MAZE_POLICY  = os.path.join(BASE_DIR, "policy_maze.json")
+# Q policies: binary .qpol (Learning/Brains/PolicyFile.py); old JSON policies
+# convert with: python -m Learning.Brains.PolicyFile policy_farol.json
+FAROL_POLICY = os.path.join(BASE_DIR, "policy_farol.qpol")
+MAZE_POLICY  = os.path.join(BASE_DIR, "policy_maze.qpol")
 
 FAROL_GENOME = os.path.join(BASE_DIR, "farol_best_genome.txt")
 MAZE_GENOME  = os.path.join(BASE_DIR, "maze_best_genome.txt")
@@ -38,6 +40,17 @@ Q_ALPHA     = 0.3
 Q_GAMMA     = 0.95
 Q_EPSILON   = 0.2
 
+# Q-table backend: "dict" (dict of dicts) or "numpy" (integer-indexed matrix,
+# much smaller and faster on big maps with include_position=True)
+Q_BACKEND   = "dict"
+
+# Q-learning state encoding: "tuple" (float tuples) or "packed" (one int per
+# state: smaller policy files, faster hashing). Train and evaluate with the same.
+Q_STATE_ENCODING = "tuple"
+
+# Batched trainer (Training/TrainQLearningVec.py): environments in lockstep
+Q_VEC_ENVS  = 256
+
 # ----------------------------
 # Evolution hyperparameters (generic)
 # ----------------------------
@@ -0,0 +1,220 @@
+# Environments/BinaryMap.py
+"""
+Compact binary map format (.smap), alongside the JSON maps in Resources/.
+
+Layout of the file (little-endian):
+
+    magic        4s   b"SMAP"
+    version      H    2 (version 1 files, without the two fields below, still load)
+    height       I
+    width        I
+    n_goals      I
+    n_starts     I
+    grid_offset  Q    start of the grid, 64-byte aligned
+    dist_offset  Q    start of the distance fields, 64-byte aligned (0 = none)
+    dist_moves   B    which fields follow: bit 0 = 4-neighbourhood, bit 1 = 8
+    goals        n_goals  x (i, i)
+    starts       n_starts x (H name_len, name utf-8, i x, i y)
+    ...padding...
+    grid         height*width bytes, one per cell (row-major, x*width+y),
+                 with the Layout flags (OBSTACLE | GOAL)
+    ...padding...
+    distances    per field in dist_moves (4 first): height*width int32,
+                 moves to the nearest goal, -1 = unreachable (64-byte aligned)
+
+The grid is exactly Layout.grid, so load_binary_map memory-maps the file
+and hands the mapped bytes to the Layout without copying: any number of
+processes opening the same map share the page cache. Stored distance
+fields become the Layout's distance cache the same way.
+
+Usage:
+    python -m Environments.BinaryMap                 # convert Resources/*.json
+    python -m Environments.BinaryMap a.json b.json   # convert given files
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from Environments.Layout import Layout, GOAL
+
+MAGIC = b"SMAP"
+VERSION = 2
+EXTENSION = ".smap"
+
+_HEADER = struct.Struct("<4sHIIIIQ")
+_HEADER_V2 = struct.Struct("<QB")       # follows _HEADER from version 2 on
+_MOVE_BITS = ((4, 1), (8, 2))
+_PAIR = struct.Struct("<ii")
+_NAME_LEN = struct.Struct("<H")
+_ALIGN = 64
+
+
+def is_binary_map(filename):
+    """True if `filename` starts with the binary map magic."""
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ---------------------------------------------------------
+# WRITE
+# ---------------------------------------------------------
+def _align(n):
+    return n + (-n % _ALIGN)
+
+
+def save_binary_map(path, height, width, goals, start_positions, obstacles=None, grid=None,
+                    distances=()):
+    """
+    Write a map. The walls come either from `obstacles` (iterable of (x, y))
+    or from `grid` (height*width bytes, non-zero OBSTACLE bit = wall), which
+    avoids ever building a set of wall tuples for large generated maps.
+    `distances` lists the BFS distance-to-goal fields to store (4 and/or 8),
+    or maps them to fields already computed ({moves: field}).
+    """
+    if grid is None:
+        grid = Layout(height, width, goals=goals, obstacles=obstacles or []).grid
+    else:
+        if len(grid) != height * width:
+            raise ValueError(f"grid has {len(grid)} cells, expected {height * width}")
+        cells = bytearray(grid)
+        for gx, gy in goals:
+            if 0 <= gx < height and 0 <= gy < width:
+                cells[gx * width + gy] |= GOAL
+        grid = cells
+
+    meta = bytearray()
+    for gx, gy in goals:
+        meta += _PAIR.pack(gx, gy)
+    for name, (sx, sy) in start_positions.items():
+        raw = str(name).encode("utf-8")
+        meta += _NAME_LEN.pack(len(raw)) + raw + _PAIR.pack(sx, sy)
+
+    fields = []
+    dist_moves = 0
+    if distances:
+        if not isinstance(distances, dict):
+            layout = Layout(height, width, goals=goals, grid=bytes(grid))
+            distances = {moves: layout.distance_field(moves) for moves in distances}
+        for moves, bit in _MOVE_BITS:
+            if moves in distances:
+                field = array("i", distances[moves])
+                if sys.byteorder == "big":
+                    field.byteswap()
+                fields.append(field)
+                dist_moves |= bit
+
+    head_size = _HEADER.size + _HEADER_V2.size
+    grid_offset = _align(head_size + len(meta))
+    dist_offset = _align(grid_offset + height * width) if fields else 0
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, height, width, len(goals), len(start_positions), grid_offset
+    ) + _HEADER_V2.pack(dist_offset, dist_moves)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(b"\0" * (grid_offset - head_size - len(meta)))
+        f.write(grid)
+        pos = grid_offset + height * width
+        for field in fields:
+            f.write(b"\0" * (_align(pos) - pos))
+            f.write(field.tobytes())
+            pos = _align(pos) + 4 * height * width
+
+    return path
+
+
+# ---------------------------------------------------------
+# READ (zero-copy)
+# ---------------------------------------------------------
+def load_binary_map(path):
+    """
+    Memory-map a binary map.
+    Returns (layout, start_positions, goals) where start_positions is
+    {name: [x, y]} like the JSON maps and goals is a list of (x, y).
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, height, width, n_goals, n_starts, grid_offset = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary map file")
+    if version not in (1, VERSION):
+        raise ValueError(f"{path}: unsupported binary map version {version}")
+
+    p = _HEADER.size
+    dist_offset = dist_moves = 0
+    if version >= 2:
+        dist_offset, dist_moves = _HEADER_V2.unpack_from(mm, p)
+        p += _HEADER_V2.size
+    goals = []
+    for _ in range(n_goals):
+        goals.append(_PAIR.unpack_from(mm, p))
+        p += _PAIR.size
+
+    start_positions = {}
+    for _ in range(n_starts):
+        (n,) = _NAME_LEN.unpack_from(mm, p)
+        p += _NAME_LEN.size
+        name = bytes(mm[p:p + n]).decode("utf-8")
+        p += n
+        start_positions[name] = list(_PAIR.unpack_from(mm, p))
+        p += _PAIR.size
+
+    n = height * width
+    grid = memoryview(mm)[grid_offset:grid_offset + n]
+
+    distances = {}
+    pos = dist_offset
+    for moves, bit in _MOVE_BITS:
+        if dist_moves & bit:
+            raw = memoryview(mm)[pos:pos + 4 * n]
+            if sys.byteorder == "little":
+                distances[moves] = raw.cast("i")
+            else:
+                field = array("i", raw)
+                field.byteswap()
+                distances[moves] = field
+            pos = _align(pos + 4 * n)
+
+    layout = Layout(height, width, goals=goals, grid=grid, distances=distances)
+
+    return layout, start_positions, goals
+
+
+# ---------------------------------------------------------
+# CONVERTER
+# ---------------------------------------------------------
+def convert_json_map(json_path, out_path=None, distances=(4, 8)):
+    """
+    Convert a Resources/*.json map into the binary format (same name, .smap),
+    with its distance-to-goal fields.
+    """
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + EXTENSION
+
+    return save_binary_map(
+        out_path,
+        height=data["height"],
+        width=data["width"],
+        goals=[tuple(g) for g in data["goals"]],
+        start_positions=data["start_positions"],
+        obstacles=[tuple(o) for o in data["obstacles"]],
+        distances=distances,
+    )
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or sorted(
+        glob.glob(os.path.join(os.path.dirname(os.path.dirname(__file__)), "Resources", "*.json"))
+    )
+    for p in paths:
+        print(f"[BinaryMap] {p} -> {convert_json_map(p)}")
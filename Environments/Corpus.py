@@ -0,0 +1,115 @@
+# Environments/Corpus.py
+"""
+Lazy reader for map corpora written by GenerateCorpus.py.
+
+    corpus = MapCorpus("Resources/corpus_maze")
+    for record, env, starts, goals, obstacles in corpus.maps(limit=1000):
+        ...
+
+Only the index line being used is parsed and each map is memory-mapped
+when its turn comes, so a corpus of any size streams in constant memory.
+Each map comes back exactly like load_fixed_map of its kind (Maze or
+Lighthouse), plus its index record (seed, size, shortest_path, ...).
+
+Trainers take corpus=<folder> and draw their maps from corpus_maps: one
+map per episode (Q-learning), per generation (evolution) or per batch of
+environments (batched Q-learning), cycling through the index.
+"""
+import json
+import os
+import random
+
+INDEX = "index.jsonl"
+MANIFEST = "corpus.json"
+
+
+class MapCorpus:
+
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX)
+        if not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"{root} has no {INDEX} (run GenerateCorpus.py first)")
+
+        with open(os.path.join(root, MANIFEST), "r") as f:
+            self.params = json.load(f)
+        self.kind = self.params["kind"]
+
+    # ------------------------------------------------------------
+    # INDEX
+    # ------------------------------------------------------------
+    def records(self, where=None):
+        """Yield index records one by one (optionally only those where(record) is true)."""
+        with open(self.index_path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return      # torn last line of an interrupted run
+                if where is None or where(record):
+                    yield record
+
+    def __len__(self):
+        return sum(1 for _ in self.records())
+
+    def sample(self, n, rng=None, where=None):
+        """n records chosen uniformly in one pass (reservoir sampling)."""
+        rng = rng or random
+        chosen = []
+        for i, record in enumerate(self.records(where)):
+            if i < n:
+                chosen.append(record)
+            else:
+                j = rng.randrange(i + 1)
+                if j < n:
+                    chosen[j] = record
+        return chosen
+
+    # ------------------------------------------------------------
+    # MAPS
+    # ------------------------------------------------------------
+    def path(self, record):
+        return os.path.join(self.root, record["file"])
+
+    def load(self, record):
+        """(env, start_positions, goal(s), obstacles) as load_fixed_map returns them."""
+        if self.kind == "maze":
+            from Environments.Maze import load_fixed_map
+        else:
+            from Environments.Lighthouse import load_fixed_map
+        return load_fixed_map(self.path(record))
+
+    def maps(self, records=None, limit=None, where=None):
+        """Yield (record, env, start_positions, goal(s), obstacles), loading each map lazily."""
+        if records is None:
+            records = self.records(where)
+        for i, record in enumerate(records):
+            if limit is not None and i >= limit:
+                return
+            yield (record,) + tuple(self.load(record))
+
+    def __iter__(self):
+        return self.maps()
+
+
+def corpus_maps(corpus, kind=None, where=None):
+    """
+    Endless stream of (env, start_positions, goal(s), obstacles) for the
+    trainers: one map per next(), in index order, starting over at the end.
+    corpus is a MapCorpus or its folder; its kind must match `kind`.
+    """
+    if not isinstance(corpus, MapCorpus):
+        corpus = MapCorpus(corpus)
+    if kind is not None and corpus.kind != kind:
+        raise ValueError(f"{corpus.root} holds {corpus.kind} maps, not {kind} maps")
+    if next(corpus.records(where), None) is None:
+        raise ValueError(f"{corpus.root} has no maps to train on")
+
+    def stream():
+        while True:
+            for _, env, starts, goals, obstacles in corpus.maps(where=where):
+                yield env, starts, goals, obstacles
+
+    return stream()
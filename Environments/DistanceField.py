@@ -0,0 +1,62 @@
+# Environments/DistanceField.py
+"""
+Breadth-first distance fields over a Layout.
+
+    dist = bfs_distance_field(layout, [goal])
+    dist[x * layout.width + y]   # steps to the nearest source, UNREACHABLE if cut off
+
+One multi-source BFS answers "is this cell reachable" and "how far is it"
+for every cell at once, instead of one search per (start, goal) pair.
+The search only touches the cells it reaches (plus one allocation of the
+result array), so a source walled into a small pocket is cheap.
+"""
+from array import array
+from collections import deque
+
+from Environments.Layout import OBSTACLE, MOVES4, MOVES8
+
+UNREACHABLE = -1
+
+
+def bfs_distance_field(layout, sources, moves=4, order=None):
+    """
+    Distance (in moves) from every cell to the nearest of `sources`,
+    as an array('i') indexed like layout.grid. `moves` is 4 or 8
+    (neighbourhood of MOVES4 / MOVES8). Sources on walls are ignored.
+
+    If `order` is a list, the reached cell indices are appended to it in
+    BFS order (non-decreasing distance), so callers can walk the reachable
+    region without scanning the whole grid.
+    """
+    if moves not in (4, 8):
+        raise ValueError("moves must be 4 or 8")
+    h, w = layout.height, layout.width
+    deltas = MOVES4 if moves == 4 else MOVES8
+    grid = layout.grid
+
+    dist = array("i", [UNREACHABLE]) * (h * w)
+    q = deque()
+    for x, y in sources:
+        if 0 <= x < h and 0 <= y < w:
+            i = x * w + y
+            if dist[i] == UNREACHABLE and not grid[i] & OBSTACLE:
+                dist[i] = 0
+                q.append(i)
+
+    pop, push = q.popleft, q.append
+    record = order.append if order is not None else None
+    while q:
+        i = pop()
+        if record:
+            record(i)
+        d = dist[i] + 1
+        x, y = divmod(i, w)
+        for dx, dy in deltas:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < h and 0 <= ny < w:
+                j = nx * w + ny
+                if dist[j] == UNREACHABLE and not grid[j] & OBSTACLE:
+                    dist[j] = d
+                    push(j)
+
+    return dist
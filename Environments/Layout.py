@@ -0,0 +1,206 @@
+# Environments/Layout.py
+from collections.abc import Set
+
+# ------------------------------------------------------------
+# Cell flags of the flat occupancy grid (one byte per cell)
+# ------------------------------------------------------------
+OBSTACLE = 1
+GOAL = 2
+
+# ------------------------------------------------------------
+# Move tables: bit i of a cell's mask is set when MOVESn[i] leads
+# to a free, in-bounds cell. The orders match the adapters' ACTIONS.
+# ------------------------------------------------------------
+MOVES4 = ((-1, 0), (1, 0), (0, -1), (0, 1))     # up, down, left, right
+MOVES8 = (
+    (-1, 0), (1, 0), (0, 1), (0, -1),           # N, S, E, W
+    (-1, 1), (-1, -1), (1, 1), (1, -1),         # NE, NW, SE, SW
+)
+
+
+class CellSetView(Set):
+    """
+    Read-only set view over the grid cells that carry a given flag.
+    Membership is O(1); iterating scans the grid.
+    """
+
+    __slots__ = ("_grid", "_height", "_width", "_flag")
+
+    def __init__(self, grid, height, width, flag):
+        self._grid = grid
+        self._height = height
+        self._width = width
+        self._flag = flag
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # set operations (&, |, -) return plain sets
+        return set(it)
+
+    def __contains__(self, pos):
+        try:
+            x, y = pos
+        except (TypeError, ValueError):
+            return False
+        if x < 0 or y < 0 or x >= self._height or y >= self._width:
+            return False
+        return (self._grid[x * self._width + y] & self._flag) != 0
+
+    def __iter__(self):
+        w = self._width
+        flag = self._flag
+        for i, v in enumerate(self._grid):
+            if v & flag:
+                yield divmod(i, w)
+
+    def __len__(self):
+        flag = self._flag
+        return sum(1 for v in self._grid if v & flag)
+
+    def __repr__(self):
+        return f"CellSetView({set(self)!r})"
+
+
+class Layout:
+    """
+    Static, immutable part of a World: size, walls, goals and the tables
+    derived from them. One Layout is shared by every World built on the
+    same map, so cloning a World never copies the walls.
+
+    `grid` is a read-only row-major buffer (index x*width+y) with
+    OBSTACLE/GOAL flags per cell. Changing the layout means building a new
+    one (with_obstacle / with_obstacles / with_goals).
+    """
+
+    __slots__ = ("height", "width", "grid", "goals", "_moves4", "_moves8", "_observations",
+                 "_distances")
+
+    def __init__(self, height, width, goals=None, obstacles=None, grid=None, distances=None):
+        self.height = height
+        self.width = width
+
+        if grid is None:
+            cells = bytearray(height * width)
+            _set_flag(cells, height, width, GOAL, goals or [])
+            _set_flag(cells, height, width, OBSTACLE, obstacles or [])
+            grid = bytes(cells)
+        elif len(grid) != height * width:
+            raise ValueError(f"grid has {len(grid)} cells, expected {height * width}")
+
+        self.grid = grid
+        self.goals = frozenset(tuple(g) for g in goals) if goals is not None else self._scan_goals()
+
+        self._moves4 = None
+        self._moves8 = None
+        self._observations = {}
+        # {4 or 8: distance field}, precomputed (e.g. read from a .smap) or lazy
+        self._distances = dict(distances) if distances else {}
+
+    def _scan_goals(self):
+        return frozenset(CellSetView(self.grid, self.height, self.width, GOAL))
+
+    # ------------------------------------------------------------
+    # VIEWS
+    # ------------------------------------------------------------
+    @property
+    def obstacles(self):
+        return CellSetView(self.grid, self.height, self.width, OBSTACLE)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.height and 0 <= y < self.width
+
+    # ------------------------------------------------------------
+    # COPY-ON-WRITE UPDATES
+    # ------------------------------------------------------------
+    def with_obstacles(self, cells):
+        return Layout(self.height, self.width, goals=self.goals, obstacles=list(cells))
+
+    def with_goals(self, cells):
+        return Layout(self.height, self.width, goals=list(cells), obstacles=self.obstacles)
+
+    def with_obstacle(self, x, y, blocked=True):
+        """New layout with (x, y) added/removed as obstacle. Out-of-bounds cells are ignored."""
+        if not self.in_bounds(x, y):
+            return self
+        cells = bytearray(self.grid)
+        i = x * self.width + y
+        if blocked:
+            cells[i] |= OBSTACLE
+        else:
+            cells[i] &= ~OBSTACLE & 0xFF
+        return Layout(self.height, self.width, goals=self.goals, grid=bytes(cells))
+
+    # ------------------------------------------------------------
+    # OBSERVATION CACHE (see World.observacaoPara)
+    # ------------------------------------------------------------
+    def observation_cache(self, mode):
+        """
+        Per-mode dict {cell index: observation} filled lazily by
+        World.observacaoPara (only visited cells are ever stored).
+        """
+        cache = self._observations.get(mode)
+        if cache is None:
+            cache = self._observations[mode] = {}
+        return cache
+
+    # ------------------------------------------------------------
+    # DISTANCE TO THE GOALS (built lazily, once per layout)
+    # ------------------------------------------------------------
+    def distance_field(self, moves=4):
+        """
+        Moves from every cell to the nearest goal (4- or 8-neighbourhood),
+        indexed like grid; -1 for walls and cells that cannot reach a goal.
+        """
+        field = self._distances.get(moves)
+        if field is None:
+            from Environments.DistanceField import bfs_distance_field
+            field = self._distances[moves] = bfs_distance_field(self, self.goals, moves)
+        return field
+
+    def distance(self, x, y, moves=4):
+        """Moves from (x, y) to the nearest goal, -1 if unreachable or off-grid."""
+        if x < 0 or y < 0 or x >= self.height or y >= self.width:
+            return -1
+        return self.distance_field(moves)[x * self.width + y]
+
+    # ------------------------------------------------------------
+    # MOVE TABLES (built lazily, once per layout)
+    # ------------------------------------------------------------
+    def moves4(self, x, y):
+        """Bitmask of free 4-neighbours of (x, y), in MOVES4 order (0 if off-grid)."""
+        if x < 0 or y < 0 or x >= self.height or y >= self.width:
+            return 0
+        if self._moves4 is None:
+            self._moves4 = self._build_move_table(MOVES4)
+        return self._moves4[x * self.width + y]
+
+    def moves8(self, x, y):
+        """Bitmask of free 8-neighbours of (x, y), in MOVES8 order (0 if off-grid)."""
+        if x < 0 or y < 0 or x >= self.height or y >= self.width:
+            return 0
+        if self._moves8 is None:
+            self._moves8 = self._build_move_table(MOVES8)
+        return self._moves8[x * self.width + y]
+
+    def _build_move_table(self, moves):
+        h, w = self.height, self.width
+        grid = self.grid
+        table = bytearray(h * w)
+
+        for bit, (dx, dy) in enumerate(moves):
+            b = 1 << bit
+            for x in range(max(0, -dx), min(h, h - dx)):
+                row = x * w
+                nrow = (x + dx) * w + dy
+                for y in range(max(0, -dy), min(w, w - dy)):
+                    if not grid[nrow + y] & OBSTACLE:
+                        table[row + y] |= b
+
+        return bytes(table)
+
+
+def _set_flag(cells, height, width, flag, positions):
+    """Set `flag` on every in-bounds position of `positions`."""
+    for x, y in positions:
+        if 0 <= x < height and 0 <= y < width:
+            cells[x * width + y] |= flag
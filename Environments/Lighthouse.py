@@ -4,6 +4,10 @@ import json
 from collections import deque
 
 from Environments.World import World
+from Environments.Layout import Layout, OBSTACLE
+from Environments.DistanceField import bfs_distance_field
+from Environments.BinaryMap import is_binary_map, load_binary_map
+from Environments import MapRegistry
 from Agents.Fixed.LighthouseFixedAgent import LighthouseFixedAgent
 
 # ---------------------------------------------------------
@@ -18,7 +22,7 @@ MIN_START_DIST = 14
 # ---------------------------------------------------------
 # BFS – verifica se existe caminho até ao farol
 # ---------------------------------------------------------
-def is_reachable(start, goal, obstacles):
+def is_reachable(start, goal, obstacles, height=HEIGHT, width=WIDTH):
     q = deque([start])
     visited = {start}
 
@@ -30,8 +34,8 @@ def is_reachable(start, goal, obstacles):
 
         for nx, ny in [(x-1, y), (x+1, y), (x, y-1), (x, y+1)]:
             if (
-                0 <= nx < HEIGHT and
-                0 <= ny < WIDTH and
+                0 <= nx < height and
+                0 <= ny < width and
                 (nx, ny) not in obstacles and
                 (nx, ny) not in visited
             ):
@@ -45,6 +49,12 @@ def is_reachable(start, goal, obstacles):
 # 1) Carregar mapa FIXO do JSON
 # ---------------------------------------------------------
 def load_fixed_map(filename):
+    """Load a JSON map, or a binary .smap map (memory-mapped, see BinaryMap)."""
+    if is_binary_map(filename):
+        layout, start_positions, goals = load_binary_map(filename)
+        env = World(mode="farol", layout=layout)
+        return env, start_positions, goals[0], env.obstacles
+
     with open(filename, "r") as f:
         data = json.load(f)
 
@@ -64,57 +74,80 @@ def load_fixed_map(filename):
     return env, data["start_positions"], goals[0], obstacles
 
 
+def load_cached_map(filename):
+    """
+    Same as load_fixed_map, but the file is parsed only once per process
+    (until it changes on disk); each call returns a fresh World.
+    """
+    return MapRegistry.load_cached(filename, load_fixed_map)
+
+
 # ---------------------------------------------------------
 # 2) Gerar mapa RANDOM para FixedAgent
 # ---------------------------------------------------------
-def generate_random_map():
-    all_cells = [(x, y) for x in range(HEIGHT) for y in range(WIDTH)]
-    total_cells = HEIGHT * WIDTH
-    num_obstacles = int(total_cells * OBSTACLE_RATIO)
+def generate_random_map(height=HEIGHT, width=WIDTH, obstacle_ratio=OBSTACLE_RATIO,
+                        min_start_dist=MIN_START_DIST, n_starts=2, rng=None, goal_tries=64):
+    """
+    Random farol map: obstacle_ratio of the cells as walls, a goal on a free
+    cell and n_starts distinct starts ("A", "B", ...) that can reach the
+    goal and are at Manhattan distance >= min_start_dist from it.
+
+    Per candidate goal, one BFS from the goal gives every reachable cell and
+    the starts are drawn directly from the valid ones. Each obstacle sample
+    is tried with up to goal_tries goals; pockets of free cells too small
+    or too narrow for any goal in them to work are never searched twice.
+    """
+    rng = rng or random
+    total = height * width
+    num_obstacles = int(total * obstacle_ratio)
+    if not 1 <= n_starts <= 26:
+        raise ValueError(f"n_starts must be between 1 and 26 (starts are labelled A-Z), got {n_starts}")
+    if num_obstacles > total - 1 - n_starts:
+        raise ValueError("obstacle_ratio leaves no room for the goal and the starts")
+    if min_start_dist > (height - 1) + (width - 1):
+        raise ValueError(f"min_start_dist {min_start_dist} is larger than any distance on a {height}x{width} map")
 
     while True:
-        goal = random.choice(all_cells)
-
-        candidate_cells = [c for c in all_cells if c != goal]
-        obstacles = set(random.sample(candidate_cells, num_obstacles))
-
-        free = [c for c in all_cells if c not in obstacles and c != goal]
-        if len(free) < 2:
-            continue
-
-        start_A = random.choice(free)
-        free.remove(start_A)
-        start_B = random.choice(free)
-
-        def manhattan(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-        if manhattan(start_A, goal) < MIN_START_DIST:
+        cells = bytearray(total)
+        for i in rng.sample(range(total), num_obstacles):
+            cells[i] = OBSTACLE
+        layout = Layout(height, width, goals=[], grid=bytes(cells))
+
+        for _ in range(goal_tries):
+            g = rng.randrange(total)
+            if cells[g]:
+                continue            # wall, or a pocket already too small
+            gx, gy = divmod(g, width)
+
+            reachable = []
+            bfs_distance_field(layout, [(gx, gy)], order=reachable)
+            valid = [
+                i for i in reachable[1:]
+                if abs(i // width - gx) + abs(i % width - gy) >= min_start_dist
+            ]
+            if len(valid) >= n_starts:
+                break
+            if len(reachable) <= n_starts or _span(reachable, width) < min_start_dist:
+                for i in reachable:
+                    cells[i] = OBSTACLE     # no goal in this pocket can work (local copy only)
+        else:
             continue
-        if manhattan(start_B, goal) < MIN_START_DIST:
-            continue
-
-        if not is_reachable(start_A, goal, obstacles):
-            continue
-        if not is_reachable(start_B, goal, obstacles):
-            continue
-
         break
 
-    env = World(
-        height=HEIGHT,
-        width=WIDTH,
-        goals=[goal],
-        obstacles=obstacles,
-        mode="farol"
-    )
-
+    env = World(mode="farol", layout=layout.with_goals([(gx, gy)]))
     start_positions = {
-        "A": start_A,
-        "B": start_B
+        chr(ord("A") + k): divmod(i, width)
+        for k, i in enumerate(rng.sample(valid, n_starts))
     }
 
-    return env, start_positions, goal, obstacles
+    return env, start_positions, (gx, gy), env.obstacles
+
+
+def _span(cells, width):
+    """Largest possible Manhattan distance inside the bounding box of `cells`."""
+    xs = [i // width for i in cells]
+    ys = [i % width for i in cells]
+    return (max(xs) - min(xs)) + (max(ys) - min(ys))
 
 
 # ---------------------------------------------------------
@@ -122,10 +155,11 @@ def generate_random_map():
 #    Agora: este ficheiro só cria agentes FIXED.
 #    Agentes "learning" são criados no Main.py com LearningAgent.
 # ---------------------------------------------------------
-def setup_lighthouse(agent_type="fixed", map_type="fixed", json_file="Resources/farol_map_1.json"):
+def setup_lighthouse(agent_type="fixed", map_type="fixed", json_file="Resources/farol_map_1.json", verbose=True):
     """
     agent_type = "fixed"
     map_type   = "fixed" ou "random"
+    verbose    = False silencia os prints por passo dos agentes
     """
 
     if agent_type != "fixed":
@@ -145,7 +179,7 @@ def setup_lighthouse(agent_type="fixed", map_type="fixed", json_file="Resources/
     # AGENTES FIXOS
     agents = []
     for name, pos in start_positions.items():
-        agent = LighthouseFixedAgent(name, env, start_pos=tuple(pos))
+        agent = LighthouseFixedAgent(name, env, start_pos=tuple(pos), verbose=verbose)
         agents.append(agent)
 
     return env, agents
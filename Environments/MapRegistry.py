@@ -0,0 +1,36 @@
+# Environments/MapRegistry.py
+"""
+Process-wide cache of parsed maps.
+
+Each map file is parsed once per (path, loader) and re-parsed only when its
+mtime changes. Every request returns a fresh World that shares the cached,
+immutable Layout (no agents, step_count = 0), so training and evaluation
+loops can ask for "a clean map" every episode at O(1) cost.
+"""
+import os
+
+_entries = {}
+
+
+def load_cached(filename, loader):
+    """
+    Return the same tuple as `loader(filename)`
+    (env, start_positions, goal(s), obstacles), with a fresh env each call.
+    The returned goals/obstacles are shared and must be treated as read-only.
+    """
+    key = (os.path.abspath(filename), loader)
+    mtime = os.stat(filename).st_mtime_ns
+
+    entry = _entries.get(key)
+    if entry is None or entry[0] != mtime:
+        entry = (mtime, loader(filename))
+        _entries[key] = entry
+
+    env, start_positions, goals, obstacles = entry[1]
+    starts = {name: list(pos) for name, pos in start_positions.items()}
+    return env.clone(), starts, goals, obstacles
+
+
+def clear():
+    """Forget every cached map."""
+    _entries.clear()
@@ -1,14 +1,26 @@
 # Environments/Maze.py
 import json
 from Environments.World import World
+from Environments.BinaryMap import is_binary_map, load_binary_map
+from Environments import MapRegistry
+from SimLogger import get_logger
 from Agents.Fixed.MazeFixedAgent import MazeFixedAgent
-from Environments.RandomMazeGenerator import generate_maze
+from Environments.RandomMazeGenerator import generate_maze_grid
+from Environments.Layout import Layout, GOAL
+
+log = get_logger("maze")
 
 
 # ---------------------------------------------------------
 # 1) Carregar mapa FIXO de JSON
 # ---------------------------------------------------------
 def load_fixed_map(filename):
+    """Load a JSON map, or a binary .smap map (memory-mapped, see BinaryMap)."""
+    if is_binary_map(filename):
+        layout, start_positions, goals = load_binary_map(filename)
+        env = World(mode="maze", layout=layout)
+        return env, start_positions, goals, env.obstacles
+
     with open(filename, "r") as f:
         data = json.load(f)
 
@@ -28,37 +40,39 @@ def load_fixed_map(filename):
     return env, data["start_positions"], goals, obstacles
 
 
+def load_cached_map(filename):
+    """
+    Same as load_fixed_map, but the file is parsed only once per process
+    (until it changes on disk); each call returns a fresh World.
+    """
+    return MapRegistry.load_cached(filename, load_fixed_map)
+
+
 # ---------------------------------------------------------
 # 2) Gerar mapa RANDOM para FixedAgent
 # ---------------------------------------------------------
-def generate_random_maze():
-    height = 11
-    width = 11
-
-    maze_data = generate_maze(height, width)
-    walls = maze_data["walls"]
-    entrances = maze_data["entrances"]
+def generate_random_maze(height=11, width=11, seed=None, algorithm="backtracker"):
+    """
+    Random perfect maze (see RandomMazeGenerator for the algorithms).
+    The maze is carved straight into the layout grid; no wall set is built.
+    """
+    grid, entrances = generate_maze_grid(height, width, algorithm=algorithm, seed=seed)
 
     start_A = entrances[0]
     start_B = entrances[0]   # pode ser igual, é permitido
     goal = entrances[1]
 
-    print(f"[Maze] Start A = {start_A}, Start B = {start_B}, Goal = {goal}")
+    log.info("[Maze] Start A = %s, Start B = %s, Goal = %s", start_A, start_B, goal)
 
-    env = World(
-        height=height,
-        width=width,
-        goals=[goal],
-        obstacles=walls,
-        mode="maze"
-    )
+    grid[goal[0] * width + goal[1]] |= GOAL
+    env = World(mode="maze", layout=Layout(height, width, goals=[goal], grid=bytes(grid)))
 
     start_positions = {
         "A": start_A,
         "B": start_B
     }
 
-    return env, start_positions, [goal], walls
+    return env, start_positions, [goal], env.obstacles
 
 
 # ---------------------------------------------------------
@@ -66,10 +80,11 @@ def generate_random_maze():
 #    Agora: este ficheiro só cria agentes FIXED.
 #    Agentes "learning" são criados no Main.py ou nos scripts de treino.
 # ---------------------------------------------------------
-def setup_maze(agent_type="fixed", map_type="fixed", json_file="Resources/maze_map_1.json"):
+def setup_maze(agent_type="fixed", map_type="fixed", json_file="Resources/maze_map_1.json", verbose=True):
     """
     agent_type = "fixed"
     map_type   = "fixed" ou "random"
+    verbose    = False silencia os prints por passo dos agentes
     """
 
     if agent_type != "fixed":
@@ -89,7 +104,7 @@ def setup_maze(agent_type="fixed", map_type="fixed", json_file="Resources/maze_m
     # AGENTES FIXOS
     agents = []
     for name, pos in start_positions.items():
-        agent = MazeFixedAgent(name, env, start_pos=tuple(pos))
+        agent = MazeFixedAgent(name, env, start_pos=tuple(pos), verbose=verbose)
         agents.append(agent)
 
     return env, agents
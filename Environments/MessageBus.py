@@ -0,0 +1,152 @@
+# Environments/MessageBus.py
+"""
+World-owned message bus (replaces the synchronous Agent._broadcast fan-out).
+
+    env.bus.publish(sender, payload)                         # all other agents
+    env.bus.publish(sender, payload, topic="paths")          # subscribers only
+    env.bus.publish(sender, payload, radius=5)               # within 5 cells
+    env.bus.subscribe(agent, "paths")
+
+Messages are queued and delivered in one batch by World.atualizacao (end of
+the step): each recipient's mailbox is filled, then handed to its comunica
+in publish order. Messages published during delivery wait for the next
+step. Agents switched to pull mode with deliver_to(agent, False) keep
+their messages in the mailbox and drain it with bus.receive(agent).
+
+Topic "broadcast" reaches every agent in the World without subscribing;
+other topics reach their subscribers only. With a radius, recipients are
+looked up in the World's spatial index (Chebyshev distance, positions at
+delivery time) instead of scanning all agents.
+
+Listeners registered with add_listener(callback) are called with each
+agent that received messages in a flush (after its comunica calls); the
+EventScheduler uses this to wake parked agents.
+"""
+from collections import Counter
+
+BROADCAST = "broadcast"
+
+
+class MessageBus:
+
+    def __init__(self, world):
+        self.world = world
+        self._queue = []
+        self._subscribers = {}      # topic -> {agent: None} (ordered set)
+        self._mailboxes = {}        # agent -> [(payload, sender, topic)]
+        self._pull = set()          # agents that drain their mailbox themselves
+        self._listeners = []
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0            # messages that reached nobody
+        self.by_topic = Counter()
+
+    # ------------------------------------------------------------
+    # SUBSCRIPTIONS
+    # ------------------------------------------------------------
+    def subscribe(self, agent, topic):
+        self._subscribers.setdefault(topic, {})[agent] = None
+
+    def unsubscribe(self, agent, topic=None):
+        """Remove `agent` from `topic` (or from every topic)."""
+        topics = [topic] if topic is not None else list(self._subscribers)
+        for t in topics:
+            subs = self._subscribers.get(t)
+            if subs is not None:
+                subs.pop(agent, None)
+                if not subs:
+                    del self._subscribers[t]
+
+    def add_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def deliver_to(self, agent, auto_deliver=True):
+        """auto_deliver=False: keep messages in the mailbox for receive()."""
+        if auto_deliver:
+            self._pull.discard(agent)
+        else:
+            self._pull.add(agent)
+
+    # ------------------------------------------------------------
+    # SEND / RECEIVE
+    # ------------------------------------------------------------
+    def publish(self, sender, payload, topic=BROADCAST, radius=None):
+        self._queue.append((sender, topic, payload, radius))
+        self.published += 1
+        self.by_topic[topic] += 1
+
+    def receive(self, agent):
+        """Pop and return the pending [(payload, sender, topic)] of `agent`."""
+        return self._mailboxes.pop(agent, [])
+
+    @property
+    def queued(self):
+        return len(self._queue)
+
+    # ------------------------------------------------------------
+    # BATCHED DELIVERY
+    # ------------------------------------------------------------
+    def _recipients(self, sender, topic, radius):
+        if radius is not None:
+            near = self.world.agents_within(sender.x, sender.y, radius)
+            if topic != BROADCAST:
+                subs = self._subscribers.get(topic, ())
+                near = [a for a in near if a in subs]
+            return near
+        if topic == BROADCAST:
+            return self.world.agents
+        return self._subscribers.get(topic, ())
+
+    def flush(self):
+        """Deliver every queued message. Returns the number of deliveries."""
+        if not self._queue:
+            return 0
+
+        queue, self._queue = self._queue, []
+        mailboxes = self._mailboxes
+        received = {}               # ordered set of this flush's recipients
+        count = 0
+
+        for sender, topic, payload, radius in queue:
+            reached = 0
+            for agent in self._recipients(sender, topic, radius):
+                if agent is sender:
+                    continue
+                box = mailboxes.get(agent)
+                if box is None:
+                    box = mailboxes[agent] = []
+                box.append((payload, sender, topic))
+                received[agent] = None
+                reached += 1
+            if not reached:
+                self.dropped += 1
+            count += reached
+
+        self.delivered += count
+
+        for agent in received:
+            if agent not in self._pull:
+                for payload, sender, _ in mailboxes.pop(agent):
+                    agent.comunica(payload, sender)
+
+        for callback in self._listeners:
+            for agent in received:
+                callback(agent)
+
+        return count
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "queued": len(self._queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "pending_in_mailboxes": sum(len(b) for b in self._mailboxes.values()),
+            "by_topic": dict(self.by_topic),
+        }
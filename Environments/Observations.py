@@ -0,0 +1,107 @@
+# Environments/Observations.py
+"""
+Typed, slotted observation records returned by World.observacaoPara.
+
+    FarolObservation(direcao_farol)
+    MazeObservation(posicao, neighbors, goals)
+
+Records are immutable and shared between agents standing on the same cell
+(see Layout.observation_cache), so consumers must never modify them.
+
+Migration from dict observations
+--------------------------------
+- New code reads attributes:  obs.direcao_farol, obs.posicao, obs.goals.
+- Old code keeps working: records still answer obs.get("key", default)
+  and obs["key"] with the same keys as before, and as_dict() returns the
+  old dict (neighbors as dict, goals as list).
+- Code that builds its own dict observations (tests, custom worlds) can
+  convert them with from_dict(d) before handing them to the adapters or
+  fixed agents, which now read attributes only.
+- World.observacaoDictPara still returns the old fresh dict.
+"""
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+
+
+class _Observation(ABC):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    # ---------------- dict-style compatibility ----------------
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def keys(self):
+        return self.__slots__
+
+    @abstractmethod
+    def as_dict(self):
+        pass
+
+    # ----------------------------------------------------------
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class FarolObservation(_Observation):
+    """Compass direction toward the lighthouse ("N", "SE", ..., or "HERE")."""
+
+    __slots__ = ("direcao_farol",)
+
+    def __init__(self, direcao_farol):
+        object.__setattr__(self, "direcao_farol", direcao_farol)
+
+    def as_dict(self):
+        return {"direcao_farol": self.direcao_farol}
+
+
+class MazeObservation(_Observation):
+    """
+    Agent position, blocked 4-neighbours ({(x, y): "obstacle"}, read-only)
+    and the tuple of goal positions.
+    """
+
+    __slots__ = ("posicao", "neighbors", "goals")
+
+    def __init__(self, posicao, neighbors, goals):
+        object.__setattr__(self, "posicao", posicao)
+        object.__setattr__(self, "neighbors", neighbors)
+        object.__setattr__(self, "goals", goals)
+
+    def as_dict(self):
+        return {
+            "posicao": self.posicao,
+            "neighbors": dict(self.neighbors),
+            "goals": list(self.goals),
+        }
+
+
+def from_dict(obs):
+    """Convert an old-style dict observation into its record (records pass through)."""
+    if isinstance(obs, _Observation):
+        return obs
+    if "direcao_farol" in obs:
+        return FarolObservation(obs["direcao_farol"])
+    return MazeObservation(
+        tuple(obs["posicao"]),
+        MappingProxyType(dict(obs.get("neighbors", {}))),
+        tuple(tuple(g) for g in obs["goals"]),
+    )
@@ -1,52 +1,278 @@
 # RandomMazeGenerator.py
+"""
+Perfect-maze generators writing straight into a flat byte grid
+(row-major, index x*width+y, Layout.OBSTACLE = wall, 0 = free).
+
+    grid, entrances = generate_maze_grid(4001, 4001, algorithm="eller", seed=7)
+
+Algorithms (all linear in the number of cells):
+  - "backtracker": recursive backtracking (the original generator; with the
+                   same random state it carves the same maze as before).
+  - "kruskal"    : randomized Kruskal with union-find over a shuffled edge array.
+  - "wilson"     : loop-erased random walks, uniform over all perfect mazes.
+  - "eller"      : row by row, O(width) working state; the fastest for huge grids.
+
+Memory is one byte per grid cell plus a few machine-int arrays over the maze
+cells (array module, no per-cell Python objects). Pass `seed` (or an `rng`
+with the random.Random API) for reproducible output; with neither, the global
+`random` module is used as before.
+"""
 import random
+from array import array
+
+from Environments.Layout import OBSTACLE
+
+ALGORITHMS = ("backtracker", "kruskal", "wilson", "eller")
+
+
+def _resolve_rng(seed, rng):
+    if rng is not None:
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return random
 
-def generate_maze(height, width):
+
+def generate_maze_grid(height, width, algorithm="backtracker", seed=None, rng=None):
     """
-    Generates a perfect maze using recursive backtracking.
-    Returns:
-        {
-            "walls": set((i,j)),
-            "entrances": [(r1,c1), (r2,c2)]
-        }
+    Returns (grid, entrances): grid is a bytearray of height*width cells and
+    entrances the two (x, y) openings on opposite borders.
+    Even dimensions are padded with a wall row/column, as before.
     """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm must be one of {ALGORITHMS}")
+    rng = _resolve_rng(seed, rng)
 
     # Ensure odd dimensions for good DFS structure
     H = height if height % 2 == 1 else height - 1
-    W = width  if width  % 2 == 1 else width  - 1
+    W = width if width % 2 == 1 else width - 1
+    if H < 3 or W < 3:
+        raise ValueError(f"maze too small: {height}x{width}")
+
+    # Maze cells sit on odd (x, y); cell k = (cx, cy) is grid (2cx+1, 2cy+1)
+    ch, cw = (H - 1) // 2, (W - 1) // 2
+    grid = bytearray([OBSTACLE]) * (height * width)
+
+    _CARVERS[algorithm](grid, width, ch, cw, rng, H, W)
+    entrances = _carve_entrances(grid, width, H, W, rng)
+    return grid, entrances
+
+
+def generate_maze(height, width, seed=None, rng=None, algorithm="backtracker", output="walls"):
+    """
+    Generates a perfect maze.
+    Returns:
+        output="walls": {"walls": set((i,j)), "entrances": [(r1,c1), (r2,c2)]}
+        output="grid" : {"grid": bytearray, "height", "width", "entrances"}
+                        (no wall set is ever built)
+    """
+    grid, entrances = generate_maze_grid(height, width, algorithm, seed, rng)
 
-    # Start with all walls
-    maze = [[1 for _ in range(W)] for _ in range(H)]
+    if output == "grid":
+        return {"grid": grid, "height": height, "width": width, "entrances": entrances}
+    if output != "walls":
+        raise ValueError("output must be 'walls' or 'grid'")
 
-    # Random odd start cell
-    start_r = random.randrange(1, H, 2)
-    start_c = random.randrange(1, W, 2)
-    maze[start_r][start_c] = 0
+    walls = {divmod(i, width) for i, v in enumerate(grid) if v & OBSTACLE}
+    return {
+        "walls": walls,
+        "entrances": entrances
+    }
 
-    stack = [(start_r, start_c)]
-    dirs = [(-2, 0), (2, 0), (0, -2), (0, 2)]  # 2-step moves
 
-    # ---------------- DFS CARVING ----------------
+# ---------------------------------------------------------
+# CARVERS: (grid, width, ch, cw, rng, H, W) -> None
+# ---------------------------------------------------------
+def _backtracker(grid, width, ch, cw, rng, H, W):
+    # same rng calls, in the same order, as the original list-of-lists version
+    start_r = rng.randrange(1, H, 2)
+    start_c = rng.randrange(1, W, 2)
+    start = (start_r // 2) * cw + start_c // 2
+    choice = rng.choice
+
+    visited = bytearray(ch * cw)
+    visited[start] = 1
+    grid[start_r * width + start_c] = 0
+
+    last_row = (ch - 1) * cw
+    stack = array("i", [start])
     while stack:
-        r, c = stack[-1]
+        k = stack[-1]
+        cy = k % cw
         neighbors = []
-
-        for dr, dc in dirs:
-            nr, nc = r + dr, c + dc
-            if 1 <= nr < H - 1 and 1 <= nc < W - 1 and maze[nr][nc] == 1:
-                neighbors.append((nr, nc, dr, dc))
+        if k >= cw and not visited[k - cw]:
+            neighbors.append(-cw)
+        if k < last_row and not visited[k + cw]:
+            neighbors.append(cw)
+        if cy > 0 and not visited[k - 1]:
+            neighbors.append(-1)
+        if cy < cw - 1 and not visited[k + 1]:
+            neighbors.append(1)
 
         if neighbors:
-            nr, nc, dr, dc = random.choice(neighbors)
-            maze[r + dr//2][c + dc//2] = 0
-            maze[nr][nc] = 0
-            stack.append((nr, nc))
+            d = choice(neighbors)
+            n = k + d
+            visited[n] = 1
+            g = (2 * (k // cw) + 1) * width + 2 * cy + 1
+            gn = (2 * (n // cw) + 1) * width + 2 * (n % cw) + 1
+            grid[(g + gn) // 2] = 0
+            grid[gn] = 0
+            stack.append(n)
         else:
             stack.pop()
 
-    # ----------------------------------------------
-    # FORCE 2 OPPOSITE EDGE ENTRANCES (proper corridors)
-    # ----------------------------------------------
+
+def _kruskal(grid, width, ch, cw, rng, H, W):
+    n = ch * cw
+    # edge 2k = wall to the right of k, 2k+1 = wall below k
+    edges = array("i", (
+        e for k in range(n)
+        for e in ((2 * k,) if k % cw < cw - 1 else ()) + ((2 * k + 1,) if k < n - cw else ())
+    ))
+    rng.shuffle(edges)
+
+    parent = array("i", range(n))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for k in range(n):
+        grid[(2 * (k // cw) + 1) * width + 2 * (k % cw) + 1] = 0
+
+    joined = 0
+    for e in edges:
+        k, down = e >> 1, e & 1
+        other = k + cw if down else k + 1
+        a, b = find(k), find(other)
+        if a == b:
+            continue
+        parent[a] = b
+        g = (2 * (k // cw) + 1) * width + 2 * (k % cw) + 1
+        grid[g + width if down else g + 1] = 0
+        joined += 1
+        if joined == n - 1:
+            break
+
+
+def _wilson(grid, width, ch, cw, rng, H, W):
+    n = ch * cw
+    in_tree = bytearray(n)
+    nxt = array("i", bytes(4 * n))
+    steps = (-cw, cw, -1, 1)
+    bits = rng.getrandbits
+    last_row = n - cw
+
+    root = rng.randrange(n)
+    in_tree[root] = 1
+    grid[(2 * (root // cw) + 1) * width + 2 * (root % cw) + 1] = 0
+
+    for start in range(n):
+        if in_tree[start]:
+            continue
+        # random walk until the tree is hit; nxt keeps the last exit (loop erasure)
+        u = start
+        while not in_tree[u]:
+            while True:
+                d = bits(2)
+                if d == 0 and u >= cw or d == 1 and u < last_row or \
+                   d == 2 and u % cw or d == 3 and u % cw < cw - 1:
+                    break
+            v = u + steps[d]
+            nxt[u] = v
+            u = v
+        # add the loop-erased path
+        u = start
+        while not in_tree[u]:
+            in_tree[u] = 1
+            v = nxt[u]
+            g = (2 * (u // cw) + 1) * width + 2 * (u % cw) + 1
+            gv = (2 * (v // cw) + 1) * width + 2 * (v % cw) + 1
+            grid[g] = 0
+            grid[(g + gv) // 2] = 0
+            u = v
+
+
+def _eller(grid, width, ch, cw, rng, H, W):
+    # coin flips come from one random byte per column and phase (< 128 = yes)
+    bits = rng.getrandbits
+    randbelow = rng.randrange
+    open_cells = bytes(cw)
+    sets = list(range(cw))
+    next_id = cw
+
+    for cx in range(ch):
+        row = (2 * cx + 1) * width + 1
+        grid[row:row + 2 * cw - 1:2] = open_cells
+        last = cx == ch - 1
+
+        # horizontal joins (always on the last row, to connect everything)
+        flips = bits(8 * cw).to_bytes(cw, "little") if not last else None
+        parent = {}
+        a = sets[0]
+        for cy in range(1, cw):
+            b = sets[cy]
+            while b in parent:
+                b = parent[b]
+            if a != b and (last or flips[cy] < 128):
+                parent[b] = a
+                grid[row + 2 * cy - 1] = 0
+            else:
+                a = b
+        if last:
+            break
+        if parent:
+            for cy in range(cw):
+                s = sets[cy]
+                while s in parent:
+                    s = parent[s]
+                sets[cy] = s
+
+        # vertical joins: every set goes down at least once
+        flips = bits(8 * cw).to_bytes(cw, "little")
+        down_row = row + width
+        went_down = set()
+        below = [0] * cw
+        for cy in range(cw):
+            if flips[cy] < 128:
+                s = sets[cy]
+                below[cy] = s
+                went_down.add(s)
+                grid[down_row + 2 * cy] = 0
+            else:
+                below[cy] = -1
+
+        stuck = {}
+        for cy in range(cw):
+            s = sets[cy]
+            if s not in went_down:
+                stuck.setdefault(s, []).append(cy)
+        for s, cols in stuck.items():
+            cy = cols[randbelow(len(cols))] if len(cols) > 1 else cols[0]
+            below[cy] = s
+            grid[down_row + 2 * cy] = 0
+
+        for cy in range(cw):
+            if below[cy] < 0:
+                below[cy] = next_id
+                next_id += 1
+        sets = below
+
+
+_CARVERS = {
+    "backtracker": _backtracker,
+    "kruskal": _kruskal,
+    "wilson": _wilson,
+    "eller": _eller,
+}
+
+
+# ----------------------------------------------
+# FORCE 2 OPPOSITE EDGE ENTRANCES (proper corridors)
+# ----------------------------------------------
+def _carve_entrances(grid, width, H, W, rng):
     edge_sets = {
         "top":    [(0, c)     for c in range(1, W-1, 2)],
         "bottom": [(H-1, c)   for c in range(1, W-1, 2)],
@@ -61,44 +287,21 @@ def generate_maze(height, width):
         ("right", "left"),
     ]
 
-    edge1, edge2 = random.choice(opposite_pairs)
+    edge1, edge2 = rng.choice(opposite_pairs)
 
-    e1 = random.choice(edge_sets[edge1])
-    e2 = random.choice(edge_sets[edge2])
+    e1 = rng.choice(edge_sets[edge1])
+    e2 = rng.choice(edge_sets[edge2])
 
-    entrances = [e1, e2]
-
-    def carve_entrance(er, ec):
-        """Carve a proper 2-cell deep corridor at the entrance."""
-        maze[er][ec] = 0
+    for er, ec in (e1, e2):
+        # Carve a proper 2-cell deep corridor at the entrance
+        grid[er * width + ec] = 0
         if er == 0:          # top entrance
-            maze[1][ec] = 0
+            grid[1 * width + ec] = 0
         elif er == H - 1:    # bottom entrance
-            maze[H - 2][ec] = 0
+            grid[(H - 2) * width + ec] = 0
         elif ec == 0:        # left entrance
-            maze[er][1] = 0
+            grid[er * width + 1] = 0
         elif ec == W - 1:    # right entrance
-            maze[er][W - 2] = 0
-
-    # Carve both entrances
-    carve_entrance(*e1)
-    carve_entrance(*e2)
-
-    # ----------------------------------------------
-    # CONVERT TO WALL SET FOR THE WORLD
-    # ----------------------------------------------
-    walls = set()
-    for i in range(height):
-        for j in range(width):
-            # Use generated maze for valid area
-            if i < H and j < W:
-                if maze[i][j] == 1:
-                    walls.add((i, j))
-            else:
-                # Padding area = walls
-                walls.add((i, j))
+            grid[er * width + W - 2] = 0
 
-    return {
-        "walls": walls,
-        "entrances": entrances
-    }
+    return [e1, e2]
@@ -0,0 +1,321 @@
+# Environments/Render.py
+"""
+Console rendering of a World.
+
+- render_full(world): the classic full frame (what World.display prints).
+- TerminalRenderer: keeps a frame buffer and, after the first frame, only
+  redraws the cells that changed (ANSI cursor moves), capped at max_fps.
+  Layout cells never change between frames, so only cells that held or
+  now hold an agent are compared: cost per frame is O(agents), not O(H*W).
+"""
+import sys
+import time
+
+from Environments.Layout import OBSTACLE, GOAL
+
+RED = "\033[91m"
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+CYAN = "\033[96m"
+RESET = "\033[0m"
+
+WALL = RED + "# " + RESET
+TARGET = YELLOW + "* " + RESET
+EMPTY = ". "
+
+
+def agent_token(agent):
+    return GREEN + agent.name[0].upper() + " " + RESET
+
+
+def base_tokens(layout):
+    """Token of every cell without agents (row-major)."""
+    return [
+        WALL if v & OBSTACLE else (TARGET if v & GOAL else EMPTY)
+        for v in layout.grid
+    ]
+
+
+def agent_cells(world):
+    """
+    {cell index: token of the first agent (list order) standing there}.
+    Uses the World's spatial index: O(occupied cells).
+    """
+    h, w = world.height, world.width
+    return {
+        x * w + y: agent_token(bucket[0])
+        for (x, y), bucket in world.occupied_cells()
+        if 0 <= x < h and 0 <= y < w
+    }
+
+
+def _border(width):
+    return CYAN + "+" + "-" * (width * 2) + "+" + RESET
+
+
+def render_full(world):
+    """Full frame as a string: obstacles, then goals, then agents, then '.'."""
+    w = world.width
+    tokens = base_tokens(world.layout)
+    for i, tok in agent_cells(world).items():
+        if tokens[i] is EMPTY:
+            tokens[i] = tok
+
+    side = CYAN + "|" + RESET
+    lines = [_border(w)]
+    for x in range(world.height):
+        lines.append(side + "".join(tokens[x * w:(x + 1) * w]) + side)
+    lines.append(_border(w))
+    return "\n".join(lines)
+
+
+class TerminalRenderer:
+    """
+    Incremental live view of a World for ANSI terminals.
+
+        r = TerminalRenderer(env, max_fps=20)
+        r.render(status="Step 1")   # returns False if skipped by the fps cap
+        ...
+        r.close()
+    """
+
+    def __init__(self, world, max_fps=20.0, stream=None):
+        self.world = world
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
+        self._layout = None
+        self._base = None
+        self._frame = None
+        self._agents = {}
+        self._last_time = None
+
+    # ------------------------------------------------------------
+    def _goto(self, row, col):
+        return f"\033[{row};{col}H"
+
+    def _cell_pos(self, i):
+        x, y = divmod(i, self.world.width)
+        return self._goto(2 + x, 2 + 2 * y)
+
+    def _full_redraw(self, agents):
+        self._layout = self.world.layout
+        self._base = base_tokens(self._layout)
+        self._frame = list(self._base)
+        for i, tok in agents.items():
+            if self._base[i] is EMPTY:
+                self._frame[i] = tok
+        return "\033[2J\033[H" + render_full(self.world)
+
+    # ------------------------------------------------------------
+    def render(self, status=None, force=False):
+        now = time.perf_counter()
+        if not force and self._last_time is not None and now - self._last_time < self.min_interval:
+            return False
+        self._last_time = now
+
+        agents = agent_cells(self.world)
+
+        if self.world.layout is not self._layout:
+            out = [self._full_redraw(agents)]
+        else:
+            out = []
+            base, frame = self._base, self._frame
+            for i in self._agents.keys() | agents.keys():
+                tok = agents.get(i, base[i]) if base[i] is EMPTY else base[i]
+                if frame[i] != tok:
+                    frame[i] = tok
+                    out.append(self._cell_pos(i) + tok)
+
+        self._agents = agents
+
+        status_row = self.world.height + 3
+        if status is not None:
+            out.append(self._goto(status_row, 1) + "\033[K" + status)
+        out.append(self._goto(status_row + 1, 1))
+
+        self.stream.write("".join(out))
+        self.stream.flush()
+        return True
+
+    def close(self):
+        """Leave the cursor below the frame."""
+        self.stream.write(self._goto(self.world.height + 4, 1) + "\n")
+        self.stream.flush()
+
+
+# ------------------------------------------------------------
+# VIEWPORT / OVERVIEW (large maps)
+# ------------------------------------------------------------
+OVERVIEW_WALL = RED + "#" + RESET
+OVERVIEW_TARGET = YELLOW + "*" + RESET
+OVERVIEW_EMPTY = "."
+OVERVIEW_MIXED = ":"
+
+
+def _clamp(v, lo, hi):
+    return lo if v < lo else (hi if v > hi else v)
+
+
+def render_window(world, top, left, rows, cols):
+    """
+    Frame of the cells [top, top+rows) x [left, left+cols), same tokens as
+    render_full. Reads only the window cells (agents via the spatial index).
+    """
+    h, w = world.height, world.width
+    rows = min(rows, h - top)
+    cols = min(cols, w - left)
+    grid = world.grid
+
+    side = CYAN + "|" + RESET
+    lines = [_border(cols)]
+    for x in range(top, top + rows):
+        row = x * w
+        line = []
+        for y in range(left, left + cols):
+            v = grid[row + y]
+            if v & OBSTACLE:
+                line.append(WALL)
+            elif v & GOAL:
+                line.append(TARGET)
+            else:
+                bucket = world.agents_at(x, y)
+                line.append(agent_token(bucket[0]) if bucket else EMPTY)
+        lines.append(side + "".join(line) + side)
+    lines.append(_border(cols))
+    return "\n".join(lines)
+
+
+def render_overview(world, rows, cols, samples=4):
+    """
+    Downsampled frame of the whole map in at most rows x cols characters;
+    each character summarizes one block of cells:
+
+        agent initial > '*' (goal) > '#' (mostly walls) > ':' (some walls) > '.'
+
+    Walls are estimated from a samples x samples lattice inside each block,
+    so the cost depends on the output size, not on the map size.
+    """
+    h, w = world.height, world.width
+    bh = -(-h // max(1, rows))
+    bw = -(-w // max(1, cols))
+    rows, cols = -(-h // bh), -(-w // bw)
+    grid = world.grid
+
+    marks = {}
+    for gx, gy in world.layout.goals:
+        marks[(gx // bh, gy // bw)] = OVERVIEW_TARGET
+    first = {}
+    rank = {a: i for i, a in enumerate(world.agents)} if len(world.agents) > 1 else None
+    for (x, y), bucket in world.occupied_cells():
+        if 0 <= x < h and 0 <= y < w:
+            key = (x // bh, y // bw)
+            best = first.get(key)
+            if best is None or (rank is not None and rank[bucket[0]] < rank[best]):
+                first[key] = bucket[0]
+    for key, a in first.items():
+        marks[key] = GREEN + a.name[0].upper() + RESET
+
+    sx = max(1, bh // samples)
+    sy = max(1, bw // samples)
+    side = CYAN + "|" + RESET
+    border = CYAN + "+" + "-" * cols + "+" + RESET
+    lines = [border]
+    for bx in range(rows):
+        x0, x1 = bx * bh, min(h, (bx + 1) * bh)
+        line = []
+        for by in range(cols):
+            mark = marks.get((bx, by))
+            if mark is None:
+                y0, y1 = by * bw, min(w, (by + 1) * bw)
+                walls = total = 0
+                for x in range(x0, x1, sx):
+                    row = x * w
+                    for y in range(y0, y1, sy):
+                        walls += grid[row + y] & OBSTACLE
+                        total += 1
+                if walls * 2 > total:
+                    mark = OVERVIEW_WALL
+                elif walls:
+                    mark = OVERVIEW_MIXED
+                else:
+                    mark = OVERVIEW_EMPTY
+            line.append(mark)
+        lines.append(side + "".join(line) + side)
+    lines.append(border)
+    return "\n".join(lines)
+
+
+class ViewportRenderer:
+    """
+    Camera over a (possibly huge) World: draws only a rows x cols window,
+    centred on a followed agent or on a fixed cell, or a downsampled
+    overview of the whole map. The size defaults to the terminal size.
+
+        r = ViewportRenderer(env, follow=agents[0])
+        r.render(status="Step 1")
+        r.look_at(500, 1200)          # fixed region
+        r.overview = True             # whole map, one char per block
+    """
+
+    def __init__(self, world, rows=None, cols=None, follow=None, center=None,
+                 overview=False, max_fps=20.0, stream=None):
+        import shutil
+
+        size = shutil.get_terminal_size()
+        self.world = world
+        self.rows = rows or max(1, size.lines - 4)
+        self.cols = cols or max(1, (size.columns - 2) // 2)
+        self.overview = overview
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._last_time = None
+
+        self.target = follow
+        self.center = tuple(center) if center is not None else None
+
+    # ------------------------------------------------------------
+    def follow(self, agent):
+        self.target, self.center = agent, None
+
+    def look_at(self, x, y):
+        self.target, self.center = None, (x, y)
+
+    def window(self):
+        """(top, left) of the current window, clamped to the map."""
+        h, w = self.world.height, self.world.width
+        if self.target is not None:
+            cx, cy = self.target.x, self.target.y
+        elif self.center is not None:
+            cx, cy = self.center
+        else:
+            cx, cy = self.rows // 2, self.cols // 2
+        top = _clamp(cx - self.rows // 2, 0, max(0, h - self.rows))
+        left = _clamp(cy - self.cols // 2, 0, max(0, w - self.cols))
+        return top, left
+
+    def frame(self):
+        if self.overview:
+            # one character per block; keep the same screen width as the window
+            return render_overview(self.world, self.rows, self.cols * 2)
+        top, left = self.window()
+        return render_window(self.world, top, left, self.rows, self.cols)
+
+    # ------------------------------------------------------------
+    def render(self, status=None, force=False):
+        now = time.perf_counter()
+        if not force and self._last_time is not None and now - self._last_time < self.min_interval:
+            return False
+        self._last_time = now
+
+        out = ["\033[H\033[J", self.frame()]
+        if status is not None:
+            out.append("\n" + status)
+        out.append("\n")
+        self.stream.write("".join(out))
+        self.stream.flush()
+        return True
+
+    def close(self):
+        self.stream.write("\n")
+        self.stream.flush()
@@ -0,0 +1,140 @@
+# Environments/Scheduler.py
+"""
+How one simulation step is executed by MotorDeSimulacao.
+
+- SequentialScheduler: the original loop. Each agent observes, decides and
+  moves before the next one, so results depend on the agent order.
+
+- SimultaneousScheduler: two phases.
+    1) decide: every agent observes and decides against the same frozen
+       snapshot (nobody has moved yet). Optionally runs in an executor.
+    2) resolve: World.resolve_moves applies all moves at once with a
+       collision rule ("stack", "block" or "swap").
+  The outcome does not depend on the agent order.
+
+The decide phase only touches each agent's own state, so it can run in a
+thread pool (executor=ThreadPoolExecutor(...)). Process pools do not work
+here: the agents' state changes would stay in the worker processes.
+
+- EventScheduler: wraps either of the above and only runs the agents that
+  can still change state. Agents whose is_done() is true leave the active
+  set; agents whose is_idle() is true are parked until the message bus
+  delivers them a message. finished() tells the engine to stop once no
+  agent is active.
+"""
+from abc import ABC, abstractmethod
+
+
+class Scheduler(ABC):
+    """step(env, agents, after_move) runs one step; finished() ends the run early."""
+
+    @abstractmethod
+    def step(self, env, agents, after_move=None):
+        pass
+
+    def finished(self):
+        return False
+
+
+class SequentialScheduler(Scheduler):
+
+    def step(self, env, agents, after_move=None):
+        for agent in agents:
+            agent.observacao(env.observacaoPara(agent))
+            env.agir(agent.age(), agent)
+            if after_move is not None:
+                after_move(agent)
+
+
+class SimultaneousScheduler(Scheduler):
+
+    def __init__(self, collisions="block", executor=None):
+        self.collisions = collisions
+        self.executor = executor
+
+    @staticmethod
+    def _decide(env, agent):
+        agent.observacao(env.observacaoPara(agent))
+        return agent.age()
+
+    def decide(self, env, agents):
+        """Phase 1: {agent: intended move}, all taken on the current positions."""
+        if self.executor is None:
+            moves = [self._decide(env, a) for a in agents]
+        else:
+            moves = list(self.executor.map(lambda a: self._decide(env, a), agents))
+        return dict(zip(agents, moves))
+
+    def step(self, env, agents, after_move=None):
+        intents = self.decide(env, agents)
+        env.resolve_moves(intents, self.collisions)
+        if after_move is not None:
+            for agent in agents:
+                after_move(agent)
+
+
+class EventScheduler(Scheduler):
+    """
+    Active-set scheduler:
+
+        EventScheduler()                                  # sequential steps
+        EventScheduler(SimultaneousScheduler("block"))    # simultaneous steps
+
+    Per step only the active agents observe and act (in list order). After
+    the step, done agents are dropped for good and idle agents are parked;
+    a parked agent rejoins the active set when it receives a message.
+    """
+
+    def __init__(self, inner=None):
+        self.inner = inner or SequentialScheduler()
+        self._env = None
+        self._agents = None
+        self._order = {}
+        self._active = []
+        self.parked = set()
+        self.done = set()
+        self._woken = False
+
+    def _attach(self, env, agents):
+        if self._env is env and self._agents is agents:
+            return
+        if self._env is not None:
+            self._env.bus.remove_listener(self._wake)
+        self._env = env
+        self._agents = agents
+        self._order = {a: i for i, a in enumerate(agents)}
+        self._active = list(agents)
+        self.parked = set()
+        self.done = set()
+        env.bus.add_listener(self._wake)
+
+    def _wake(self, agent):
+        if agent in self.parked:
+            self.parked.discard(agent)
+            self._active.append(agent)
+            self._woken = True
+
+    @property
+    def active(self):
+        return self._active
+
+    def step(self, env, agents, after_move=None):
+        self._attach(env, agents)
+        if self._woken:
+            self._active.sort(key=self._order.__getitem__)
+            self._woken = False
+
+        self.inner.step(env, self._active, after_move)
+
+        still = []
+        for agent in self._active:
+            if agent.is_done():
+                self.done.add(agent)
+            elif agent.is_idle():
+                self.parked.add(agent)
+            else:
+                still.append(agent)
+        self._active = still
+
+    def finished(self):
+        return self._env is not None and not self._active
@@ -0,0 +1,210 @@
+# Environments/VecWorld.py
+import numpy as np
+
+from Environments.World import OBSTACLE, GOAL, MOVES4, MOVES8
+from Learning.Adapters.FarolAdapter import FarolAdapter
+
+
+class VecWorld:
+    """
+    N independent single-agent episodes over ONE shared layout, stepped in lockstep.
+
+    Agent state (position, reached flag, step counter, last action, visited
+    cells) lives in NumPy arrays indexed by episode. Actions are integer
+    indices into the adapter action order of the mode:
+      - 'farol' : FarolAdapter.ACTIONS (World.MOVES8 order)
+      - 'maze'  : MazeAdapter.ACTIONS  (World.MOVES4 order)
+    -1 means "no action" (same as returning None from Agent.age()).
+
+    Rewards follow FarolAdapter.reward / MazeAdapter.reward, and invalid moves
+    leave the agent in place, exactly like World.agir.
+
+    Observations are dicts of arrays (one entry per episode):
+      - x, y     : positions
+      - moves    : legal-move bitmask of the current cell (action order)
+      - direction: (farol) index into FarolAdapter.DIRS
+      - goal_adj : (maze) bitmask of actions that step onto a goal
+    """
+
+    def __init__(self, world, n, start_pos, max_steps, mode=None, track_visits=True):
+        self.n = int(n)
+        self.mode = mode or world.mode
+        self.height = world.height
+        self.width = world.width
+        self.max_steps = int(max_steps)
+
+        if self.mode == "farol":
+            deltas = MOVES8
+        elif self.mode == "maze":
+            deltas = MOVES4
+        else:
+            raise ValueError("mode deve ser 'farol' ou 'maze'")
+
+        self.deltas = np.array(deltas, dtype=np.int64)
+        self.n_actions = len(deltas)
+
+        # ---------------- shared layout ----------------
+        h, w = self.height, self.width
+        cells = np.frombuffer(world.grid, dtype=np.uint8)
+        self.free = (cells & OBSTACLE) == 0
+        self.goal = (cells & GOAL) != 0
+        self.moves = self._move_masks(self.free.reshape(h, w), self.deltas)
+
+        if self.mode == "farol":
+            gx, gy = next(iter(world.goals))
+            self.direction = self._direction_field(h, w, gx, gy)
+            self.follow_bonus = self._follow_bonus_table()
+        else:
+            self.goal_adj = self._move_masks(self.goal.reshape(h, w), self.deltas)
+
+        # ---------------- per-episode state ----------------
+        starts = np.asarray(start_pos, dtype=np.int64).reshape(-1, 2)
+        self.start_x = np.broadcast_to(starts[:, 0], (self.n,)).copy()
+        self.start_y = np.broadcast_to(starts[:, 1], (self.n,)).copy()
+
+        self.x = self.start_x.copy()
+        self.y = self.start_y.copy()
+        self.reached = np.zeros(self.n, dtype=bool)
+        self.done = np.zeros(self.n, dtype=bool)
+        self.steps = np.zeros(self.n, dtype=np.int64)
+        self.last_action = np.full(self.n, -1, dtype=np.int64)
+
+        self.track_visits = track_visits
+        self.visited = np.zeros((self.n, h * w), dtype=bool) if track_visits else None
+
+    # ------------------------------------------------------------
+    # LAYOUT TABLES
+    # ------------------------------------------------------------
+    @staticmethod
+    def _move_masks(target, deltas):
+        """Flat per-cell bitmask: bit i set if cell + deltas[i] is in-bounds and in `target`."""
+        h, w = target.shape
+        padded = np.zeros((h + 2, w + 2), dtype=bool)
+        padded[1:-1, 1:-1] = target
+
+        masks = np.zeros((h, w), dtype=np.uint8)
+        for bit, (dx, dy) in enumerate(deltas):
+            shifted = padded[1 + dx:1 + dx + h, 1 + dy:1 + dy + w]
+            masks |= shifted.astype(np.uint8) << bit
+        return masks.ravel()
+
+    @staticmethod
+    def _direction_field(h, w, gx, gy):
+        """Flat per-cell index into FarolAdapter.DIRS (same rule as World.observacaoPara)."""
+        idx = FarolAdapter.DIR_TO_IDX
+        # [sign(dx) + 1][sign(dy) + 1], with dx = gx - x, dy = gy - y
+        table = np.array([
+            [idx["NW"], idx["N"], idx["NE"]],
+            [idx["W"], idx["HERE"], idx["E"]],
+            [idx["SW"], idx["S"], idx["SE"]],
+        ], dtype=np.int64)
+
+        xs, ys = np.meshgrid(np.arange(h), np.arange(w), indexing="ij")
+        sx = np.sign(gx - xs) + 1
+        sy = np.sign(gy - ys) + 1
+        return table[sx, sy].ravel()
+
+    @staticmethod
+    def _follow_bonus_table():
+        """[direction, action] -> True if FarolAdapter rewards the action for that direction."""
+        table = np.zeros((len(FarolAdapter.DIRS), len(FarolAdapter.ACTIONS)), dtype=bool)
+        for d, actions in FarolAdapter.DIRECAO_MAP.items():
+            for a in actions:
+                table[FarolAdapter.DIR_TO_IDX[d], FarolAdapter.ACTIONS.index(a)] = True
+        return table
+
+    # ------------------------------------------------------------
+    # EPISODES
+    # ------------------------------------------------------------
+    def cells(self):
+        return self.x * self.width + self.y
+
+    def observe(self):
+        c = self.cells()
+        obs = {"x": self.x.copy(), "y": self.y.copy(), "moves": self.moves[c]}
+        if self.mode == "farol":
+            obs["direction"] = self.direction[c]
+        else:
+            obs["goal_adj"] = self.goal_adj[c]
+        return obs
+
+    def reset(self, mask=None):
+        """Restart the selected episodes (all if mask is None) and return observations."""
+        sel = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+
+        self.x[sel] = self.start_x[sel]
+        self.y[sel] = self.start_y[sel]
+        self.steps[sel] = 0
+        self.last_action[sel] = -1
+        if self.track_visits:
+            self.visited[sel] = False
+
+        c = self.cells()
+        self.reached[sel] = self.goal[c][sel]
+        self.done[sel] = (self.reached | (self.moves[c] == 0))[sel]
+
+        return self.observe()
+
+    def step(self, actions):
+        """
+        Apply one action per episode. Episodes already done are left untouched
+        (reward 0). Returns (obs, rewards, done).
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        active = ~self.done & (actions >= 0)
+        rows = np.nonzero(active)[0]
+
+        rewards = np.zeros(self.n, dtype=np.float64)
+        if rows.size == 0:
+            return self.observe(), rewards, self.done.copy()
+
+        a = actions[rows]
+        x, y = self.x[rows], self.y[rows]
+
+        # ---------------- move (World.agir rules) ----------------
+        can_move = (self.moves[x * self.width + y] >> a) & 1 == 1
+        nx = np.where(can_move, x + self.deltas[a, 0], x)
+        ny = np.where(can_move, y + self.deltas[a, 1], y)
+        self.x[rows], self.y[rows] = nx, ny
+
+        self.last_action[rows] = a
+        self.steps[rows] += 1
+        steps = self.steps[rows]
+
+        c = nx * self.width + ny
+        reached = self.goal[c]
+        self.reached[rows] |= reached
+
+        # ---------------- reward (adapter shaping) ----------------
+        speed = np.where(reached, 1 - steps / self.max_steps, 0.0)
+
+        if self.track_visits:
+            revisit = self.visited[rows, c]
+            self.visited[rows, c] = True
+        else:
+            revisit = np.zeros(rows.size, dtype=bool)
+
+        if self.mode == "farol":
+            # FarolAdapter.reward
+            r = np.where(revisit, -2.0, -0.1)
+            follow = self.follow_bonus[self.direction[c], a]
+            r += np.where(follow, 1.0, 0.0)
+            r += np.where(reached, 100.0 * speed, 0.0)
+            if self.track_visits and reached.any():
+                self.visited[rows[reached]] = False
+        else:
+            # MazeAdapter.reward
+            r = np.full(rows.size, -0.05)
+            r -= np.where(revisit, 0.2, 0.0)
+            r += np.where(reached, 50.0 * speed, 0.0)
+
+        rewards[rows] = r
+
+        # ---------------- termination ----------------
+        self.done[rows] = (
+            self.reached[rows] |
+            (steps >= self.max_steps) |
+            (self.moves[c] == 0)
+        )
+
+        return self.observe(), rewards, self.done.copy()
@@ -1,21 +1,89 @@
 # World.py
-import random
+from Environments.Layout import Layout, OBSTACLE, GOAL, MOVES4, MOVES8
+from Environments.MessageBus import MessageBus
+from Environments.Observations import from_dict
+from Environments.Render import render_full
+
 
 class World:
     """
     Two modes:
       - 'farol' : agents only get a compass direction toward the lighthouse.
       - 'maze'  : agents get blocked neighbors and full goal positions.
+
+    The static map is an immutable, shared Layout (size, walls, goals and
+    derived tables); a World only owns its dynamic state (agents, step_count).
+    `grid` is the layout's flat buffer (row-major, index x*width+y) with
+    OBSTACLE/GOAL flags per cell; `obstacles` is a set view derived from it.
+
+    Agents are also kept in a spatial index {(x, y): [agents]}, updated by
+    agir / add_agent / Agent.set_position, for occupancy and radius queries.
+    Code that moves an agent by assigning x/y directly must call
+    reindex_agent(agent) afterwards.
+
+    `bus` (Environments/MessageBus.py) carries agent messages; they are
+    delivered in one batch at the end of each step (atualizacao).
     """
 
-    def __init__(self, height, width, goals=None, obstacles=None, mode="maze"):
-        self.height = height
-        self.width = width
-        self.goals = set(goals or [])
-        self.obstacles = set(obstacles or [])
+    def __init__(self, height=None, width=None, goals=None, obstacles=None, mode="maze", layout=None):
+        if layout is None:
+            layout = Layout(height, width, goals=goals or [], obstacles=obstacles or [])
+        self._set_layout(layout)
         self.mode = mode
         self.agents = []
         self.step_count = 0
+        self.bus = MessageBus(self)
+
+    # ------------------------------------------------------------
+    # LAYOUT
+    # ------------------------------------------------------------
+    def _set_layout(self, layout):
+        self.layout = layout
+        # plain attributes: read on every position check
+        self.height = layout.height
+        self.width = layout.width
+        self.grid = layout.grid
+
+    @property
+    def goals(self):
+        return self.layout.goals
+
+    @goals.setter
+    def goals(self, cells):
+        self._set_layout(self.layout.with_goals(cells))
+
+    @property
+    def obstacles(self):
+        return self.layout.obstacles
+
+    @obstacles.setter
+    def obstacles(self, cells):
+        self._set_layout(self.layout.with_obstacles(cells))
+
+    def set_obstacle(self, x, y, blocked=True):
+        """Add (or remove) a single obstacle. Out-of-bounds cells are ignored."""
+        self._set_layout(self.layout.with_obstacle(x, y, blocked))
+
+    def moves4(self, x, y):
+        """Bitmask of free 4-neighbours of (x, y), in MOVES4 order (0 if off-grid)."""
+        return self.layout.moves4(x, y)
+
+    def moves8(self, x, y):
+        """Bitmask of free 8-neighbours of (x, y), in MOVES8 order (0 if off-grid)."""
+        return self.layout.moves8(x, y)
+
+    def distance_to_goal(self, x, y, moves=None):
+        """
+        Shortest number of moves from (x, y) to a goal (-1 if unreachable),
+        read from the layout's cached BFS field. Default neighbourhood:
+        8 in 'farol' mode, 4 in 'maze' mode (the agents' action sets).
+        """
+        if moves is None:
+            moves = 8 if self.mode == "farol" else 4
+        return self.layout.distance(x, y, moves)
+
+    def can_reach_goal(self, x, y, moves=None):
+        return self.distance_to_goal(x, y, moves) >= 0
 
     def is_blocked(self, x, y):
         """
@@ -23,18 +91,39 @@ class World:
         """
         if x < 0 or y < 0 or x >= self.height or y >= self.width:
             return True
-        return (x, y) in self.obstacles
+        return (self.grid[x * self.width + y] & OBSTACLE) != 0
 
     # ------------------------------------------------------------
     # OBSERVATION
     # ------------------------------------------------------------
     def observacaoPara(self, agente):
-        """Return observation depending on mode."""
+        """
+        Return observation depending on mode.
+
+        Returns a FarolObservation / MazeObservation record (see
+        Environments/Observations.py). Observations only depend on the
+        agent's cell, so they are built once per (layout, mode, cell) and
+        shared. Use observacaoDictPara for the old mutable dict.
+        """
+        x, y = agente.x, agente.y
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            return from_dict(self._build_observation(x, y))
+
+        cache = self.layout.observation_cache(self.mode)
+        i = x * self.width + y
+        obs = cache.get(i)
+        if obs is None:
+            obs = cache[i] = from_dict(self._build_observation(x, y))
+        return obs
+
+    def observacaoDictPara(self, agente):
+        """Backward-compatible observation: a fresh, mutable dict."""
+        return self._build_observation(agente.x, agente.y)
 
+    def _build_observation(self, ax, ay):
         # ---------------- FAROL MODE ----------------
         if self.mode == "farol":
             gx, gy = next(iter(self.goals))
-            ax, ay = agente.x, agente.y
 
             if (ax, ay) == (gx, gy):
                 return {"direcao_farol": "HERE"}
@@ -48,13 +137,14 @@ class World:
             return {"direcao_farol": vertical + horizontal}
 
         # ---------------- MAZE MODE ----------------
+        mask = self.moves4(ax, ay)
         blocked = set()
-        for nx, ny in self._neighbors4(agente.x, agente.y):
-            if not self.is_valid_position(nx, ny):
-                blocked.add((nx, ny))
+        for bit, (dx, dy) in enumerate(MOVES4):
+            if not mask & (1 << bit):
+                blocked.add((ax + dx, ay + dy))
 
         return {
-            "posicao": (agente.x, agente.y),
+            "posicao": (ax, ay),
             "neighbors": {pos: "obstacle" for pos in blocked},
             "goals": list(self.goals)
         }
@@ -62,6 +152,7 @@ class World:
     # ------------------------------------------------------------
     def atualizacao(self):
         self.step_count += 1
+        self.bus.flush()
 
     # ------------------------------------------------------------
     def agir(self, accao, agente):
@@ -72,83 +163,241 @@ class World:
 
         if self.is_valid_position(nx, ny):
             agente.x, agente.y = nx, ny
+            self.reindex_agent(agente)
 
-            if (nx, ny) in self.goals:
+            if self.grid[nx * self.width + ny] & GOAL:
                 agente.reached_goal = True
 
     # ------------------------------------------------------------
+    # BATCH MOVES (see Environments/Scheduler.py)
+    # ------------------------------------------------------------
+    COLLISION_RULES = ("stack", "block", "swap")
+
+    def resolve_moves(self, intents, collisions="stack", priority=None):
+        """
+        Apply the moves {agent: (x, y) or None} decided on the same snapshot,
+        as if all agents moved at once. Invalid targets and None mean "stay".
+
+          - "stack": every valid move happens (agents may share cells).
+          - "block": when several agents claim a cell, only the one with the
+                     smallest priority(agent) (default: its name) gets it;
+                     agents moving into a cell whose agent stays, or trying
+                     to swap places, stay where they are.
+          - "swap" : like "block", but two agents may trade places.
+
+        Goal cells always accept any number of agents. The result does not
+        depend on the order of `intents`. Agents whose move was refused by
+        the rule are told through agent.movimento_bloqueado(target).
+        Returns the agents that moved.
+        """
+        if collisions not in self.COLLISION_RULES:
+            raise ValueError(f"collisions must be one of {self.COLLISION_RULES}")
+
+        moving = {}
+        for agent, target in intents.items():
+            if target is None:
+                continue
+            target = tuple(target)
+            if target != (agent.x, agent.y) and self.is_valid_position(*target):
+                moving[agent] = target
+
+        if collisions != "stack" and moving:
+            wanted = dict(moving)
+            self._block_conflicts(moving, collisions == "swap", priority or _by_name)
+            for agent, target in wanted.items():
+                if agent not in moving:
+                    agent.movimento_bloqueado(target)
+
+        for agent, target in moving.items():
+            self.agir(target, agent)
+        return list(moving)
+
+    def _block_conflicts(self, moving, allow_swap, priority):
+        """Drop from `moving` every agent that has to stay (see resolve_moves)."""
+        w, grid = self.width, self.grid
+
+        def shared(cell):
+            return grid[cell[0] * w + cell[1]] & GOAL
+
+        claims = {}
+        for agent, target in moving.items():
+            claims.setdefault(target, []).append(agent)
+
+        staying = set()
+        pending = []
+
+        def stay(agent):
+            if agent not in staying:
+                staying.add(agent)
+                pending.append(agent)
+
+        for target, claimers in claims.items():
+            if shared(target):
+                continue
+            if any(other not in moving for other in self.agents_at(*target)):
+                for agent in claimers:
+                    stay(agent)
+            elif len(claimers) > 1:
+                keys = sorted((priority(a), i) for i, a in enumerate(claimers))
+                tie = keys[0][0] == keys[1][0]
+                for k, i in keys[0 if tie else 1:]:
+                    stay(claimers[i])
+
+        if not allow_swap:
+            for agent, target in moving.items():
+                if shared(target):
+                    continue
+                here = (agent.x, agent.y)
+                for other in self.agents_at(*target):
+                    if moving.get(other) == here:
+                        stay(agent)
+                        break
+
+        # an agent that stays keeps its cell: whoever claimed it stays too
+        while pending:
+            agent = pending.pop()
+            del moving[agent]
+            cell = (agent.x, agent.y)
+            if not shared(cell):
+                for other in claims.get(cell, ()):
+                    stay(other)
+
+    # ------------------------------------------------------------
+    # AGENTS + SPATIAL INDEX
+    # ------------------------------------------------------------
+    @property
+    def agents(self):
+        return self._agents
+
+    @agents.setter
+    def agents(self, agents):
+        self._agents = []
+        self._cells = {}        # (x, y) -> [agents], in self.agents order
+        self._where = {}        # agent -> (x, y) it is indexed under
+        self._rank = {}         # agent -> insertion counter (keeps buckets ordered)
+        self._next_rank = 0
+        for a in agents:
+            self.add_agent(a)
+
     def add_agent(self, agent):
-        self.agents.append(agent)
+        if agent in self._where:
+            return
+        self._agents.append(agent)
+        self._rank[agent] = self._next_rank
+        self._next_rank += 1
+        pos = (agent.x, agent.y)
+        self._where[agent] = pos
+        self._index(agent, pos)
+
+    def remove_agent(self, agent):
+        pos = self._where.pop(agent, None)
+        if pos is None:
+            return
+        self._agents.remove(agent)
+        self._unindex(agent, pos)
+        del self._rank[agent]
+        self.bus.unsubscribe(agent)
+
+    def reindex_agent(self, agent):
+        """Move `agent` in the index to its current (x, y). O(agents on its old cell)."""
+        old = self._where.get(agent)
+        pos = (agent.x, agent.y)
+        if old is None or old == pos:
+            return
+        self._unindex(agent, old)
+        self._where[agent] = pos
+        self._index(agent, pos)
+
+    def _index(self, agent, pos):
+        bucket = self._cells.get(pos)
+        if bucket is None:
+            self._cells[pos] = [agent]
+            return
+        rank = self._rank
+        r = rank[agent]
+        i = len(bucket)
+        while i and rank[bucket[i - 1]] > r:
+            i -= 1
+        bucket.insert(i, agent)
+
+    def _unindex(self, agent, pos):
+        bucket = self._cells[pos]
+        bucket.remove(agent)
+        if not bucket:
+            del self._cells[pos]
+
+    def agents_at(self, x, y):
+        """Agents standing on (x, y), in self.agents order (do not modify)."""
+        return self._cells.get((x, y), ())
+
+    def is_occupied(self, x, y):
+        return (x, y) in self._cells
+
+    def occupied_cells(self):
+        """Read-only view {(x, y): [agents]} of every occupied cell."""
+        return self._cells.items()
+
+    def agents_within(self, x, y, r, metric="chebyshev"):
+        """
+        Agents at distance <= r from (x, y) ('chebyshev', 'manhattan' or
+        'euclidean'). Scans whichever is smaller: the (2r+1)^2 window or
+        the occupied cells.
+        """
+        if metric == "chebyshev":
+            def inside(dx, dy): return True
+        elif metric == "manhattan":
+            def inside(dx, dy): return abs(dx) + abs(dy) <= r
+        elif metric == "euclidean":
+            def inside(dx, dy): return dx * dx + dy * dy <= r * r
+        else:
+            raise ValueError(f"unknown metric {metric!r}")
+
+        found = []
+        cells = self._cells
+        if (2 * r + 1) ** 2 <= len(cells):
+            for cx in range(x - r, x + r + 1):
+                for cy in range(y - r, y + r + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket and inside(cx - x, cy - y):
+                        found.extend(bucket)
+        else:
+            for (cx, cy), bucket in cells.items():
+                dx, dy = cx - x, cy - y
+                if -r <= dx <= r and -r <= dy <= r and inside(dx, dy):
+                    found.extend(bucket)
+        return found
+
+    def agents_near(self, x, y):
+        """Agents on (x, y) or on any of its 8 neighbours."""
+        return self.agents_within(x, y, 1)
 
     # ------------------------------------------------------------
     def is_valid_position(self, x, y):
         return (
             0 <= x < self.height and
             0 <= y < self.width and
-            (x, y) not in self.obstacles
+            not (self.grid[x * self.width + y] & OBSTACLE)
         )
 
-    def _neighbors4(self, x, y):
-        return [
-            (x-1, y),
-            (x+1, y),
-            (x, y-1),
-            (x, y+1)
-        ]
-
     # ------------------------------------------------------------
     # CLONE (needed for evolutionary Maze training)
     # ------------------------------------------------------------
     def clone(self):
         """
-        Returns a fresh copy of the world with the same layout,
-        but with no agents and reset step counter.
+        Returns a fresh world sharing the same (immutable) layout,
+        with no agents and reset step counter. O(1).
         """
-        return World(
-            height=self.height,
-            width=self.width,
-            goals=list(self.goals),
-            obstacles=set(self.obstacles),
-            mode=self.mode,
-        )
+        return World(mode=self.mode, layout=self.layout)
 
 
     # ------------------------------------------------------------
     # DISPLAY (CONSOLE)
     # ------------------------------------------------------------
     def display(self):
-        RED = "\033[91m"
-        GREEN = "\033[92m"
-        YELLOW = "\033[93m"
-        CYAN = "\033[96m"
-        RESET = "\033[0m"
-
-        top_border = CYAN + "+" + "-" * (self.width * 2) + "+" + RESET
-        print(top_border)
-
-        for x in range(self.height):
-            row_str = CYAN + "|" + RESET
-            for y in range(self.width):
-
-                # Obstacles
-                if (x, y) in self.obstacles:
-                    row_str += RED + "# " + RESET
-                    continue
-
-                # Goals
-                if (x, y) in self.goals:
-                    row_str += YELLOW + "* " + RESET
-                    continue
-
-                # Agents
-                agent_here = next((a for a in self.agents if (a.x, a.y) == (x, y)), None)
-                if agent_here:
-                    row_str += GREEN + agent_here.name[0].upper() + " " + RESET
-                else:
-                    row_str += ". "
+        """Print the full frame (see Environments/Render.py for the live renderer)."""
+        print(render_full(self))
+        print()
 
-            row_str += CYAN + "|" + RESET
-            print(row_str)
 
-        print(CYAN + "+" + "-" * (self.width * 2) + "+" + RESET)
-        print()
+def _by_name(agent):
+    return agent.name
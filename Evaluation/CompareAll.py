@@ -3,14 +3,14 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 
-from Environments.Lighthouse import load_fixed_map as load_farol
-from Environments.Maze import load_fixed_map as load_maze
+from Environments.Lighthouse import load_cached_map as load_farol
+from Environments.Maze import load_cached_map as load_maze
 
 from Agents.Fixed.LighthouseFixedAgent import LighthouseFixedAgent
 from Agents.Fixed.MazeFixedAgent import MazeFixedAgent
 from Agents.LearningAgent import LearningAgent
 
-from Learning.Brains.QLearningBrain import QLearningBrain
+from Learning.Brains.QLearningBrain import make_q_brain
 from Learning.Brains.GenomeBrain import GenomeBrain
 from Learning.Adapters.FarolAdapter import FarolAdapter
 from Learning.Adapters.MazeAdapter import MazeAdapter
@@ -20,7 +20,8 @@ from Config import (
     FAROL_POLICY, MAZE_POLICY,
     FAROL_GENOME, MAZE_GENOME,
     RUNS, MAX_STEPS_FAROL, MAX_STEPS_MAZE,
-    EVO_HIDDEN
+    EVO_HIDDEN,
+    Q_BACKEND, Q_STATE_ENCODING
 )
 
 
@@ -51,7 +52,7 @@ def eval_farol_fixed():
     steps, succ = [], 0
     for _ in range(RUNS):
         env, starts, _, _ = load_farol(FAROL_MAP)
-        agent = LighthouseFixedAgent("FIXED", env, tuple(starts["A"]))
+        agent = LighthouseFixedAgent("FIXED", env, tuple(starts["A"]), verbose=False)
         agent.set_mode("test")
         ok, st = run_episode(env, agent, MAX_STEPS_FAROL)
         succ += int(ok)
@@ -60,9 +61,9 @@ def eval_farol_fixed():
 
 
 def eval_farol_q():
-    adapter = FarolAdapter()
-    brain = QLearningBrain()
-    brain.load(FAROL_POLICY)
+    adapter = FarolAdapter(encoding=Q_STATE_ENCODING)
+    brain = make_q_brain(Q_BACKEND, actions=adapter.ACTIONS)
+    brain.load(FAROL_POLICY, adapter=adapter)
 
     steps, succ = [], 0
     for _ in range(RUNS):
@@ -108,7 +109,7 @@ def eval_maze_fixed():
     steps, succ = [], 0
     for _ in range(RUNS):
         env, starts, _, _ = load_maze(MAZE_MAP)
-        agent = MazeFixedAgent("FIXED", env, tuple(starts["A"]))
+        agent = MazeFixedAgent("FIXED", env, tuple(starts["A"]), verbose=False)
         agent.set_mode("test")
         ok, st = run_episode(env, agent, MAX_STEPS_MAZE)
         succ += int(ok)
@@ -118,9 +119,9 @@ def eval_maze_fixed():
 
 def eval_maze_q():
     # IMPORTANT: must match training config
-    adapter = MazeAdapter(include_position=True)
-    brain = QLearningBrain()
-    brain.load(MAZE_POLICY)
+    adapter = MazeAdapter(include_position=True, encoding=Q_STATE_ENCODING)
+    brain = make_q_brain(Q_BACKEND, actions=adapter.ACTIONS)
+    brain.load(MAZE_POLICY, adapter=adapter)
 
     steps, succ = [], 0
     for _ in range(RUNS):
@@ -161,7 +162,13 @@ def eval_maze_evo():
     return succ, steps
 
 
-def summarize(env_name, label, success, steps):
+def shortest_path(load, map_file):
+    """Moves from start A to the goal, read from the map's cached distance field."""
+    env, starts, _, _ = load(map_file)
+    return env.distance_to_goal(*starts["A"])
+
+
+def summarize(env_name, label, success, steps, shortest=None):
     arr = np.array(steps, dtype=float)
     return {
         "env": env_name,
@@ -169,6 +176,8 @@ def summarize(env_name, label, success, steps):
         "success_rate": success / RUNS,
         "avg_steps": float(arr.mean()),
         "std_steps": float(arr.std()),
+        # optimality: 1.0 = always the shortest path (fail = max steps)
+        "path_ratio": float(arr.mean()) / shortest if shortest and shortest > 0 else float("nan"),
     }
 
 
@@ -178,23 +187,26 @@ if __name__ == "__main__":
     sF, stF = eval_farol_fixed()
     sQ, stQ = eval_farol_q()
     sE, stE = eval_farol_evo()
-    results.append(summarize("Farol", "Fixed", sF, stF))
-    results.append(summarize("Farol", "Q",     sQ, stQ))
-    results.append(summarize("Farol", "Evo",   sE, stE))
+    best = shortest_path(load_farol, FAROL_MAP)
+    results.append(summarize("Farol", "Fixed", sF, stF, best))
+    results.append(summarize("Farol", "Q",     sQ, stQ, best))
+    results.append(summarize("Farol", "Evo",   sE, stE, best))
 
     sF2, stF2 = eval_maze_fixed()
     sQ2, stQ2 = eval_maze_q()
     sE2, stE2 = eval_maze_evo()
-    results.append(summarize("Maze", "Fixed", sF2, stF2))
-    results.append(summarize("Maze", "Q",     sQ2, stQ2))
-    results.append(summarize("Maze", "Evo",   sE2, stE2))
+    best = shortest_path(load_maze, MAZE_MAP)
+    results.append(summarize("Maze", "Fixed", sF2, stF2, best))
+    results.append(summarize("Maze", "Q",     sQ2, stQ2, best))
+    results.append(summarize("Maze", "Evo",   sE2, stE2, best))
 
     print("\n================= COMPARISON SUMMARY =================")
     for r in results:
         print(
             f"{r['env']:5s} | {r['agent']:5s} | "
             f"success={100 * r['success_rate']:.1f}% | "
-            f"avg_steps={r['avg_steps']:.1f} ± {r['std_steps']:.1f}"
+            f"avg_steps={r['avg_steps']:.1f} ± {r['std_steps']:.1f} | "
+            f"steps/shortest={r['path_ratio']:.2f}"
         )
 
     envs = ["Farol", "Maze"]
@@ -3,11 +3,11 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 
-from Environments.Lighthouse import load_fixed_map
+from Environments.Lighthouse import load_cached_map
 from Agents.Fixed.LighthouseFixedAgent import LighthouseFixedAgent
 from Agents.LearningAgent import LearningAgent
 
-from Learning.Brains.QLearningBrain import QLearningBrain
+from Learning.Brains.QLearningBrain import make_q_brain
 from Learning.Brains.GenomeBrain import GenomeBrain
 from Learning.Adapters.FarolAdapter import FarolAdapter
 
@@ -17,7 +17,8 @@ from Config import (
     FAROL_GENOME as GENOME_FILE,
     RUNS,
     MAX_STEPS_FAROL as MAX_STEPS,
-    EVO_HIDDEN
+    EVO_HIDDEN,
+    Q_BACKEND, Q_STATE_ENCODING
 )
 
 
@@ -46,8 +47,8 @@ def run_episode(env, agent, max_steps=MAX_STEPS):
 def eval_fixed():
     steps, success = [], 0
     for _ in range(RUNS):
-        env, starts, _, _ = load_fixed_map(MAP_FILE)
-        agent = LighthouseFixedAgent("FIXED", env, tuple(starts["A"]))
+        env, starts, _, _ = load_cached_map(MAP_FILE)
+        agent = LighthouseFixedAgent("FIXED", env, tuple(starts["A"]), verbose=False)
         agent.set_mode("test")
         ok, st = run_episode(env, agent)
         success += int(ok)
@@ -56,13 +57,13 @@ def eval_fixed():
 
 
 def eval_q():
-    adapter = FarolAdapter()
-    brain = QLearningBrain()
-    brain.load(POLICY_FILE)
+    adapter = FarolAdapter(encoding=Q_STATE_ENCODING)
+    brain = make_q_brain(Q_BACKEND, actions=adapter.ACTIONS)
+    brain.load(POLICY_FILE, adapter=adapter)
 
     steps, success = [], 0
     for _ in range(RUNS):
-        env, starts, _, _ = load_fixed_map(MAP_FILE)
+        env, starts, _, _ = load_cached_map(MAP_FILE)
         agent = LearningAgent("Q", env, tuple(starts["A"]), adapter, brain)
         agent.set_mode("test")
         ok, st = run_episode(env, agent)
@@ -81,7 +82,7 @@ def eval_evo():
 
     steps, success = [], 0
     for _ in range(RUNS):
-        env, starts, _, _ = load_fixed_map(MAP_FILE)
+        env, starts, _, _ = load_cached_map(MAP_FILE)
 
         brain = GenomeBrain(
             genome=genome,
@@ -99,11 +100,19 @@ def eval_evo():
     return success, steps
 
 
-def summarize(label, success, steps):
+def shortest_path():
+    """Moves from start A to the goal, read from the map's cached distance field."""
+    env, starts, _, _ = load_cached_map(MAP_FILE)
+    return env.distance_to_goal(*starts["A"])
+
+
+def summarize(label, success, steps, shortest=None):
     arr = np.array(steps, dtype=float)
     print(f"\n=== FAROL {label} ===")
     print(f"Success: {success}/{RUNS} ({100 * success / RUNS:.1f}%)")
     print(f"Avg steps (fail=max): {arr.mean():.1f}  | std: {arr.std():.1f}")
+    if shortest and shortest > 0:
+        print(f"Shortest path: {shortest}  | avg steps / shortest: {arr.mean() / shortest:.2f}")
 
 
 if __name__ == "__main__":
@@ -111,9 +120,10 @@ if __name__ == "__main__":
     sQ, stQ = eval_q()
     sE, stE = eval_evo()
 
-    summarize("Fixed", sF, stF)
-    summarize("Q-learning", sQ, stQ)
-    summarize("Evolution", sE, stE)
+    best = shortest_path()
+    summarize("Fixed", sF, stF, best)
+    summarize("Q-learning", sQ, stQ, best)
+    summarize("Evolution", sE, stE, best)
 
     labels = ["Fixed", "Q", "Evo"]
     means  = [np.mean(stF), np.mean(stQ), np.mean(stE)]
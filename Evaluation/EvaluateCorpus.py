@@ -0,0 +1,80 @@
+# Evaluation/EvaluateCorpus.py
+"""
+Generalization test: run an agent on every map of a corpus
+(GenerateCorpus.py) and compare its steps to the shortest path.
+
+    python -m Evaluation.EvaluateCorpus Resources/corpus_maze --limit 2000
+
+Maps are streamed from the index (see Environments/Corpus.py), so memory
+does not grow with the corpus size.
+"""
+import argparse
+
+import numpy as np
+
+from Environments.Corpus import MapCorpus
+from Evaluation.CompareAll import run_episode
+from Agents.Fixed.LighthouseFixedAgent import LighthouseFixedAgent
+from Agents.Fixed.MazeFixedAgent import MazeFixedAgent
+
+
+def fixed_agent(kind):
+    cls = MazeFixedAgent if kind == "maze" else LighthouseFixedAgent
+
+    def make(env, start):
+        agent = cls("FIXED", env, start, verbose=False)
+        agent.set_mode("test")
+        return agent
+    return make
+
+
+def eval_corpus(corpus_dir, make_agent=None, limit=None, step_budget=4.0, min_steps=50):
+    """
+    make_agent(env, start_pos) -> agent (default: the fixed agent of the
+    corpus kind). Each episode gets max(min_steps, step_budget * shortest
+    path) steps. Returns per-map results and a summary.
+    """
+    corpus = MapCorpus(corpus_dir)
+    make_agent = make_agent or fixed_agent(corpus.kind)
+
+    results = []
+    for record, env, starts, _, _ in corpus.maps(limit=limit):
+        shortest = record["shortest_path"]["A"]
+        max_steps = max(min_steps, int(step_budget * max(shortest, 1)))
+        agent = make_agent(env, tuple(starts["A"]))
+        ok, steps = run_episode(env, agent, max_steps)
+        results.append({
+            "id": record["id"],
+            "size": (record["height"], record["width"]),
+            "success": ok,
+            "steps": steps,
+            "shortest_path": shortest,
+        })
+
+    return results, summarize(results)
+
+
+def summarize(results):
+    if not results:
+        return {"maps": 0}
+    ok = [r for r in results if r["success"]]
+    ratio = np.array([r["steps"] / max(r["shortest_path"], 1) for r in ok], dtype=float)
+    return {
+        "maps": len(results),
+        "success_rate": len(ok) / len(results),
+        "avg_steps": float(np.mean([r["steps"] for r in results])),
+        "avg_path_ratio": float(ratio.mean()) if len(ok) else float("nan"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fixed agent on every map of a corpus.")
+    parser.add_argument("root", help="corpus folder (GenerateCorpus.py)")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N maps")
+    args = parser.parse_args()
+
+    _, s = eval_corpus(args.root, limit=args.limit)
+    print(
+        f"{s['maps']} maps | success={100 * s.get('success_rate', 0):.1f}% | "
+        f"avg_steps={s.get('avg_steps', 0):.1f} | steps/shortest={s.get('avg_path_ratio', 0):.2f}"
+    )
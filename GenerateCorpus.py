@@ -0,0 +1,221 @@
+# GenerateCorpus.py
+"""
+Bulk map corpus for generalization tests (tens of thousands of maps).
+
+    python GenerateCorpus.py maze  20000 --sizes 21x21,41x41 --seed 1
+    python GenerateCorpus.py farol 20000 --sizes 10x10 --obstacle-ratio 0.3
+
+Maps are generated in a process pool, one deterministic seed per map
+(seed * 1_000_000_007 + id), and written as binary maps (.smap) into shards:
+
+    <out>/corpus.json              parameters (checked when resuming)
+    <out>/index.jsonl              one line per finished map
+    <out>/shard_00000/000000.smap  ... shard_size maps per folder
+
+index.jsonl records: id, kind, seed, height, width, starts, goal,
+shortest_path ({start name: moves to the goal}) and file (relative path).
+Each .smap also stores its distance-to-goal field (4 moves for maze, 8 for
+farol), so consumers read distances instead of running their own BFS.
+A line is only appended after its map file is complete, so an interrupted
+run is resumed by running the same command again: ids already in the index
+are skipped and everything else is (re)generated.
+
+Read the corpus lazily with Environments/Corpus.py.
+"""
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+from Environments.BinaryMap import save_binary_map, EXTENSION
+from Environments.Layout import Layout
+from Environments.Lighthouse import generate_random_map
+from Environments.RandomMazeGenerator import generate_maze_grid, ALGORITHMS
+
+INDEX = "index.jsonl"
+MANIFEST = "corpus.json"
+SEED_STRIDE = 1_000_000_007
+
+
+def map_seed(base_seed, map_id):
+    return base_seed * SEED_STRIDE + map_id
+
+
+def map_path(shard_size, map_id):
+    return os.path.join(f"shard_{map_id // shard_size:05d}", f"{map_id:06d}{EXTENSION}")
+
+
+# ---------------------------------------------------------
+# WORKER (runs in the pool)
+# ---------------------------------------------------------
+def _generate_one(out_dir, params, map_id):
+    seed = map_seed(params["seed"], map_id)
+    sizes = params["sizes"]
+    height, width = sizes[map_id % len(sizes)]
+
+    if params["kind"] == "maze":
+        grid, entrances = generate_maze_grid(height, width, algorithm=params["algorithm"], seed=seed)
+        start, goal = tuple(entrances[0]), tuple(entrances[1])
+        starts = {"A": start, "B": start}
+        moves = 4
+    else:
+        min_dist = params["min_start_dist"]
+        if min_dist is None:
+            min_dist = int(params["min_start_frac"] * (height - 1 + width - 1))
+        env, starts, goal, _ = generate_random_map(
+            height, width, params["obstacle_ratio"], min_dist, rng=random.Random(seed)
+        )
+        grid = env.layout.grid
+        moves = 8
+
+    layout = Layout(height, width, goals=[goal], grid=bytes(grid))
+    dist = layout.distance_field(moves)
+
+    rel = map_path(params["shard_size"], map_id)
+    path = os.path.join(out_dir, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    save_binary_map(tmp, height, width, [goal], starts, grid=grid, distances={moves: dist})
+    os.replace(tmp, path)
+
+    return {
+        "id": map_id,
+        "kind": params["kind"],
+        "seed": seed,
+        "height": height,
+        "width": width,
+        "starts": {name: list(p) for name, p in starts.items()},
+        "goal": list(goal),
+        "shortest_path": {name: dist[p[0] * width + p[1]] for name, p in starts.items()},
+        "file": rel.replace(os.sep, "/"),
+    }
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def _done_ids(index_path):
+    """Ids already in the index. A torn last line (crash mid-write) is cut off."""
+    done = set()
+    if not os.path.exists(index_path):
+        return done
+
+    good = 0
+    with open(index_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break                   # complete JSON but no newline: the next append would join it
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                break
+            good += len(line)
+    if good != os.path.getsize(index_path):
+        with open(index_path, "r+b") as f:
+            f.truncate(good)
+    return done
+
+
+def _check_manifest(out_dir, params):
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            old = json.load(f)
+        if old != params:
+            raise ValueError(
+                f"{out_dir} holds a corpus with different parameters; "
+                f"use another --out or the same options ({old})"
+            )
+    else:
+        with open(path, "w") as f:
+            json.dump(params, f, indent=4)
+
+
+def generate_corpus(out_dir, kind, count, sizes=((21, 21),), seed=0, algorithm="backtracker",
+                    obstacle_ratio=0.3, min_start_dist=None, min_start_frac=0.75,
+                    shard_size=1000, workers=None, log_every=500):
+    """Generate (or resume) a corpus of `count` maps in `out_dir`. Returns the number generated now."""
+    if kind not in ("maze", "farol"):
+        raise ValueError("kind must be 'maze' or 'farol'")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm must be one of {ALGORITHMS}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    params = {
+        "kind": kind,
+        "sizes": [list(s) for s in sizes],
+        "seed": seed,
+        "algorithm": algorithm,
+        "obstacle_ratio": obstacle_ratio,
+        "min_start_dist": min_start_dist,
+        "min_start_frac": min_start_frac,
+        "shard_size": shard_size,
+    }
+    _check_manifest(out_dir, params)
+
+    index_path = os.path.join(out_dir, INDEX)
+    done = _done_ids(index_path)
+    todo = [i for i in range(count) if i not in done]
+    print(f"[Corpus] {len(done)} maps already done, {len(todo)} to generate -> {out_dir}")
+    if not todo:
+        return 0
+
+    generated = 0
+    window = 4 * (workers or os.cpu_count() or 1)    # bounded number of pending jobs
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(index_path, "a") as index:
+
+        def record(finished):
+            nonlocal generated
+            for fut in finished:
+                index.write(json.dumps(fut.result()) + "\n")
+                index.flush()
+                generated += 1
+                if generated % log_every == 0:
+                    print(f"[Corpus] {len(done) + generated}/{count}")
+
+        pending = set()
+        for map_id in todo:
+            pending.add(pool.submit(_generate_one, out_dir, params, map_id))
+            if len(pending) >= window:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                record(finished)
+        record(as_completed(pending))
+
+    print(f"[Corpus] done: {len(done) + generated}/{count} maps in {out_dir}")
+    return generated
+
+
+def _parse_sizes(text):
+    return [tuple(int(v) for v in s.lower().split("x")) for s in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a sharded map corpus with an index.")
+    parser.add_argument("kind", choices=("maze", "farol"))
+    parser.add_argument("count", type=int)
+    parser.add_argument("--out", default=None, help="output folder (default Resources/corpus_<kind>)")
+    parser.add_argument("--sizes", default="21x21", help="comma-separated HxW list, cycled over ids")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", default="backtracker", choices=ALGORITHMS)
+    parser.add_argument("--obstacle-ratio", type=float, default=0.3)
+    parser.add_argument("--min-start-dist", type=int, default=None)
+    parser.add_argument("--min-start-frac", type=float, default=0.75,
+                        help="farol: min start distance as a fraction of H+W-2 (if no --min-start-dist)")
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(__file__)), "Resources", f"corpus_{args.kind}")
+    generate_corpus(
+        out, args.kind, args.count,
+        sizes=_parse_sizes(args.sizes),
+        seed=args.seed,
+        algorithm=args.algorithm,
+        obstacle_ratio=args.obstacle_ratio,
+        min_start_dist=args.min_start_dist,
+        min_start_frac=args.min_start_frac,
+        shard_size=args.shard_size,
+        workers=args.workers,
+    )
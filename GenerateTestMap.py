@@ -1,7 +1,8 @@
 import json
 import os
 from Environments.Lighthouse import setup_lighthouse
-from Environments.RandomMazeGenerator import generate_maze
+from Environments.RandomMazeGenerator import generate_maze, generate_maze_grid
+from Environments.BinaryMap import save_binary_map
 
 # Pasta onde vamos salvar os mapas
 RESOURCES_DIR = "Resources"
@@ -52,6 +53,24 @@ def save_maze_map(filename, height=11, width=11):
         json.dump(data, f, indent=4)
     print(f"[Maze] Mapa salvo em {filepath}")
 
+# ------------------------
+# MAZE GRANDE EM BINÁRIO (.smap)
+# ------------------------
+def save_maze_smap(filename, height, width, seed=None, algorithm="eller"):
+    """Huge mazes: the byte grid goes straight into the .smap, no wall list/JSON."""
+    grid, entrances = generate_maze_grid(height, width, algorithm=algorithm, seed=seed)
+
+    filepath = os.path.join(RESOURCES_DIR, filename)
+    save_binary_map(
+        filepath,
+        height=height,
+        width=width,
+        goals=[entrances[1]],
+        start_positions={"A": entrances[0], "B": entrances[0]},
+        grid=grid,
+    )
+    print(f"[Maze] Mapa binário salvo em {filepath}")
+
 # ------------------------
 # EXEMPLO DE USO
 # ------------------------
@@ -1,5 +1,14 @@
 # Learning/Adapters/FarolAdapter.py
-from Learning.Adapters.TaskAdapter import TaskAdapter
+from Learning.Adapters.TaskAdapter import (
+    TaskAdapter, mask_to_actions_table, mask_to_blocked_table, bits_to_floats
+)
+
+
+def _one_hot_table(labels):
+    return {
+        d: tuple(1.0 if j == i else 0.0 for j in range(len(labels)))
+        for i, d in enumerate(labels)
+    }
 
 
 class FarolAdapter(TaskAdapter):
@@ -10,6 +19,9 @@ class FarolAdapter(TaskAdapter):
           direction one-hot (9: HERE + 8 compass)
         + blocked 8 bits
       => total 17 inputs
+
+    encoding="packed" returns the same features as one int:
+    blocked bits << 4 | direction index (0 = HERE, see DIRS).
     """
 
     ACTIONS = ["N", "S", "E", "W", "NE", "NW", "SE", "SW"]
@@ -29,6 +41,23 @@ class FarolAdapter(TaskAdapter):
     DIRS = ["HERE", "N", "S", "E", "W", "NE", "NW", "SE", "SW"]
     DIR_TO_IDX = {d: i for i, d in enumerate(DIRS)}
 
+    # Actions rewarded for following the observed direction
+    DIRECAO_MAP = {
+        "N": ["N", "NE", "NW"],
+        "S": ["S", "SE", "SW"],
+        "E": ["E", "NE", "SE"],
+        "W": ["W", "NW", "SW"],
+        "NE": ["NE", "N", "E"],
+        "NW": ["NW", "N", "W"],
+        "SE": ["SE", "S", "E"],
+        "SW": ["SW", "S", "W"],
+    }
+
+    def __init__(self, distance_shaping: float = 0.0, encoding: str = "tuple"):
+        # > 0: add potential-based shaping on the true (8-move) distance to the goal
+        self.distance_shaping = distance_shaping
+        self._set_encoding(encoding)
+
     def observation_size(self) -> int:
         # 9 (direction one-hot incl HERE) + 8 (blocked bits)
         return 17
@@ -36,48 +65,47 @@ class FarolAdapter(TaskAdapter):
     def action_size(self) -> int:
         return len(self.ACTIONS)
 
+    # Per-mask lookup tables over World.moves8 (bit i <-> ACTIONS[i])
+    _MASK_TO_VALID = mask_to_actions_table(ACTIONS)
+    _MASK_TO_BLOCKED = mask_to_blocked_table(8)
+    _DIR_ONE_HOT = _one_hot_table(DIRS)
+
+    # packed encoding: 4 bits direction + 8 bits blocked -> float tuple
+    _PACKED_FLOATS = [
+        bits_to_floats(1 << (p & 0xF), 9) + bits_to_floats(p >> 4, 8) if p & 0xF < 9 else None
+        for p in range(1 << 12)
+    ]
+
     def build_state(self, agent, obs, env):
-        direction = obs.get("direcao_farol", "HERE")
-        if direction not in self.DIR_TO_IDX:
-            direction = "HERE"
-
-        x, y = agent.x, agent.y
-        blocked = {
-            "N":  not env.is_valid_position(x - 1, y),
-            "S":  not env.is_valid_position(x + 1, y),
-            "E":  not env.is_valid_position(x, y + 1),
-            "W":  not env.is_valid_position(x, y - 1),
-            "NE": not env.is_valid_position(x - 1, y + 1),
-            "NW": not env.is_valid_position(x - 1, y - 1),
-            "SE": not env.is_valid_position(x + 1, y + 1),
-            "SW": not env.is_valid_position(x + 1, y - 1),
-        }
+        if self.packed:
+            return (
+                self.DIR_TO_IDX.get(obs.direcao_farol, 0)
+                | (~env.moves8(agent.x, agent.y) & 0xFF) << 4
+            )
 
         # direction one-hot (9)
-        dir_vec = [0.0] * 9
-        dir_vec[self.DIR_TO_IDX[direction]] = 1.0
+        dir_vec = self._DIR_ONE_HOT.get(obs.direcao_farol, self._DIR_ONE_HOT["HERE"])
 
         # blocked bits (8) in ACTIONS order
-        blocked_vec = [1.0 if blocked[a] else 0.0 for a in self.ACTIONS]
+        blocked_vec = self._MASK_TO_BLOCKED[env.moves8(agent.x, agent.y)]
 
         # Return as tuple (hashable for Q-learning; numeric for GenomeBrain)
-        return tuple(dir_vec + blocked_vec)
+        return dir_vec + blocked_vec
+
+    def decode_state(self, state):
+        if not isinstance(state, int):
+            return state
+        return self._PACKED_FLOATS[state]
 
     def valid_actions(self, agent, env, obs=None):
-        valid = []
-        for a in self.ACTIONS:
-            dx, dy = self.ACTION_TO_DELTA[a]
-            nx, ny = agent.x + dx, agent.y + dy
-            if env.is_valid_position(nx, ny):
-                valid.append(a)
-        return valid
+        return self._MASK_TO_VALID[env.moves8(agent.x, agent.y)]
 
     def action_to_move(self, agent, action):
         dx, dy = self.ACTION_TO_DELTA[action]
         return (agent.x + dx, agent.y + dy)
 
     def is_terminal(self, agent, obs, env):
-        return obs.get("direcao_farol") == "HERE" or getattr(agent, "reached_goal", False)
+        return obs.direcao_farol == "HERE" or getattr(agent, "reached_goal", False)
 
     def reward(self, agent, prev_state, action, new_state, obs, step, max_steps):
         """
@@ -95,28 +123,22 @@ class FarolAdapter(TaskAdapter):
             r = -0.1
             agent.visited_positions.add(pos)
 
-        # Decode direction from one-hot
-        # new_state[0:9] is one-hot
-        dir_idx = max(range(9), key=lambda i: new_state[i])
+        # Decode direction: low 4 bits (packed) or new_state[0:9] one-hot
+        if self.packed:
+            dir_idx = new_state & 0xF
+        else:
+            dir_idx = max(range(9), key=lambda i: new_state[i])
         direction_now = self.DIRS[dir_idx]
 
-        DIRECAO_MAP = {
-            "N": ["N", "NE", "NW"],
-            "S": ["S", "SE", "SW"],
-            "E": ["E", "NE", "SE"],
-            "W": ["W", "NW", "SW"],
-            "NE": ["NE", "N", "E"],
-            "NW": ["NW", "N", "W"],
-            "SE": ["SE", "S", "E"],
-            "SW": ["SW", "S", "W"],
-        }
-
         if prev_state is not None and direction_now != "HERE":
-            if action in DIRECAO_MAP.get(direction_now, []):
+            if action in self.DIRECAO_MAP.get(direction_now, []):
                 r += 1.0
 
         if direction_now == "HERE":
             r += 100.0 * (1 - step / max_steps)
             agent.visited_positions.clear()
 
+        if self.distance_shaping:
+            r += self.distance_bonus(agent)
+
         return r
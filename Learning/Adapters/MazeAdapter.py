@@ -1,5 +1,14 @@
 # Learning/Adapters/MazeAdapter.py
-from Learning.Adapters.TaskAdapter import TaskAdapter
+from Learning.Adapters.TaskAdapter import (
+    TaskAdapter, mask_to_actions_table, mask_to_blocked_table, bits_to_floats
+)
+
+# packed encoding: bits 0-3 walls, 4-7 goal-adj, 8-10 last action (0 = None,
+# 1 + ACTIONS index); with include_position, y and then x above them
+CORE_BITS = 11
+CORE_MASK = (1 << CORE_BITS) - 1
+POS_BITS = 20                       # coordinates up to 2**20 - 1
+POS_MASK = (1 << POS_BITS) - 1
 
 
 class MazeAdapter(TaskAdapter):
@@ -22,13 +31,36 @@ class MazeAdapter(TaskAdapter):
     Why this exists:
     - Evolution works fine with partial observability (recurrent memory).
     - Tabular Q-learning often FAILS without position (state aliasing).
+
+    encoding="packed" returns the same features as one int
+    (x << 31 | y << 11 | last << 8 | goal-adj << 4 | walls); decode_state
+    gives back the float tuple.
     """
 
     ACTIONS = ["up", "down", "left", "right"]
     ACTION_TO_IDX = {a: i for i, a in enumerate(ACTIONS)}
 
-    def __init__(self, include_position: bool = False):
+    # Per-mask lookup tables over World.moves4 (bit i <-> ACTIONS[i])
+    _MASK_TO_VALID = mask_to_actions_table(ACTIONS)
+    _MASK_TO_WALLS = mask_to_blocked_table(4)
+
+    # packed encoding: goal offset -> goal-adj bit, core bits -> float tuple
+    _GOAL_ADJ_BIT = {(-1, 0): 1 << 4, (1, 0): 1 << 5, (0, -1): 1 << 6, (0, 1): 1 << 7}
+    _CORE_FLOATS = [
+        bits_to_floats(c, 8) + bits_to_floats(1 << (c >> 8), 5) if c >> 8 <= 4 else None
+        for c in range(1 << CORE_BITS)
+    ]
+
+    def __init__(self, include_position: bool = False, distance_shaping: float = 0.0,
+                 encoding: str = "tuple"):
         self.include_position = include_position
+        self.distance_shaping = distance_shaping
+        self._set_encoding(encoding)
+
+    def config_fingerprint(self):
+        fingerprint = super().config_fingerprint()
+        fingerprint["include_position"] = self.include_position
+        return fingerprint
 
     def observation_size(self) -> int:
         return 15 if self.include_position else 13
@@ -37,14 +69,22 @@ class MazeAdapter(TaskAdapter):
         return len(self.ACTIONS)
 
     def build_state(self, agent, obs, env):
-        x, y = obs["posicao"]
-        gx, gy = obs["goals"][0]
+        x, y = obs.posicao
+        gx, gy = obs.goals[0]
+
+        if self.packed:
+            last = getattr(agent, "last_action", None)
+            core = (
+                (~env.moves4(x, y) & 0xF)
+                | self._GOAL_ADJ_BIT.get((gx - x, gy - y), 0)
+                | (0 if last is None else 1 + self.ACTION_TO_IDX[last]) << 8
+            )
+            if self.include_position:
+                return ((x << POS_BITS | y) << CORE_BITS) | core
+            return core
 
         # walls (4)
-        wU = 1.0 if env.is_blocked(x - 1, y) else 0.0
-        wD = 1.0 if env.is_blocked(x + 1, y) else 0.0
-        wL = 1.0 if env.is_blocked(x, y - 1) else 0.0
-        wR = 1.0 if env.is_blocked(x, y + 1) else 0.0
+        wU, wD, wL, wR = self._MASK_TO_WALLS[env.moves4(x, y)]
 
         # goal adjacency (4)
         gU = 1.0 if (x - 1, y) == (gx, gy) else 0.0
@@ -68,15 +108,17 @@ class MazeAdapter(TaskAdapter):
 
         return core
 
+    def decode_state(self, state):
+        if not isinstance(state, int):
+            return state
+        core = self._CORE_FLOATS[state & CORE_MASK]
+        if self.include_position:
+            pos = state >> CORE_BITS
+            return (float(pos >> POS_BITS), float(pos & POS_MASK), *core)
+        return core
+
     def valid_actions(self, agent, env, obs=None):
-        x, y = agent.x, agent.y
-        candidates = {
-            "up":    (x - 1, y),
-            "down":  (x + 1, y),
-            "left":  (x, y - 1),
-            "right": (x, y + 1),
-        }
-        return [a for a, (nx, ny) in candidates.items() if not env.is_blocked(nx, ny)]
+        return self._MASK_TO_VALID[env.moves4(agent.x, agent.y)]
 
     def action_to_move(self, agent, action):
         x, y = agent.x, agent.y
@@ -91,7 +133,7 @@ class MazeAdapter(TaskAdapter):
         return (x, y)
 
     def is_terminal(self, agent, obs, env):
-        return obs["posicao"] in obs["goals"] or getattr(agent, "reached_goal", False)
+        return obs.posicao in obs.goals or getattr(agent, "reached_goal", False)
 
     def reward(self, agent, prev_state, action, new_state, obs, step, max_steps):
         """
@@ -99,11 +141,12 @@ class MazeAdapter(TaskAdapter):
           - small step penalty
           - penalize revisits (loop penalty)
           - big reward on reaching goal (scaled by speed)
+          - optional distance-to-goal shaping (distance_shaping > 0)
         """
         if not hasattr(agent, "visited_positions"):
             agent.visited_positions = set()
 
-        pos = obs["posicao"]
+        pos = obs.posicao
 
         r = -0.05
         if pos in agent.visited_positions:
@@ -111,7 +154,10 @@ class MazeAdapter(TaskAdapter):
         else:
             agent.visited_positions.add(pos)
 
-        if pos in obs["goals"]:
+        if pos in obs.goals:
             r += 50.0 * (1 - step / max_steps)
 
+        if self.distance_shaping:
+            r += self.distance_bonus(agent)
+
         return r
@@ -1,6 +1,28 @@
 # Learning/Adapters/TaskAdapter.py
 from abc import ABC, abstractmethod
 
+
+def mask_to_actions_table(actions):
+    """Lookup table: move bitmask -> tuple of the actions whose bit is set."""
+    return [
+        tuple(a for i, a in enumerate(actions) if mask & (1 << i))
+        for mask in range(1 << len(actions))
+    ]
+
+
+def bits_to_floats(bits, n):
+    """Low n bits of an int -> n floats (bit i -> element i)."""
+    return tuple(1.0 if bits >> i & 1 else 0.0 for i in range(n))
+
+
+def mask_to_blocked_table(n):
+    """Lookup table: move bitmask -> n floats, 1.0 where the move is blocked."""
+    return [
+        tuple(0.0 if mask & (1 << i) else 1.0 for i in range(n))
+        for mask in range(1 << n)
+    ]
+
+
 class TaskAdapter(ABC):
     """
     Environment–specific logic:
@@ -9,19 +31,51 @@ class TaskAdapter(ABC):
       - how an action maps to a movement (x,y)
       - when an episode is terminal
       - reward function (for learning brains)
+
+    States come in two encodings:
+      - "tuple" : tuple of floats, what GenomeBrain.forward takes (default)
+      - "packed": the same binary features packed into one int, a much
+                  smaller and faster Q-table key; decode_state turns it back
+                  into the float tuple (pass it as GenomeBrain's state_decoder)
     """
 
     # subclasses override if they want a static list
     ACTIONS = []
 
+    ENCODINGS = ("tuple", "packed")
+    encoding = "tuple"
+    packed = False
+
+    # potential-based shaping on the true distance to the goal (0 = off)
+    distance_shaping = 0.0
+
     @abstractmethod
     def build_state(self, agent, obs, env):
         """Return a hashable state representation for the brain."""
         pass
 
+    def decode_state(self, state):
+        """Float tuple of a state (states in the tuple encoding are returned as is)."""
+        return state
+
+    def config_fingerprint(self):
+        """What a Q-table trained with this adapter depends on (stored in .qpol policies)."""
+        return {
+            "adapter": type(self).__name__,
+            "encoding": self.encoding,
+            "observation_size": self.observation_size(),
+            "actions": list(self.ACTIONS),
+        }
+
+    def _set_encoding(self, encoding):
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"encoding must be one of {self.ENCODINGS}")
+        self.encoding = encoding
+        self.packed = encoding == "packed"
+
     @abstractmethod
     def valid_actions(self, agent, env, obs=None):
-        """Return list of action labels that are currently legal."""
+        """Return the sequence of action labels that are currently legal (ACTIONS order)."""
         pass
 
     @abstractmethod
@@ -40,3 +94,16 @@ class TaskAdapter(ABC):
         Evolutionary brains can ignore it.
         """
         return 0.0
+
+    def distance_bonus(self, agent):
+        """
+        Potential-based shaping: distance_shaping * (d_before - d_now), with d
+        read from the world's cached BFS field (World.distance_to_goal).
+        Zero on the first step of an episode and around unreachable cells.
+        """
+        d = agent.env.distance_to_goal(agent.x, agent.y)
+        prev = getattr(agent, "goal_distance", None)
+        agent.goal_distance = d
+        if prev is None or prev < 0 or d < 0:
+            return 0.0
+        return self.distance_shaping * (prev - d)
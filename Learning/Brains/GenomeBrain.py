@@ -1,7 +1,7 @@
 # Learning/Brains/GenomeBrain.py
 import random
 import math
-from typing import List, Optional, Sequence
+from typing import Callable, List, Optional, Sequence
 
 
 class GenomeBrain:
@@ -16,6 +16,8 @@ class GenomeBrain:
         * adapter.action_size()
     - Correctly chooses the best action among valid_actions
       while keeping outputs aligned with adapter.ACTIONS
+    - state_decoder (e.g. adapter.decode_state) turns packed int states
+      back into the float input vector
     """
 
     def __init__(
@@ -25,6 +27,7 @@ class GenomeBrain:
         hidden: int = 6,
         outputs: int = 4,
         action_order: Optional[Sequence[str]] = None,
+        state_decoder: Optional[Callable] = None,
     ):
         self.INPUTS = int(inputs)
         self.HIDDEN = int(hidden)
@@ -32,6 +35,7 @@ class GenomeBrain:
 
         # Fixed action order (should match adapter.ACTIONS)
         self.action_order = list(action_order) if action_order is not None else None
+        self.state_decoder = state_decoder
 
         self.genome = genome if genome is not None else self.random_genome(
             self.INPUTS, self.HIDDEN, self.OUTPUTS
@@ -121,6 +125,8 @@ class GenomeBrain:
         IMPORTANT: output neurons are aligned with self.action_order (adapter.ACTIONS),
         NOT with valid_actions order.
         """
+        if self.state_decoder is not None:
+            state = self.state_decoder(state)
         scores = self.forward(state)
 
         if self.action_order is None:
@@ -0,0 +1,225 @@
+# Learning/Brains/NumpyQLearningBrain.py
+import json
+import random
+from array import array
+from typing import List, Optional
+
+import numpy as np
+
+from Learning.Brains.PolicyFile import (
+    EXTENSION, is_policy_file, write_policy, read_policy, read_json_policy,
+    check_fingerprint, check_states
+)
+
+
+class NumpyQLearningBrain:
+    """
+    Tabular Q-learning with the table in a NumPy matrix.
+    Same API and policy files as QLearningBrain (select_action / update /
+    save / load), but:
+      - each state is interned once to a row id (state_ids / states)
+      - each action label is a column (actions / action_ids)
+      - values live in a growable (rows x actions) float matrix, and a
+        per-row bitmask (`known`, bit = column) marks the (state, action)
+        pairs that the dict version would hold, so max/argmax give the
+        same results.
+
+    With the default float64 and the same random state it makes exactly the
+    same choices and updates as QLearningBrain.
+    """
+
+    def __init__(self, alpha=0.3, gamma=0.95, epsilon=0.2, actions=None,
+                 dtype=np.float64, capacity=1024):
+        self.alpha = float(alpha)
+        self.gamma = float(gamma)
+        self.epsilon = float(epsilon)
+        self.dtype = np.dtype(dtype)
+
+        self.state_ids = {}
+        self.states = []
+        self.action_ids = {}
+        self.actions = []
+
+        n_cols = len(actions) if actions else 4
+        self.values = np.zeros((max(1, capacity), n_cols), dtype=self.dtype)
+        self.known = array("Q")
+
+        self._cols = {}             # valid_actions tuple -> (columns, bitmask)
+        self._mask_cols = {}        # known bitmask -> columns
+        self._hot_state = None      # last interned state (the agent passes the same object twice)
+        self._hot_id = -1
+
+        for a in actions or ():
+            self._column(a)
+
+    # --------------------------------------------------
+    def select_action(self, state, valid_actions, mode="train"):
+        sid = self._row(state)
+        cols, bits = self._columns(valid_actions)
+        self.known[sid] |= bits
+
+        if mode == "train" and random.random() < self.epsilon:
+            return random.choice(valid_actions)
+
+        return self._greedy(sid, valid_actions, cols)
+
+    # --------------------------------------------------
+    def update(self, prev_state, action, reward, new_state, done, next_valid_actions: Optional[List[str]] = None):
+        """
+        Optionally accept next_valid_actions so q_next is computed safely and consistently.
+        """
+        sid = self._row(prev_state)
+        col = self._column(action)
+        self.known[sid] |= 1 << col
+
+        nid = self._row(new_state)
+        if next_valid_actions is not None:
+            self.known[nid] |= self._columns(next_valid_actions)[1]
+
+        q_old = float(self.values[sid, col])
+
+        known = self.known[nid]
+        if done or not known:
+            q_next = 0.0
+        else:
+            row = self.values[nid].tolist()
+            q_next = max([row[c] for c in self._known_columns(known)])
+
+        self.values[sid, col] = (
+            q_old + self.alpha * (float(reward) + self.gamma * q_next - q_old)
+        )
+
+    # --------------------------------------------------
+    def _greedy(self, sid, valid_actions, cols):
+        row = self.values[sid].tolist()
+        vals = [row[c] for c in cols]
+        best = max(vals)
+        best_actions = [a for a, v in zip(valid_actions, vals) if v == best]
+        return random.choice(best_actions)
+
+    def _row(self, state):
+        if state is self._hot_state:
+            return self._hot_id
+
+        sid = self.state_ids.get(state)
+        if sid is None:
+            sid = len(self.states)
+            if sid == self.values.shape[0]:
+                self._resize(2 * sid, self.values.shape[1])
+            self.state_ids[state] = sid
+            self.states.append(state)
+            self.known.append(0)
+
+        self._hot_state, self._hot_id = state, sid
+        return sid
+
+    def _column(self, action):
+        col = self.action_ids.get(action)
+        if col is None:
+            col = len(self.actions)
+            if col == 64:
+                raise ValueError("NumpyQLearningBrain supports at most 64 actions")
+            if col == self.values.shape[1]:
+                self._resize(self.values.shape[0], max(4, 2 * col))
+            self.action_ids[action] = col
+            self.actions.append(action)
+        return col
+
+    def _columns(self, actions):
+        key = actions if isinstance(actions, tuple) else tuple(actions)
+        entry = self._cols.get(key)
+        if entry is None:
+            cols = tuple(self._column(a) for a in key)
+            entry = self._cols[key] = (cols, sum(1 << c for c in set(cols)))
+        return entry
+
+    def _known_columns(self, mask):
+        cols = self._mask_cols.get(mask)
+        if cols is None:
+            cols = self._mask_cols[mask] = tuple(c for c in range(mask.bit_length()) if mask >> c & 1)
+        return cols
+
+    def _resize(self, rows, cols):
+        values = np.zeros((rows, cols), dtype=self.dtype)
+        r, c = self.values.shape
+        values[:r, :c] = self.values
+        self.values = values
+
+    @classmethod
+    def from_table(cls, states, values, known, actions, **kwargs):
+        """Brain over an existing table (row -> state, values rows x actions, known bitmasks)."""
+        brain = cls(actions=actions, **kwargs)
+        brain.states = list(states)
+        brain.state_ids = dict(zip(brain.states, range(len(brain.states))))
+        brain.values = np.array(values, dtype=brain.dtype).reshape(len(brain.states), len(actions))
+        brain.known = array("Q", [int(k) for k in known])
+        if not len(brain.states):
+            brain._resize(1, len(actions))
+        return brain
+
+    # --------------------------------------------------
+    def __len__(self):
+        return len(self.states)
+
+    def q_values(self, state):
+        """{action: value} for a state, like QLearningBrain.Q[state]."""
+        sid = self.state_ids.get(state)
+        if sid is None:
+            return {}
+        row = self.values[sid].tolist()
+        return {self.actions[c]: row[c] for c in self._known_columns(self.known[sid])}
+
+    def to_dict(self):
+        """The table as QLearningBrain stores it: {state: {action: value}}."""
+        return {state: self.q_values(state) for state in self.states}
+
+    # --------------------------------------------------
+    def save(self, path, adapter=None):
+        """
+        JSON, or the binary format (PolicyFile) when path ends in .qpol;
+        the binary file records adapter.config_fingerprint().
+        """
+        if path.endswith(EXTENSION):
+            fingerprint = adapter.config_fingerprint() if adapter is not None else None
+            write_policy(path, self.states, self.values, self.known, self.actions, fingerprint)
+            return
+
+        with open(path, "w") as f:
+            json.dump({str(k): v for k, v in self.to_dict().items()}, f)
+
+    def load(self, path, adapter=None):
+        """
+        Load a JSON or binary policy (detected by content). A binary policy's
+        matrix is memory-mapped, not copied. With an adapter, a policy trained
+        with another adapter config is refused.
+        """
+        self._hot_state, self._hot_id = None, -1
+        self._cols = {}
+
+        if is_policy_file(path):
+            states, values, known, actions, fingerprint = read_policy(path)
+            check_fingerprint(fingerprint, adapter, path)
+            self.states = states
+            self.state_ids = dict(zip(states, range(len(states))))
+            self.actions = list(actions)
+            self.action_ids = {a: c for c, a in enumerate(self.actions)}
+            self.values = values
+            self.dtype = values.dtype
+            self.known = known
+            if not len(values):
+                self._resize(1, max(1, len(actions)))
+            return
+
+        table = read_json_policy(path)
+        check_states(table, adapter, path)
+
+        self.state_ids, self.states = {}, []
+        self.values[:] = 0.0
+        self.known = array("Q")
+
+        for state, actions in table.items():
+            sid = self._row(state)
+            for a, q in actions.items():
+                col = self._column(a)
+                self.values[sid, col] = q
+                self.known[sid] |= 1 << col
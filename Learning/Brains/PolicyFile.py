@@ -0,0 +1,293 @@
+# Learning/Brains/PolicyFile.py
+"""
+Versioned binary Q-policy format (.qpol), alongside the JSON policies.
+
+Layout of the file (little-endian):
+
+    magic       4s   b"QPOL"
+    version     H    1
+    key_kind    B    0 = int states (packed encoding), 1 = float tuples
+    value_kind  B    0 = float32, 1 = float64
+    n_states    Q
+    n_actions   I
+    key_len     I    floats per tuple state (0 for int states)
+    meta_len    I
+    meta        meta_len bytes of UTF-8 JSON:
+                {"actions": [labels in column order], "adapter": fingerprint}
+    ...padding...
+    states      n_states int64, or n_states x key_len float64   (64-byte aligned)
+    values      n_states x n_actions floats, row = state          (64-byte aligned)
+    known       n_states uint64, bit c = action c is in the table (64-byte aligned)
+
+Nothing is parsed or eval'd: the Q matrix is a copy-on-write memory map of
+the file (pages are only read when touched and writes never reach the file),
+and the states are rebuilt in one pass from their array.
+NumpyQLearningBrain (Q_BACKEND = "numpy") uses that map directly;
+QLearningBrain copies it into its dict of dicts when loading.
+
+The adapter fingerprint (TaskAdapter.config_fingerprint) is checked when a
+policy is loaded for an adapter: a policy trained with another state
+configuration (e.g. include_position) is refused instead of silently
+never matching a state.
+
+Usage:
+    python -m Learning.Brains.PolicyFile policy_farol.json policy_maze.json
+    python -m Learning.Brains.PolicyFile policy_maze.json --task maze --encoding tuple
+"""
+import argparse
+import ast
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+MAGIC = b"QPOL"
+VERSION = 1
+EXTENSION = ".qpol"
+
+_HEADER = struct.Struct("<4sHBBQIII")
+_ALIGN = 64
+_VALUE_DTYPES = (np.dtype("<f4"), np.dtype("<f8"))
+
+
+def _align(n):
+    return n + (-n % _ALIGN)
+
+
+def is_policy_file(path):
+    """True if `path` is a binary policy (checked by content, not by name)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def check_exists(path):
+    """FileNotFoundError with the migration command when only the JSON policy exists."""
+    if os.path.exists(path):
+        return
+    json_path = os.path.splitext(path)[0] + ".json"
+    if path.endswith(EXTENSION) and os.path.exists(json_path):
+        raise FileNotFoundError(
+            f"{path} not found; convert {json_path} with: "
+            f"python -m Learning.Brains.PolicyFile {json_path}"
+        )
+    raise FileNotFoundError(path)
+
+
+# ---------------------------------------------------------
+# ADAPTER CHECKS
+# ---------------------------------------------------------
+def check_fingerprint(stored, adapter, path):
+    if adapter is None or stored is None:
+        return
+    current = adapter.config_fingerprint()
+    if stored != current:
+        diff = {k: (stored.get(k), current.get(k)) for k in set(stored) | set(current)
+                if stored.get(k) != current.get(k)}
+        raise ValueError(
+            f"{path} was trained with another adapter config "
+            f"(policy vs adapter: {diff}); retrain or use a matching adapter"
+        )
+
+
+def check_states(states, adapter, path):
+    """For policies without a fingerprint (JSON): the first state must have the adapter's shape."""
+    if adapter is None:
+        return
+    for state in states:
+        expected = "int" if adapter.encoding == "packed" else f"{adapter.observation_size()} floats"
+        got = "int" if isinstance(state, int) else f"{len(state)} floats"
+        if got != expected:
+            raise ValueError(
+                f"{path} holds states of {got}, the adapter builds {expected} "
+                f"({adapter.config_fingerprint()})"
+            )
+        return
+
+
+# ---------------------------------------------------------
+# WRITE
+# ---------------------------------------------------------
+def write_policy(path, states, values, known, actions, fingerprint=None):
+    """
+    states: row -> state (all ints or all tuples of floats), values: (rows x
+    len(actions)) array, known: row -> bitmask of the actions in the table.
+    """
+    n = len(states)
+    values = np.asarray(values)[:n]
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    value_dtype = _VALUE_DTYPES[values.dtype == np.float64]
+
+    if n and all(isinstance(s, int) for s in states):
+        key_kind, key_len = 0, 0
+        keys = np.array(states, dtype="<i8")
+    elif n and all(isinstance(s, tuple) for s in states):
+        key_kind, key_len = 1, len(states[0])
+        if any(len(s) != key_len for s in states):
+            raise ValueError("all tuple states must have the same length")
+        keys = np.array(states, dtype="<f8").reshape(n, key_len)
+    elif n:
+        raise ValueError("states must be all ints (packed) or all tuples of floats")
+    else:
+        key_kind, key_len = 0, 0
+        keys = np.zeros(0, dtype="<i8")
+
+    meta = json.dumps({"actions": list(actions), "adapter": fingerprint}).encode("utf-8")
+
+    keys_offset = _align(_HEADER.size + len(meta))
+    values_offset = _align(keys_offset + keys.nbytes)
+    values = np.ascontiguousarray(values, dtype=value_dtype)
+    known_offset = _align(values_offset + values.nbytes)
+    known = np.array(known[:n], dtype="<u8")
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, key_kind, _VALUE_DTYPES.index(value_dtype), n, len(actions), key_len, len(meta)
+    )
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        for offset, arr in ((keys_offset, keys), (values_offset, values), (known_offset, known)):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(arr.tobytes())
+
+    return path
+
+
+# ---------------------------------------------------------
+# READ (memory-mapped)
+# ---------------------------------------------------------
+def read_policy(path):
+    """
+    Returns (states, values, known, actions, fingerprint): states a list
+    (row -> state), values a writable copy-on-write view of the file's
+    (rows x actions) matrix, known an array('Q') of action bitmasks.
+    """
+    check_exists(path)
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, key_kind, value_kind, n, n_actions, key_len, meta_len = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary policy file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported policy version {version}")
+
+    p = _HEADER.size
+    meta = json.loads(bytes(mm[p:p + meta_len]).decode("utf-8"))
+    actions = meta["actions"]
+    if len(actions) != n_actions:
+        raise ValueError(f"{path}: corrupt header ({n_actions} actions, {len(actions)} labels)")
+
+    keys_offset = _align(p + meta_len)
+    if key_kind == 0:
+        keys = np.frombuffer(mm, dtype="<i8", count=n, offset=keys_offset)
+        states = keys.tolist()
+    else:
+        keys = np.frombuffer(mm, dtype="<f8", count=n * key_len, offset=keys_offset)
+        states = list(map(tuple, keys.reshape(n, key_len).tolist()))
+
+    value_dtype = _VALUE_DTYPES[value_kind]
+    values_offset = _align(keys_offset + keys.nbytes)
+    values = np.frombuffer(mm, dtype=value_dtype, count=n * n_actions, offset=values_offset)
+    values = values.reshape(n, n_actions)
+
+    known_offset = _align(values_offset + values.nbytes)
+    known = array("Q")
+    known.frombytes(mm[known_offset:known_offset + 8 * n])
+    if sys.byteorder == "big":
+        known.byteswap()
+
+    return states, values, known, actions, meta.get("adapter")
+
+
+# ---------------------------------------------------------
+# JSON POLICIES + MIGRATION
+# ---------------------------------------------------------
+def read_json_policy(path):
+    """{state: {action: value}} from a JSON policy, keys parsed with ast.literal_eval."""
+    check_exists(path)
+    with open(path, "r") as f:
+        raw = json.load(f)
+    return {ast.literal_eval(k): v for k, v in raw.items()}
+
+
+def table_to_arrays(table, actions=None):
+    """{state: {action: value}} -> (states, values, known, actions) for write_policy."""
+    actions = list(actions or ())
+    col = {a: i for i, a in enumerate(actions)}
+    for row in table.values():
+        for a in row:
+            if a not in col:
+                col[a] = len(actions)
+                actions.append(a)
+
+    states = list(table)
+    values = np.zeros((len(states), len(actions)), dtype=np.float64)
+    known = array("Q", bytes(8 * len(states)))
+    for i, row in enumerate(table.values()):
+        for a, q in row.items():
+            values[i, col[a]] = q
+            known[i] |= 1 << col[a]
+    return states, values, known, actions
+
+
+def infer_adapter(table, task=None, encoding=None, include_position=None):
+    """The adapter a JSON policy was trained with (from its actions and state shape)."""
+    from Learning.Adapters.FarolAdapter import FarolAdapter
+    from Learning.Adapters.MazeAdapter import MazeAdapter, CORE_MASK
+
+    states = list(table)
+    labels = {a for row in table.values() for a in row}
+    if task is None:
+        task = "farol" if labels and labels <= set(FarolAdapter.ACTIONS) else "maze"
+    if encoding is None:
+        encoding = "packed" if states and isinstance(states[0], int) else "tuple"
+
+    if task == "farol":
+        adapter = FarolAdapter(encoding=encoding)
+    else:
+        if include_position is None:
+            if encoding == "packed":
+                include_position = any(s > CORE_MASK for s in states)
+            else:
+                include_position = bool(states) and len(states[0]) == 15
+        adapter = MazeAdapter(include_position=include_position, encoding=encoding)
+
+    check_states(states, adapter, "policy")
+    return adapter
+
+
+def migrate_json_policy(json_path, out_path=None, adapter=None, **infer):
+    """Convert a JSON policy to .qpol (same name by default), with the adapter fingerprint."""
+    table = read_json_policy(json_path)
+    adapter = adapter or infer_adapter(table, **infer)
+    check_states(table, adapter, json_path)
+
+    out_path = out_path or os.path.splitext(json_path)[0] + EXTENSION
+    states, values, known, actions = table_to_arrays(table, adapter.ACTIONS)
+    write_policy(out_path, states, values, known, actions, adapter.config_fingerprint())
+    return out_path, adapter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert JSON Q-policies to the binary .qpol format.")
+    parser.add_argument("policies", nargs="+")
+    parser.add_argument("--task", choices=("farol", "maze"), default=None, help="default: from the action labels")
+    parser.add_argument("--encoding", choices=("tuple", "packed"), default=None, help="default: from the keys")
+    parser.add_argument("--include-position", dest="include_position", action="store_true", default=None)
+    parser.add_argument("--no-position", dest="include_position", action="store_false")
+    args = parser.parse_args()
+
+    for json_path in args.policies:
+        out, adapter = migrate_json_policy(
+            json_path, task=args.task, encoding=args.encoding, include_position=args.include_position
+        )
+        print(f"{json_path} -> {out} ({adapter.config_fingerprint()})")
@@ -66,12 +66,56 @@ class QLearningBrain:
                 self.Q[state].setdefault(a, 0.0)
 
     # --------------------------------------------------
-    def save(self, path):
+    def save(self, path, adapter=None):
+        """
+        JSON, or the binary format (PolicyFile) when path ends in .qpol;
+        the binary file records adapter.config_fingerprint().
+        """
+        if path.endswith(".qpol"):
+            from Learning.Brains.PolicyFile import write_policy, table_to_arrays
+            states, values, known, actions = table_to_arrays(
+                self.Q, adapter.ACTIONS if adapter is not None else None
+            )
+            fingerprint = adapter.config_fingerprint() if adapter is not None else None
+            write_policy(path, states, values, known, actions, fingerprint)
+            return
+
         with open(path, "w") as f:
             json.dump({str(k): v for k, v in self.Q.items()}, f)
 
-    def load(self, path):
-        with open(path, "r") as f:
-            raw = json.load(f)
-        # NOTE: eval is OK for coursework, but don't use in production.
-        self.Q = {eval(k): v for k, v in raw.items()}
+    def load(self, path, adapter=None):
+        """
+        Load a JSON or binary policy (detected by content). With an adapter,
+        a policy trained with another adapter config is refused.
+        A binary policy is copied into the dict table here; only
+        NumpyQLearningBrain keeps the memory-mapped matrix as is.
+        """
+        from Learning.Brains.PolicyFile import (
+            is_policy_file, read_policy, read_json_policy, check_fingerprint, check_states
+        )
+        if is_policy_file(path):
+            states, values, known, actions, fingerprint = read_policy(path)
+            check_fingerprint(fingerprint, adapter, path)
+            rows = values.tolist()
+            self.Q = {
+                state: {a: row[c] for c, a in enumerate(actions) if mask >> c & 1}
+                for state, row, mask in zip(states, rows, known)
+            }
+            return
+
+        self.Q = read_json_policy(path)
+        check_states(self.Q, adapter, path)
+
+
+def make_q_brain(backend="dict", actions=None, **kwargs):
+    """
+    Q-learning brain for Config.Q_BACKEND: "dict" (QLearningBrain) or
+    "numpy" (NumpyQLearningBrain, integer-indexed matrix; `actions` fixes
+    its column order). Both share the API and the policy file format.
+    """
+    if backend == "numpy":
+        from Learning.Brains.NumpyQLearningBrain import NumpyQLearningBrain
+        return NumpyQLearningBrain(actions=actions, **kwargs)
+    if backend != "dict":
+        raise ValueError("Q_BACKEND must be 'dict' or 'numpy'")
+    return QLearningBrain(**kwargs)
@@ -1,54 +1,116 @@
 # Main.py
 import time
 import Config as C
+import SimLogger
 
 from Environments.Lighthouse import setup_lighthouse, load_fixed_map as load_farol
 from Environments.Maze import setup_maze, load_fixed_map as load_maze
+from Environments.Scheduler import SequentialScheduler, SimultaneousScheduler, EventScheduler
 
 from Agents.LearningAgent import LearningAgent
 
 from Learning.Adapters.FarolAdapter import FarolAdapter
 from Learning.Adapters.MazeAdapter import MazeAdapter
-from Learning.Brains.QLearningBrain import QLearningBrain
+from Learning.Brains.QLearningBrain import make_q_brain
 from Learning.Brains.GenomeBrain import GenomeBrain
 
 from Training.TrainQLearningLighthouse import train_qlearning_lighthouse
 from Training.TrainQLearningMaze import train_qlearning_maze
+from Training.TrainQLearningVec import train_qlearning_vec
 from Training.TrainEvolutionLighthouse import train_evolution_farol
 from Training.TrainEvolutionMaze import train_evolution_maze
 
 
 class MotorDeSimulacao:
-    def __init__(self, env, agents, delay=0.4, max_steps=250):
+    """
+    Runs the observe -> act -> update loop.
+
+    headless=True disables rendering, per-step prints and the delay, for batch
+    runs. render_callback(env, step) (if given) is called every render_every
+    steps in both modes. With a renderer (e.g. Render.TerminalRenderer) the
+    live view is redrawn incrementally instead of printing env.display().
+    scheduler (Environments/Scheduler.py) decides how a step is executed:
+    one agent after the other (default) or all at once with collision rules,
+    optionally skipping finished/waiting agents and stopping when none is left.
+    executa() always prints a one-line steps/s summary (headless included) and
+    returns the run statistics (steps, steps/sec).
+    """
+
+    def __init__(self, env, agents, delay=0.4, max_steps=250,
+                 headless=False, render_every=1, render_callback=None, renderer=None,
+                 scheduler=None):
         self.env = env
         self.agents = agents
         self.delay = delay
         self.max_steps = max_steps
+        self.headless = headless
+        self.render_every = max(1, int(render_every))
+        self.render_callback = render_callback
+        self.renderer = renderer
+        self.scheduler = scheduler or SequentialScheduler()
+        self.stats = None
 
     def executa(self):
-        for step in range(self.max_steps):
-            print(f"\n--- Step {step + 1} ---")
-            self.env.display()
+        verbose = not self.headless
+        steps_done = 0
+        finished = False
+        t0 = time.perf_counter()
 
-            for agent in self.agents:
-                obs = self.env.observacaoPara(agent)
-                agent.observacao(obs)
+        def announce(agent):
+            if agent.reached_goal:
+                print(f"🎯 Agente {agent.name} atingiu o objetivo!")
 
-                move = agent.age()
-                self.env.agir(move, agent)
+        after_move = announce if verbose else None
 
-                if agent.reached_goal:
-                    print(f"🎯 Agente {agent.name} atingiu o objetivo!")
+        for step in range(self.max_steps):
+            if verbose:
+                if self.renderer is not None:
+                    self.renderer.render(status=f"--- Step {step + 1} ---")
+                else:
+                    print(f"\n--- Step {step + 1} ---")
+                    self.env.display()
 
-            self.env.atualizacao()
+            if self.render_callback is not None and step % self.render_every == 0:
+                self.render_callback(self.env, step)
 
-            if all(a.reached_goal for a in self.agents):
-                print("🎉 Todos os agentes atingiram o objetivo!")
-                return
+            self.scheduler.step(self.env, self.agents, after_move)
 
-            time.sleep(self.delay)
+            self.env.atualizacao()
+            steps_done = step + 1
 
-        print("⏹ Limite de passos atingido.")
+            if all(a.reached_goal for a in self.agents):
+                finished = True
+                if verbose:
+                    print("🎉 Todos os agentes atingiram o objetivo!")
+                break
+
+            if self.scheduler.finished():
+                if verbose:
+                    print("⏸ Nenhum agente ativo: simulação terminada.")
+                break
+
+            if verbose:
+                time.sleep(self.delay)
+
+        if verbose and self.renderer is not None:
+            self.renderer.render(status=f"--- Step {steps_done} ---", force=True)
+            self.renderer.close()
+
+        if verbose and not finished and steps_done == self.max_steps:
+            print("⏹ Limite de passos atingido.")
+
+        elapsed = time.perf_counter() - t0
+        self.stats = {
+            "steps": steps_done,
+            "all_reached": finished,
+            "seconds": elapsed,
+            "steps_per_sec": steps_done / elapsed if elapsed > 0 else float("inf"),
+        }
+        print(
+            f"⏱ {steps_done} passos em {elapsed:.3f}s "
+            f"({self.stats['steps_per_sec']:.1f} passos/s, {len(self.agents)} agentes)"
+        )
+        return self.stats
 
 
 # ---------------------------------------------------
@@ -56,8 +118,9 @@ def build_learning_agent_farol(env, start_pos, metodo):
     adapter = FarolAdapter()
 
     if metodo == "qlearning":
-        brain = QLearningBrain()
-        brain.load(C.FAROL_POLICY)
+        adapter = FarolAdapter(encoding=C.Q_STATE_ENCODING)
+        brain = make_q_brain(C.Q_BACKEND, actions=adapter.ACTIONS)
+        brain.load(C.FAROL_POLICY, adapter=adapter)
 
         agent = LearningAgent("Q", env, start_pos, adapter, brain)
         agent.set_mode("test")
@@ -85,10 +148,10 @@ def build_learning_agent_farol(env, start_pos, metodo):
 def build_learning_agent_maze(env, start_pos, metodo):
     if metodo == "qlearning":
         # IMPORTANT: must match training state config
-        adapter = MazeAdapter(include_position=True)
+        adapter = MazeAdapter(include_position=True, encoding=C.Q_STATE_ENCODING)
 
-        brain = QLearningBrain()
-        brain.load(C.MAZE_POLICY)
+        brain = make_q_brain(C.Q_BACKEND, actions=adapter.ACTIONS)
+        brain.load(C.MAZE_POLICY, adapter=adapter)
 
         agent = LearningAgent("Q", env, start_pos, adapter, brain)
         agent.set_mode("test")
@@ -125,6 +188,14 @@ if __name__ == "__main__":
 
     metodo_aprendizagem = "qlearning" # "qlearning" | "evolution"
     treinar_antes = True              # True = train then test
+    treino_vetorizado = False         # (qlearning) True = batched trainer, Config.Q_VEC_ENVS envs in lockstep
+    headless = False                  # True = no display/prints/delay (batch runs)
+    escalonamento = "sequencial"      # "sequencial" | "simultaneo"
+    colisoes = "block"                # (simultaneo) "block" | "swap" | "stack"
+    saltar_inativos = False           # True = skip finished/waiting agents, stop when none is active
+
+    # Agent/environment traces (SimLogger): per-step debug only when not headless
+    SimLogger.setup_console(SimLogger.WARNING if headless else SimLogger.DEBUG)
 
     # Validation
     if tipo_agente == "learning" and tipo_mapa == "random":
@@ -142,7 +213,10 @@ if __name__ == "__main__":
             if treinar_antes:
                 if metodo_aprendizagem == "qlearning":
                     print("\n🔵 TREINO Q-LEARNING (FAROL)\n")
-                    train_qlearning_lighthouse(map_path)
+                    if treino_vetorizado:
+                        train_qlearning_vec("farol", map_path)
+                    else:
+                        train_qlearning_lighthouse(map_path)
                 else:
                     print("\n🔵 TREINO EVOLUTION (FAROL)\n")
                     train_evolution_farol(map_path)
@@ -153,7 +227,8 @@ if __name__ == "__main__":
             agents = [agent]
         else:
             json_file = map_path if tipo_mapa == "fixed" else None
-            env, agents = setup_lighthouse(agent_type="fixed", map_type=tipo_mapa, json_file=json_file)
+            env, agents = setup_lighthouse(agent_type="fixed", map_type=tipo_mapa, json_file=json_file,
+                                           verbose=not headless)
 
     # MAZE
     elif ambiente == "maze":
@@ -164,7 +239,10 @@ if __name__ == "__main__":
             if treinar_antes:
                 if metodo_aprendizagem == "qlearning":
                     print("\n🔵 TREINO Q-LEARNING (MAZE)\n")
-                    train_qlearning_maze(map_path)
+                    if treino_vetorizado:
+                        train_qlearning_vec("maze", map_path)
+                    else:
+                        train_qlearning_maze(map_path)
                 else:
                     print("\n🔵 TREINO EVOLUTION (MAZE)\n")
                     train_evolution_maze(map_path)
@@ -175,10 +253,17 @@ if __name__ == "__main__":
             agents = [agent]
         else:
             json_file = map_path if tipo_mapa == "fixed" else None
-            env, agents = setup_maze(agent_type="fixed", map_type=tipo_mapa, json_file=json_file)
+            env, agents = setup_maze(agent_type="fixed", map_type=tipo_mapa, json_file=json_file,
+                                     verbose=not headless)
 
     else:
         raise ValueError("Ambiente inválido! Escolher 'farol' ou 'maze'.")
 
-    motor = MotorDeSimulacao(env, agents, max_steps=max_steps)
-    motor.executa()
+    scheduler = SimultaneousScheduler(colisoes) if escalonamento == "simultaneo" else SequentialScheduler()
+    if saltar_inativos:
+        scheduler = EventScheduler(scheduler)
+
+    motor = MotorDeSimulacao(env, agents, max_steps=max_steps, headless=headless, scheduler=scheduler)
+    stats = motor.executa()
+    if headless:
+        print(f"Objetivo atingido por todos: {'sim' if stats['all_reached'] else 'não'}")
@@ -0,0 +1,142 @@
+# SimLogger.py
+"""
+Shared, level-gated logging for Agents/ and Environments/ (stdlib logging).
+
+All loggers live under the "sma" namespace. Messages use %-style arguments,
+so they are only formatted when a handler will actually emit them:
+
+    log = get_logger("maze")
+    log.info("start=%s goal=%s", start, goal)
+
+Agents get an AgentLog (agent.log) with their own verbosity on top of the
+logger level, so one noisy agent can be traced while the others stay quiet.
+
+Nothing is printed until a sink is installed:
+    setup_console(logging.DEBUG)          # human-readable, to stdout
+    enable_jsonl("trace.jsonl")           # one JSON object per record
+"""
+import json
+import logging
+import sys
+
+ROOT = "sma"
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def _verbosity_to_level(verbose):
+    if verbose is True:
+        return DEBUG
+    if verbose is False or verbose is None:
+        return WARNING
+    return int(verbose)
+
+
+class AgentLog:
+    """
+    Per-agent logger: records carry the agent name, and `level` filters this
+    agent only (verbose=True -> DEBUG, False -> WARNING, or a logging level).
+    """
+
+    __slots__ = ("_logger", "_extra", "level")
+
+    def __init__(self, agent_name, verbose=True, category="agents"):
+        self._logger = get_logger(category)
+        self._extra = {"agent": agent_name}
+        self.level = _verbosity_to_level(verbose)
+
+    def set_verbosity(self, verbose):
+        self.level = _verbosity_to_level(verbose)
+
+    def enabled(self, level=DEBUG):
+        return level >= self.level and self._logger.isEnabledFor(level)
+
+    def debug(self, msg, *args):
+        if DEBUG >= self.level and self._logger.isEnabledFor(DEBUG):
+            self._logger.debug(msg, *args, extra=self._extra)
+
+    def info(self, msg, *args):
+        if INFO >= self.level and self._logger.isEnabledFor(INFO):
+            self._logger.info(msg, *args, extra=self._extra)
+
+    def warning(self, msg, *args):
+        if WARNING >= self.level and self._logger.isEnabledFor(WARNING):
+            self._logger.warning(msg, *args, extra=self._extra)
+
+
+# ---------------------------------------------------------
+# SINKS
+# ---------------------------------------------------------
+class _ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        agent = getattr(record, "agent", None)
+        if agent is not None:
+            return f"   [{agent}] {record.getMessage()}"
+        return record.getMessage()
+
+
+class JsonlFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, agent, message, raw args."""
+
+    def format(self, record):
+        return json.dumps({
+            "t": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "agent": getattr(record, "agent", None),
+            "msg": record.getMessage(),
+            "args": list(record.args) if isinstance(record.args, tuple) else record.args,
+        }, ensure_ascii=False, default=str)
+
+
+def _root():
+    logger = logging.getLogger(ROOT)
+    logger.propagate = False
+    return logger
+
+
+def _lower_level(logger, level):
+    if logger.level == logging.NOTSET or level < logger.level:
+        logger.setLevel(level)
+
+
+def setup_console(level=DEBUG, stream=None):
+    """Print "sma" records at `level` or above (replaces a previous console sink)."""
+    logger = _root()
+    for h in list(logger.handlers):
+        if getattr(h, "_sma_console", False):
+            logger.removeHandler(h)
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler._sma_console = True
+    handler.setLevel(level)
+    handler.setFormatter(_ConsoleFormatter())
+    logger.addHandler(handler)
+    _lower_level(logger, level)
+    return handler
+
+
+def enable_jsonl(path, level=DEBUG):
+    """Append every "sma" record at `level` or above to a JSONL file."""
+    logger = _root()
+    handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    handler.setLevel(level)
+    handler.setFormatter(JsonlFormatter())
+    logger.addHandler(handler)
+    _lower_level(logger, level)
+    return handler
+
+
+def disable(handler):
+    """Remove a sink returned by setup_console / enable_jsonl."""
+    logger = _root()
+    logger.removeHandler(handler)
+    handler.close()
+    if not logger.handlers:
+        logger.setLevel(logging.NOTSET)
@@ -0,0 +1,510 @@
+# Training/HyperparameterSweep.py
+"""
+Hyperparameter sweeps over the Config values, run in a process pool.
+
+    python -m Training.HyperparameterSweep maze qlearning \\
+        --grid Q_ALPHA=0.1,0.3,0.5 Q_EPSILON=0.05,0.1,0.2 --min-budget 100 --max-budget 900
+    python -m Training.HyperparameterSweep farol evolution --random 24 \\
+        EVO_MUTATION_RATE=uniform:0.05:0.3 EVO_MUTATION_STD=loguniform:0.1:1 EVO_HIDDEN=4,6,8
+
+Parameters are named as in Config.py. The Q trainers receive theirs as
+arguments (Q_EPISODES, Q_MAX_STEPS, Q_ALPHA, Q_GAMMA, Q_EPSILON, Q_VEC_ENVS),
+the evolution trainers as their module constants (EVO_*, K_NEIGHBORS,
+ARCHIVE_ADD_TOP, NOVELTY_ALPHA), and any other Config name (Q_BACKEND,
+Q_STATE_ENCODING, ...) is set on Config for the run. Everything is restored
+after each run, so a pool worker can run any number of them.
+
+Every run gets its own seed (seed * SEED_STRIDE + config * repeats + repeat),
+the same at every rung, and is scored by evaluating what it trained in test
+mode on the same map: success rate first, then fewer average steps.
+
+Successive halving (--min-budget): all configs are trained with min_budget
+episodes (Q) or generations (evolution), the best 1/eta go on with eta times
+the budget, and so on up to max_budget. Without it every config runs once
+with max_budget, or with its own (or the Config) budget when that is not
+given. Either way the budget itself cannot also be in the search space.
+
+Output, streamed as runs finish:
+    <out>/sweep.json    parameters and configs (checked when resuming)
+    <out>/results.csv   one row per finished run
+    <out>/runs/         trained policies / genomes, named after the run
+    <out>/best.json     best config of the last rung
+Running the same command again resumes: runs already in results.csv are
+not repeated.
+"""
+import argparse
+import ast
+import csv
+import io
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import matplotlib
+
+import Config as C
+from Agents.LearningAgent import LearningAgent
+from Evaluation.CompareAll import run_episode
+from Environments.Lighthouse import load_cached_map as load_farol
+from Environments.Maze import load_cached_map as load_maze
+from Learning.Adapters.FarolAdapter import FarolAdapter
+from Learning.Adapters.MazeAdapter import MazeAdapter
+from Learning.Brains.GenomeBrain import GenomeBrain
+from Learning.Brains.QLearningBrain import make_q_brain
+from Learning.Brains.PolicyFile import EXTENSION as POLICY_EXTENSION
+
+METHODS = ("qlearning", "qlearning_vec", "evolution")
+RESULTS = "results.csv"
+MANIFEST = "sweep.json"
+BEST = "best.json"
+SEED_STRIDE = 1_000_000_007
+
+# Config name -> Q trainer argument
+Q_ARGS = {
+    "Q_EPISODES": "episodes",
+    "Q_MAX_STEPS": "max_steps",
+    "Q_ALPHA": "alpha",
+    "Q_GAMMA": "gamma",
+    "Q_EPSILON": "epsilon",
+    "Q_VEC_ENVS": "n_envs",
+}
+
+# Config name -> evolution trainer module constant
+EVO_CONSTANTS = {
+    "EVO_POP_SIZE": "POP_SIZE",
+    "EVO_GENERATIONS": "GENERATIONS",
+    "EVO_STEPS_PER_AGENT": "STEPS_PER_AGENT",
+    "K_NEIGHBORS": "K_NEIGHBORS",
+    "EVO_MUTATION_RATE": "MUTATION_RATE",
+    "EVO_MUTATION_STD": "MUTATION_STD",
+    "ARCHIVE_ADD_TOP": "ARCHIVE_ADD_TOP",
+    "NOVELTY_ALPHA": "ALPHA",
+    "EVO_PARENTS": "PARENTS",
+    "EVO_ELITE": "ELITE",
+    "EVO_HIDDEN": "HIDDEN",
+}
+
+# the budget successive halving grows
+BUDGET = {"qlearning": "Q_EPISODES", "qlearning_vec": "Q_EPISODES", "evolution": "EVO_GENERATIONS"}
+
+
+# ---------------------------------------------------------
+# SEARCH SPACES
+# ---------------------------------------------------------
+def grid_configs(space):
+    """{name: [values]} -> every combination, as a list of {name: value}."""
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"grid search needs a list of values for {name}, got {values!r}")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*space.values())]
+
+
+def sample_value(spec, rng):
+    """
+    A list is a choice; ("uniform", lo, hi), ("loguniform", lo, hi) and
+    ("int", lo, hi) (inclusive) are ranges.
+    """
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    kind, lo, hi = spec
+    if kind == "uniform":
+        return rng.uniform(lo, hi)
+    if kind == "loguniform":
+        return math.exp(rng.uniform(math.log(lo), math.log(hi)))
+    if kind == "int":
+        return rng.randint(int(lo), int(hi))
+    raise ValueError(f"unknown distribution {kind!r} (uniform, loguniform, int or a list)")
+
+
+def random_configs(space, n, seed=0):
+    """n configs drawn from the space (see sample_value)."""
+    rng = random.Random(seed)
+    return [{name: sample_value(spec, rng) for name, spec in space.items()} for _ in range(n)]
+
+
+def halving_budgets(min_budget, max_budget, eta):
+    """min_budget, min_budget * eta, ... below max_budget, then max_budget."""
+    if min_budget < 1 or max_budget < min_budget or eta < 2:
+        raise ValueError("need 1 <= min_budget <= max_budget and eta >= 2")
+    budgets, b = [], min_budget
+    while b < max_budget:
+        budgets.append(b)
+        b *= eta
+    budgets.append(max_budget)
+    return budgets
+
+
+def run_seed(base_seed, config_id, repeat, repeats):
+    return base_seed * SEED_STRIDE + config_id * repeats + repeat
+
+
+def run_name(config_id, rung, repeat):
+    return f"c{config_id:04d}_r{rung}_s{repeat}"
+
+
+def check_params(method, names):
+    for name in names:
+        if not hasattr(C, name):
+            raise ValueError(f"{name} is not a Config value")
+        if name == "Q_VEC_ENVS" and method != "qlearning_vec":
+            raise ValueError("Q_VEC_ENVS only applies to method qlearning_vec")
+        if name in EVO_CONSTANTS and method != "evolution":
+            raise ValueError(f"{name} only applies to method evolution")
+        if name in Q_ARGS and method == "evolution":
+            raise ValueError(f"{name} does not apply to method evolution")
+
+
+# ---------------------------------------------------------
+# WORKER (runs in the pool)
+# ---------------------------------------------------------
+class _Patched:
+    """Set attributes on an object (module) and put the old values back on exit."""
+
+    def __init__(self, target, values):
+        self.target = target
+        self.values = values
+        self.old = {}
+
+    def __enter__(self):
+        for name, value in self.values.items():
+            self.old[name] = getattr(self.target, name)
+            setattr(self.target, name, value)
+        return self.target
+
+    def __exit__(self, *exc):
+        for name, value in self.old.items():
+            setattr(self.target, name, value)
+        return False
+
+
+def _evaluate(task, map_file, brain, adapter, runs):
+    load, max_steps = (load_farol, C.MAX_STEPS_FAROL) if task == "farol" else (load_maze, C.MAX_STEPS_MAZE)
+    succ, steps = 0, 0
+    for _ in range(runs):
+        env, starts, _, _ = load(map_file)
+        agent = LearningAgent("SWEEP", env, tuple(starts["A"]), adapter, brain)
+        agent.set_mode("test")
+        ok, st = run_episode(env, agent, max_steps)
+        succ += int(ok)
+        steps += st
+    return succ / runs, steps / runs
+
+
+def _train_q(task, method, map_file, params, seed, out_path):
+    kwargs = {Q_ARGS[k]: v for k, v in params.items() if k in Q_ARGS}
+    if method == "qlearning_vec":
+        from Training.TrainQLearningVec import train_qlearning_vec
+        train_qlearning_vec(task, map_file=map_file, out_policy=out_path, seed=seed, **kwargs)
+    elif task == "farol":
+        from Training.TrainQLearningLighthouse import train_qlearning_lighthouse
+        train_qlearning_lighthouse(map_file, out_policy=out_path, plot=False, **kwargs)
+    else:
+        from Training.TrainQLearningMaze import train_qlearning_maze
+        train_qlearning_maze(map_file, out_policy=out_path, plot=False, **kwargs)
+
+    if task == "farol":
+        adapter = FarolAdapter(encoding=C.Q_STATE_ENCODING)
+    else:
+        adapter = MazeAdapter(include_position=True, encoding=C.Q_STATE_ENCODING)
+    brain = make_q_brain(C.Q_BACKEND, actions=adapter.ACTIONS)
+    brain.load(out_path, adapter=adapter)
+    return brain, adapter
+
+
+def _train_evolution(task, map_file, params, out_path):
+    if task == "farol":
+        import Training.TrainEvolutionLighthouse as trainer
+        train, adapter = trainer.train_evolution_farol, FarolAdapter()
+    else:
+        import Training.TrainEvolutionMaze as trainer
+        train, adapter = trainer.train_evolution_maze, MazeAdapter(include_position=False)
+
+    constants = {EVO_CONSTANTS[k]: v for k, v in params.items() if k in EVO_CONSTANTS}
+    with _Patched(trainer, constants):
+        train(map_file, out_genome=out_path)
+        hidden = trainer.HIDDEN
+
+    with open(out_path, "r") as f:
+        genome = [float(x) for x in f.read().strip().split(",")]
+    brain = GenomeBrain(
+        genome=genome,
+        inputs=adapter.observation_size(),
+        hidden=hidden,
+        outputs=adapter.action_size(),
+        action_order=adapter.ACTIONS
+    )
+    return brain, adapter
+
+
+def _run_one(task, method, map_file, params, seed, out_path, eval_runs):
+    """Train one config with its seed, evaluate it; the trainers' prints are dropped."""
+    matplotlib.use("Agg")    # workers never show the trainers' plots
+    config_values = {k: v for k, v in params.items() if k not in Q_ARGS and k not in EVO_CONSTANTS}
+    start = time.perf_counter()
+    random.seed(seed)
+
+    with _Patched(C, config_values), redirect_stdout(io.StringIO()):
+        if method == "evolution":
+            brain, adapter = _train_evolution(task, map_file, params, out_path)
+        else:
+            brain, adapter = _train_q(task, method, map_file, params, seed, out_path)
+        success_rate, avg_steps = _evaluate(task, map_file, brain, adapter, eval_runs)
+
+    return {
+        "success_rate": success_rate,
+        "avg_steps": avg_steps,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def _rank_key(result):
+    """Higher is better: success rate, then fewer steps (failed runs last)."""
+    if result is None:
+        return (-1.0, 0.0)
+    return (result["success_rate"], -result["avg_steps"])
+
+
+def _check_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            old = json.load(f)
+        if old != manifest:
+            raise ValueError(
+                f"{out_dir} holds a sweep with different parameters; "
+                f"use another --out or the same options"
+            )
+    else:
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=4)
+
+
+def _done_runs(results_path):
+    """{run name: row} for the runs already in results.csv (failed runs are run again)."""
+    done = {}
+    if not os.path.exists(results_path):
+        return done
+    with open(results_path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("error") or not row.get("success_rate"):
+                continue
+            done[row["run"]] = {
+                "success_rate": float(row["success_rate"]),
+                "avg_steps": float(row["avg_steps"]),
+                "seconds": float(row["seconds"]),
+            }
+    return done
+
+
+def run_sweep(task, method, configs, out_dir, map_file=None, min_budget=None, max_budget=None,
+              eta=3, repeats=1, seed=0, eval_runs=10, workers=None):
+    """
+    Train and score every config (a list of {Config name: value}) in a
+    process pool, with successive halving when min_budget is given.
+    Returns the last rung's configs, best first, as
+    (config_id, params, budget, {success_rate, avg_steps, seconds}).
+    """
+    if task not in ("farol", "maze"):
+        raise ValueError("task must be 'farol' or 'maze'")
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    if not configs:
+        raise ValueError("no configs to run")
+
+    names = sorted({name for params in configs for name in params})
+    check_params(method, names)
+    budget_name = BUDGET[method]
+
+    if budget_name in names and (min_budget is not None or max_budget is not None):
+        raise ValueError(f"{budget_name} is set by min_budget/max_budget; leave it out of the search space")
+
+    if min_budget is not None:
+        if max_budget is None:
+            max_budget = getattr(C, budget_name)
+        budgets = halving_budgets(min_budget, max_budget, eta)
+    else:
+        budgets = [max_budget]    # None: each config's own value (or Config)
+
+    map_file = map_file or (C.FAROL_MAP if task == "farol" else C.MAZE_MAP)
+    os.makedirs(os.path.join(out_dir, "runs"), exist_ok=True)
+    _check_manifest(out_dir, {
+        "task": task,
+        "method": method,
+        "map_file": os.path.abspath(map_file),
+        "configs": configs,
+        "budgets": budgets,
+        "eta": eta,
+        "repeats": repeats,
+        "seed": seed,
+        "eval_runs": eval_runs,
+    })
+
+    results_path = os.path.join(out_dir, RESULTS)
+    done = _done_runs(results_path)
+    columns = ["run", "config", "rung", "budget", "repeat", "seed", *names,
+               "success_rate", "avg_steps", "seconds", "artifact", "error"]
+    new_file = not os.path.exists(results_path) or os.path.getsize(results_path) == 0
+    artifact_ext = ".txt" if method == "evolution" else POLICY_EXTENSION
+
+    survivors = list(range(len(configs)))
+    ranking = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(results_path, "a", newline="") as out:
+        table = csv.DictWriter(out, fieldnames=columns)
+        if new_file:
+            table.writeheader()
+            out.flush()
+
+        for rung, budget in enumerate(budgets):
+            runs = {}    # config id -> [result per repeat]
+            pending = {}
+            for cid in survivors:
+                params = dict(configs[cid])
+                if budget is not None:
+                    params[budget_name] = budget
+                for rep in range(repeats):
+                    name = run_name(cid, rung, rep)
+                    if name in done:
+                        runs.setdefault(cid, []).append(done[name])
+                        continue
+                    artifact = os.path.join(out_dir, "runs", name + artifact_ext)
+                    s = run_seed(seed, cid, rep, repeats)
+                    fut = pool.submit(_run_one, task, method, map_file, params, s, artifact, eval_runs)
+                    pending[fut] = (name, cid, rep, s, params, artifact)
+
+            for fut in as_completed(pending):
+                name, cid, rep, s, params, artifact = pending[fut]
+                row = {"run": name, "config": cid, "rung": rung, "repeat": rep, "seed": s,
+                       "budget": params.get(budget_name, getattr(C, budget_name)),
+                       "artifact": os.path.relpath(artifact, out_dir)}
+                row.update({k: configs[cid].get(k, "") for k in names})
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    row["error"] = f"{type(e).__name__}: {e}"
+                    runs.setdefault(cid, []).append(None)
+                else:
+                    row.update(result)
+                    runs.setdefault(cid, []).append(result)
+                table.writerow(row)
+                out.flush()
+
+            ranking = []
+            for cid in survivors:
+                ok = [r for r in runs.get(cid, []) if r is not None]
+                summary = None
+                if len(ok) == repeats:
+                    summary = {key: sum(r[key] for r in ok) / repeats
+                               for key in ("success_rate", "avg_steps", "seconds")}
+                run_budget = configs[cid].get(budget_name, getattr(C, budget_name)) if budget is None else budget
+                ranking.append((cid, configs[cid], run_budget, summary))
+            ranking.sort(key=lambda entry: _rank_key(entry[3]), reverse=True)
+
+            best = ranking[0]
+            print(
+                f"[Sweep] rung {rung + 1}/{len(budgets)} | budget={budget or 'per config'} | "
+                f"{len(survivors)} configs | best c{best[0]:04d} {best[1]} -> {best[3]}"
+            )
+            if rung + 1 < len(budgets):
+                survivors = [cid for cid, _, _, _ in ranking[:max(1, len(ranking) // eta)]]
+
+    cid, params, budget, summary = ranking[0]
+    with open(os.path.join(out_dir, BEST), "w") as f:
+        json.dump({
+            "config": cid,
+            "params": params,
+            "budget": budget,
+            "result": summary,
+            "artifacts": [os.path.join("runs", run_name(cid, len(budgets) - 1, rep) + artifact_ext)
+                          for rep in range(repeats)],
+        }, f, indent=4)
+    print(f"[Sweep] best config -> {os.path.join(out_dir, BEST)}")
+    return ranking
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def _parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_space(items):
+    """
+    ["NAME=v1,v2,...", "NAME=uniform:lo:hi", ...] -> {NAME: [values] or (kind, lo, hi)}
+    (kinds: uniform, loguniform, int).
+    """
+    space = {}
+    for item in items:
+        name, sep, text = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected NAME=values, got {item!r}")
+        kind, _, bounds = text.partition(":")
+        if kind in ("uniform", "loguniform", "int"):
+            lo, hi = (float(v) for v in bounds.split(":"))
+            space[name.strip()] = (kind, lo, hi)
+        else:
+            space[name.strip()] = [_parse_value(v) for v in text.split(",")]
+    return space
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep (grid or random) with successive halving.")
+    parser.add_argument("task", choices=("farol", "maze"))
+    parser.add_argument("method", choices=METHODS)
+    parser.add_argument("space", nargs="+", help="NAME=v1,v2,... or NAME=uniform|loguniform|int:lo:hi")
+    search = parser.add_mutually_exclusive_group()
+    search.add_argument("--grid", action="store_true", help="every combination (the default)")
+    search.add_argument("--random", type=int, default=None, metavar="N", help="N random configs")
+    parser.add_argument("--map", default=None, help="default: Config FAROL_MAP / MAZE_MAP")
+    parser.add_argument("--out", default=None, help="default: Resources/sweeps/<task>_<method>")
+    parser.add_argument("--min-budget", type=int, default=None,
+                        help="enable successive halving from this many episodes / generations")
+    parser.add_argument("--max-budget", type=int, default=None, help="default: Config Q_EPISODES / EVO_GENERATIONS")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the configs per rung")
+    parser.add_argument("--repeats", type=int, default=1, help="seeds per config")
+    parser.add_argument("--eval-runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    space = parse_space(args.space)
+    if args.random:
+        configs = random_configs(space, args.random, seed=args.seed)
+    else:
+        configs = grid_configs(space)
+
+    out = args.out or os.path.join(C.BASE_DIR, "Resources", "sweeps", f"{args.task}_{args.method}")
+    ranking = run_sweep(
+        args.task, args.method, configs, out,
+        map_file=args.map,
+        min_budget=args.min_budget,
+        max_budget=args.max_budget,
+        eta=args.eta,
+        repeats=args.repeats,
+        seed=args.seed,
+        eval_runs=args.eval_runs,
+        workers=args.workers,
+    )
+
+    print("\n================= SWEEP RESULTS =================")
+    for cid, params, budget, summary in ranking:
+        if summary is None:
+            print(f"c{cid:04d} | {params} | failed (see {RESULTS})")
+            continue
+        print(
+            f"c{cid:04d} | {params} | budget={budget} | "
+            f"success={100 * summary['success_rate']:.1f}% | avg_steps={summary['avg_steps']:.1f}"
+        )
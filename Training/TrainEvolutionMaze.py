@@ -7,7 +7,8 @@ import Config as C
 from Learning.Brains.GenomeBrain import GenomeBrain
 from Learning.Adapters.MazeAdapter import MazeAdapter
 from Agents.LearningAgent import LearningAgent
-from Environments.Maze import load_fixed_map
+from Environments.Maze import load_cached_map
+from Environments.Corpus import corpus_maps
 
 POP_SIZE        = C.EVO_POP_SIZE
 GENERATIONS     = C.EVO_GENERATIONS
@@ -103,9 +104,12 @@ def evaluate_individual(template_env, genome, start_pos, adapter):
     return desc, agent.reached_goal, fit
 
 
-def train_evolution_maze(map_file: str):
-    template_env, start_positions, _, _ = load_fixed_map(map_file)
-    start_pos = tuple(start_positions["A"])
+def train_evolution_maze(map_file: str, out_genome: str = None, corpus=None):
+    """With corpus (a MapCorpus or its folder) each generation is evaluated on the next corpus map."""
+    maps = corpus_maps(corpus, "maze") if corpus is not None else None
+    if maps is None:
+        template_env, start_positions, _, _ = load_cached_map(map_file)
+        start_pos = tuple(start_positions["A"])
     adapter = MazeAdapter()
 
     genome_size = GenomeBrain.genome_size(
@@ -129,6 +133,9 @@ def train_evolution_maze(map_file: str):
 
     for gen in range(GENERATIONS):
         print(f"\n===== MAZE GENERATION {gen+1}/{GENERATIONS} =====")
+        if maps is not None:
+            template_env, start_positions, _, _ = next(maps)
+            start_pos = tuple(start_positions["A"])
 
         behaviours, reached_flags, fitnesses = [], [], []
 
@@ -179,11 +186,12 @@ def train_evolution_maze(map_file: str):
 
         population = new_population
 
-    with open(C.MAZE_GENOME, "w") as f:
+    out_genome = C.MAZE_GENOME if out_genome is None else out_genome
+    with open(out_genome, "w") as f:
         f.write(",".join(str(x) for x in best_overall_genome))
 
-    print(f"\n✅ Saved best genome to: {C.MAZE_GENOME}")
-    return best_novels, mean_novels, archive, reached_per_gen, C.MAZE_GENOME
+    print(f"\n✅ Saved best genome to: {out_genome}")
+    return best_novels, mean_novels, archive, reached_per_gen, out_genome
 
 
 def plot_novelty(best, mean, reached_per_gen):
@@ -2,10 +2,11 @@
 import matplotlib.pyplot as plt
 import Config as C
 
-from Learning.Brains.QLearningBrain import QLearningBrain
+from Learning.Brains.QLearningBrain import make_q_brain
 from Learning.Adapters.MazeAdapter import MazeAdapter
 from Agents.LearningAgent import LearningAgent
-from Environments.Maze import load_fixed_map
+from Environments.Maze import load_cached_map
+from Environments.Corpus import corpus_maps
 
 EPISODES  = C.Q_EPISODES
 MAX_STEPS = C.Q_MAX_STEPS
@@ -25,15 +26,33 @@ def plot_learning_curve(rewards, title="Learning Curve — Maze (Q-learning)"):
     plt.show()
 
 
-def train_qlearning_maze(map_file: str, out_policy: str = None, plot: bool = True):
+def train_qlearning_maze(map_file: str, out_policy: str = None, plot: bool = True,
+                         episodes: int = None, max_steps: int = None,
+                         alpha: float = None, gamma: float = None, epsilon: float = None,
+                         corpus=None):
+    """
+    Hyperparameters default to Config (Q_EPISODES, Q_MAX_STEPS, Q_ALPHA, ...).
+    With corpus (a MapCorpus or its folder) every episode runs on the next
+    corpus map instead of map_file.
+    """
+    episodes = EPISODES if episodes is None else episodes
+    max_steps = MAX_STEPS if max_steps is None else max_steps
+    alpha = ALPHA if alpha is None else alpha
+    gamma = GAMMA if gamma is None else gamma
+    epsilon = EPSILON if epsilon is None else epsilon
+
     # IMPORTANT: include position for Q-learning (avoids state aliasing)
-    adapter = MazeAdapter(include_position=True)
-    brain = QLearningBrain(alpha=ALPHA, gamma=GAMMA, epsilon=EPSILON)
+    adapter = MazeAdapter(include_position=True, encoding=C.Q_STATE_ENCODING)
+    brain = make_q_brain(C.Q_BACKEND, actions=adapter.ACTIONS, alpha=alpha, gamma=gamma, epsilon=epsilon)
 
     episode_rewards = []
+    maps = corpus_maps(corpus, "maze") if corpus is not None else None
 
-    for ep in range(EPISODES):
-        env, start_positions, _, _ = load_fixed_map(map_file)
+    for ep in range(episodes):
+        if maps is None:
+            env, start_positions, _, _ = load_cached_map(map_file)
+        else:
+            env, start_positions, _, _ = next(maps)
         start_pos = tuple(start_positions["A"])
 
         agent = LearningAgent("QL", env, start_pos, adapter, brain)
@@ -42,7 +61,7 @@ def train_qlearning_maze(map_file: str, out_policy: str = None, plot: bool = Tru
 
         total_reward = 0.0
 
-        for step in range(1, MAX_STEPS + 1):
+        for step in range(1, max_steps + 1):
             obs = env.observacaoPara(agent)
             agent.observacao(obs)
 
@@ -64,7 +83,7 @@ def train_qlearning_maze(map_file: str, out_policy: str = None, plot: bool = Tru
                 agent.state,
                 obs2,
                 step,
-                MAX_STEPS
+                max_steps
             )
             total_reward += float(r)
 
@@ -88,7 +107,7 @@ def train_qlearning_maze(map_file: str, out_policy: str = None, plot: bool = Tru
 
     # save policy
     save_path = C.MAZE_POLICY if out_policy is None else out_policy
-    brain.save(save_path)
+    brain.save(save_path, adapter=adapter)
     print(f"✅ Saved policy to: {save_path}")
 
     # plot curve
@@ -0,0 +1,300 @@
+# Training/TrainQLearningVec.py
+"""
+Batched Q-learning: B episodes stepped in lockstep on a VecWorld, with the
+epsilon-greedy choice and the TD update done as NumPy array operations over
+an integer-indexed Q-table (packed adapter states, see TaskAdapter).
+
+    python -m Training.TrainQLearningVec maze --episodes 1000000 --envs 1024
+
+The rules are those of train_qlearning_maze / train_qlearning_lighthouse:
+rewards, termination, which (state, action) pairs enter the table, q_next =
+max over the next state's known actions and no bootstrap after the goal.
+
+rng="python": every environment draws from its own random.Random (env i:
+seed + i * SEED_STRIDE) with the same calls as QLearningBrain.select_action,
+so B=1 reproduces the legacy trainer run after random.seed(seed) exactly.
+rng="numpy": all environments draw at once from one NumPy generator
+(fastest, different stream).
+
+With B > 1 the TD targets of a step all come from the table before the
+step; environments updating the same (state, action) in one step move it
+towards the mean of their targets.
+"""
+import argparse
+import random
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import Config as C
+from Environments.VecWorld import VecWorld
+from Environments.Lighthouse import load_cached_map as load_farol
+from Environments.Maze import load_cached_map as load_maze
+from Environments.Corpus import corpus_maps
+from Learning.Adapters.FarolAdapter import FarolAdapter
+from Learning.Adapters.MazeAdapter import MazeAdapter, CORE_BITS, POS_BITS
+from Learning.Brains.NumpyQLearningBrain import NumpyQLearningBrain
+
+SEED_STRIDE = 1_000_003
+
+
+def _nth_bit_table(n_bits=8):
+    """[mask, k] -> index of the k-th set bit of mask (ascending), -1 past the popcount."""
+    table = np.full((1 << n_bits, n_bits), -1, dtype=np.int64)
+    for mask in range(1 << n_bits):
+        bits = [i for i in range(n_bits) if mask >> i & 1]
+        table[mask, :len(bits)] = bits
+    return table
+
+
+_NTH_BIT = _nth_bit_table()
+_POPCOUNT = (_NTH_BIT >= 0).sum(axis=1)
+
+
+# ---------------------------------------------------------
+# PACKED STATES (same ints as the adapters' encoding="packed")
+# ---------------------------------------------------------
+def _encode_farol(vec, obs, rows):
+    moves = obs["moves"][rows].astype(np.int64)
+    return obs["direction"][rows] | (~moves & 0xFF) << 4
+
+
+def _encode_maze(vec, obs, rows):
+    moves = obs["moves"][rows].astype(np.int64)
+    core = (
+        (~moves & 0xF)
+        | obs["goal_adj"][rows].astype(np.int64) << 4
+        | (vec.last_action[rows] + 1) << 8
+    )
+    return ((obs["x"][rows] << POS_BITS | obs["y"][rows]) << CORE_BITS) | core
+
+
+class VecQTable:
+    """Packed state -> row interning, a (rows x actions) value matrix and known-action bitmasks."""
+
+    def __init__(self, n_actions, capacity=4096):
+        if n_actions > 8:
+            raise ValueError("VecQTable supports at most 8 actions")
+        self.ids = {}
+        self.keys = []
+        self.values = np.zeros((capacity, n_actions), dtype=np.float64)
+        self.known = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self, keys):
+        """Row of every key, adding the new ones (in first-seen order)."""
+        uniq, first, inv = np.unique(keys, return_index=True, return_inverse=True)
+        get = self.ids.get
+        found = [get(k) for k in uniq.tolist()]
+        for j in sorted((j for j, r in enumerate(found) if r is None), key=lambda j: first[j]):
+            found[j] = self._add(int(uniq[j]))
+        return np.array(found, dtype=np.int64)[inv.ravel()]
+
+    def _add(self, key):
+        row = len(self.keys)
+        if row == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.known = np.concatenate([self.known, np.zeros_like(self.known)])
+        self.ids[key] = row
+        self.keys.append(key)
+        return row
+
+
+def _masked_max(values, masks, n_actions):
+    """Per row: max of values over the set bits of masks (-inf where the mask is empty)."""
+    bits = (masks[:, None] >> np.arange(n_actions)) & 1 == 1
+    return np.where(bits, values, -np.inf).max(axis=1), bits
+
+
+def plot_learning_curve(rewards, title):
+    plt.figure(figsize=(10, 4))
+    plt.plot(rewards)
+    plt.xlabel("Episode")
+    plt.ylabel("Total reward")
+    plt.title(title)
+    plt.grid(True)
+    plt.show()
+
+
+# ---------------------------------------------------------
+# TRAINER
+# ---------------------------------------------------------
+def train_qlearning_vec(task, map_file=None, out_policy=None, episodes=None, n_envs=None,
+                        max_steps=None, alpha=None, gamma=None, epsilon=None, seed=0,
+                        rng="python", plot=False, log_every=None, corpus=None):
+    """
+    Train Q-learning on `task` ("farol" | "maze") with n_envs environments in
+    lockstep until `episodes` episodes have run. Saves the policy like the
+    single-episode trainers (Config.Q_STATE_ENCODING keys) and returns
+    (save_path, episode_rewards) with rewards in episode completion order.
+
+    With corpus (a MapCorpus or its folder) the episodes run in batches of
+    n_envs, each batch on the next corpus map, all updating one table.
+    """
+    if rng not in ("python", "numpy"):
+        raise ValueError("rng must be 'python' or 'numpy'")
+
+    if task == "farol":
+        load, default_map = load_farol, C.FAROL_MAP
+        adapter = FarolAdapter(encoding="packed")
+        save_adapter = FarolAdapter(encoding=C.Q_STATE_ENCODING)
+        encode = _encode_farol
+        default_out = C.FAROL_POLICY
+    elif task == "maze":
+        load, default_map = load_maze, C.MAZE_MAP
+        adapter = MazeAdapter(include_position=True, encoding="packed")
+        save_adapter = MazeAdapter(include_position=True, encoding=C.Q_STATE_ENCODING)
+        encode = _encode_maze
+        default_out = C.MAZE_POLICY
+    else:
+        raise ValueError("task must be 'farol' or 'maze'")
+
+    episodes = C.Q_EPISODES if episodes is None else episodes
+    max_steps = C.Q_MAX_STEPS if max_steps is None else max_steps
+    alpha = C.Q_ALPHA if alpha is None else float(alpha)
+    gamma = C.Q_GAMMA if gamma is None else float(gamma)
+    epsilon = C.Q_EPSILON if epsilon is None else float(epsilon)
+    n_envs = max(1, min(C.Q_VEC_ENVS if n_envs is None else n_envs, episodes))
+    log_every = log_every or max(50, episodes // 20)
+
+    maps = corpus_maps(corpus, task) if corpus is not None else None
+    n_actions = len(adapter.ACTIONS)
+    table = VecQTable(n_actions)
+    action_bits = np.int64(1) << np.arange(n_actions)
+
+    if rng == "python":
+        rngs = [random.Random(seed + i * SEED_STRIDE) for i in range(n_envs)]
+    else:
+        gen = np.random.default_rng(seed)
+
+    episode_rewards = []
+    finished = 0
+    while finished < episodes:
+        # one batch of `size` episodes per map (the whole run without a corpus)
+        env, starts, _, _ = load(map_file or default_map) if maps is None else next(maps)
+        size = episodes - finished if maps is None else min(n_envs, episodes - finished)
+        batch = min(n_envs, size)
+        vec = VecWorld(env, batch, tuple(starts["A"]), max_steps)
+
+        obs = vec.reset()
+        running = np.ones(batch, dtype=bool)
+        started = batch
+        ep_reward = np.zeros(batch, dtype=np.float64)
+
+        while running.any():
+            rows = np.nonzero(running & ~vec.done)[0]
+
+            if rows.size:
+                # ---------------- select (epsilon-greedy) ----------------
+                sid = table.rows(encode(vec, obs, rows))
+                valid = obs["moves"][rows].astype(np.int64)
+                table.known[sid] |= valid
+
+                q = table.values[sid]
+                best, valid_bits = _masked_max(q, valid, n_actions)
+                best_mask = ((q == best[:, None]) & valid_bits) @ action_bits
+
+                if rng == "python":
+                    explore = np.zeros(rows.size, dtype=bool)
+                    k = np.zeros(rows.size, dtype=np.int64)
+                    n_valid, n_best = _POPCOUNT[valid].tolist(), _POPCOUNT[best_mask].tolist()
+                    for j, i in enumerate(rows.tolist()):
+                        r = rngs[i]
+                        if r.random() < epsilon:
+                            explore[j] = True
+                            k[j] = r.randrange(n_valid[j])
+                        else:
+                            k[j] = r.randrange(n_best[j])
+                else:
+                    explore = gen.random(rows.size) < epsilon
+                    counts = _POPCOUNT[np.where(explore, valid, best_mask)]
+                    k = (gen.random(rows.size) * counts).astype(np.int64)
+
+                a = _NTH_BIT[np.where(explore, valid, best_mask), k]
+                actions = np.full(batch, -1, dtype=np.int64)
+                actions[rows] = a
+
+                obs2, rewards, _ = vec.step(actions)
+
+                # ---------------- TD update ----------------
+                nid = table.rows(encode(vec, obs2, rows))
+                np.bitwise_or.at(table.known, sid, action_bits[a])
+                table.known[nid] |= obs2["moves"][rows].astype(np.int64)
+
+                q_next, _ = _masked_max(table.values[nid], table.known[nid], n_actions)
+                q_next = np.where(vec.reached[rows] | np.isneginf(q_next), 0.0, q_next)
+                r = rewards[rows]
+                target = r + gamma * q_next
+
+                flat = sid * n_actions + a
+                cells, inv = np.unique(flat, return_inverse=True)
+                inv = inv.ravel()
+                mean_target = np.bincount(inv, weights=target) / np.bincount(inv)
+                values = table.values.reshape(-1)
+                q_old = values[cells]
+                values[cells] = q_old + alpha * (mean_target - q_old)
+
+                ep_reward[rows] += r
+                obs = obs2
+
+            # ---------------- finished episodes -> next ones ----------------
+            ended = np.nonzero(running & vec.done)[0]
+            if ended.size:
+                for i in ended.tolist():
+                    episode_rewards.append(float(ep_reward[i]))
+                    if len(episode_rewards) % log_every == 0:
+                        print(
+                            f"[{task.upper()} Q-VEC] EP {len(episode_rewards)}/{episodes} "
+                            f"| total_reward={ep_reward[i]:.2f} | states={len(table)}"
+                        )
+                ep_reward[ended] = 0.0
+
+                restart = ended[:max(0, size - started)]
+                started += restart.size
+                running[ended[restart.size:]] = False
+                if restart.size:
+                    mask = np.zeros(batch, dtype=bool)
+                    mask[restart] = True
+                    obs = vec.reset(mask)
+
+        finished += size
+
+    # ---------------- save (same format as the other trainers) ----------------
+    n = len(table)
+    states = table.keys
+    if save_adapter.encoding != "packed":
+        states = [adapter.decode_state(s) for s in states]
+    brain = NumpyQLearningBrain.from_table(
+        states, table.values[:n], table.known[:n], list(adapter.ACTIONS),
+        alpha=alpha, gamma=gamma, epsilon=epsilon,
+    )
+
+    save_path = default_out if out_policy is None else out_policy
+    brain.save(save_path, adapter=save_adapter)
+    print(f"✅ Saved policy to: {save_path} ({n} states, {len(episode_rewards)} episodes, {n_envs} envs)")
+
+    if plot:
+        plot_learning_curve(episode_rewards, f"Learning Curve — {task} (batched Q-learning)")
+
+    return save_path, episode_rewards
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched Q-learning over many lockstep environments.")
+    parser.add_argument("task", choices=("farol", "maze"))
+    parser.add_argument("--map", default=None, help="default: Config FAROL_MAP / MAZE_MAP")
+    parser.add_argument("--out", default=None, help="default: Config FAROL_POLICY / MAZE_POLICY")
+    parser.add_argument("--episodes", type=int, default=None)
+    parser.add_argument("--envs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rng", choices=("python", "numpy"), default="python")
+    parser.add_argument("--corpus", default=None, help="corpus folder (GenerateCorpus.py): one map per batch")
+    parser.add_argument("--plot", action="store_true")
+    args = parser.parse_args()
+
+    train_qlearning_vec(
+        args.task, map_file=args.map, out_policy=args.out, episodes=args.episodes,
+        n_envs=args.envs, seed=args.seed, rng=args.rng, plot=args.plot, corpus=args.corpus,
+    )
@@ -0,0 +1,2 @@
+# conftest.py
+# Keeps the repository root importable for the tests in tests/ (python -m pytest or pytest).
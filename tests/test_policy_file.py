@@ -0,0 +1,120 @@
+# tests/test_policy_file.py
+"""Round trips of the binary .qpol policy format (Learning/Brains/PolicyFile.py)."""
+import pytest
+
+from Learning.Adapters.FarolAdapter import FarolAdapter
+from Learning.Adapters.MazeAdapter import MazeAdapter
+from Learning.Brains.PolicyFile import write_policy, read_policy, is_policy_file
+from Learning.Brains.QLearningBrain import QLearningBrain, make_q_brain
+
+BACKENDS = ("dict", "numpy")
+
+
+def _table(adapter):
+    """A small {state: {action: value}} table with the adapter's state shape."""
+    if adapter.encoding == "packed":
+        states = [0, 5, 1 << 40, (1 << 62) + 3]
+    else:
+        size = adapter.observation_size()
+        states = [tuple(float((i + k) % 2) for k in range(size)) for i in range(2)]
+        states.append(tuple(0.25 * k for k in range(size)))
+    actions = adapter.ACTIONS
+    return {
+        state: {a: 0.5 * i - 0.125 * c for c, a in enumerate(actions) if (i + c) % 3}
+        for i, state in enumerate(states)
+    }
+
+
+def _to_dict(brain):
+    return brain.to_dict() if hasattr(brain, "to_dict") else {s: dict(row) for s, row in brain.Q.items()}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("adapter", [
+    FarolAdapter(encoding="packed"),
+    FarolAdapter(encoding="tuple"),
+    MazeAdapter(include_position=True, encoding="packed"),
+    MazeAdapter(include_position=True, encoding="tuple"),
+], ids=lambda a: f"{type(a).__name__}-{a.encoding}")
+def test_round_trip(tmp_path, backend, adapter):
+    table = _table(adapter)
+    path = str(tmp_path / "policy.qpol")
+
+    QLearningBrain(q_table={s: dict(row) for s, row in table.items()}).save(path, adapter=adapter)
+    assert is_policy_file(path)
+
+    brain = make_q_brain(backend, actions=adapter.ACTIONS)
+    brain.load(path, adapter=adapter)
+    assert _to_dict(brain) == table
+
+    states = read_policy(path)[0]
+    assert all(type(s) is (int if adapter.encoding == "packed" else tuple) for s in states)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_numpy_brain_save_matches(tmp_path, backend):
+    adapter = MazeAdapter(include_position=True, encoding="packed")
+    table = _table(adapter)
+    src = make_q_brain("numpy", actions=adapter.ACTIONS)
+    for state, row in table.items():
+        for a, q in row.items():
+            sid, col = src._row(state), src._column(a)
+            src.values[sid, col] = q
+            src.known[sid] |= 1 << col
+
+    path = str(tmp_path / "policy.qpol")
+    src.save(path, adapter=adapter)
+    brain = make_q_brain(backend, actions=adapter.ACTIONS)
+    brain.load(path, adapter=adapter)
+    assert _to_dict(brain) == table
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_table(tmp_path, backend):
+    adapter = FarolAdapter()
+    path = str(tmp_path / "empty.qpol")
+    make_q_brain(backend, actions=adapter.ACTIONS).save(path, adapter=adapter)
+
+    states, values, known, actions, fingerprint = read_policy(path)
+    assert states == [] and len(known) == 0 and values.shape == (0, len(adapter.ACTIONS))
+    assert actions == adapter.ACTIONS and fingerprint == adapter.config_fingerprint()
+
+    brain = make_q_brain(backend, actions=adapter.ACTIONS)
+    brain.load(path, adapter=adapter)
+    assert _to_dict(brain) == {}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("trained, loading", [
+    (MazeAdapter(include_position=True), MazeAdapter(include_position=False)),
+    (MazeAdapter(include_position=True, encoding="packed"), MazeAdapter(include_position=True)),
+    (FarolAdapter(encoding="packed"), FarolAdapter(encoding="tuple")),
+])
+def test_fingerprint_refused(tmp_path, backend, trained, loading):
+    path = str(tmp_path / "policy.qpol")
+    QLearningBrain(q_table=_table(trained)).save(path, adapter=trained)
+
+    with pytest.raises(ValueError, match="another adapter config"):
+        make_q_brain(backend, actions=loading.ACTIONS).load(path, adapter=loading)
+
+
+def test_copy_on_write(tmp_path):
+    adapter = FarolAdapter(encoding="packed")
+    path = str(tmp_path / "policy.qpol")
+    QLearningBrain(q_table=_table(adapter)).save(path, adapter=adapter)
+    with open(path, "rb") as f:
+        before = f.read()
+
+    brain = make_q_brain("numpy", actions=adapter.ACTIONS)
+    brain.load(path, adapter=adapter)
+    for _ in range(20):
+        brain.update(0, "N", 1.0, 5, False, ["N", "S"])
+    brain.update(123, "SW", 2.0, 124, True)
+
+    with open(path, "rb") as f:
+        assert f.read() == before
+
+
+def test_write_policy_rejects_mixed_states(tmp_path):
+    with pytest.raises(ValueError):
+        write_policy(str(tmp_path / "bad.qpol"), [1, (0.0,)], [[0.0], [0.0]], [1, 1], ["a"])
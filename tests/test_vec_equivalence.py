@@ -0,0 +1,41 @@
+# tests/test_vec_equivalence.py
+"""
+The batched trainer with one environment must reproduce the classic
+trainers exactly (same seed -> same episode rewards and same Q-table).
+"""
+import random
+
+import pytest
+
+import Config as C
+from Learning.Brains.QLearningBrain import QLearningBrain
+from Training.TrainQLearningLighthouse import train_qlearning_lighthouse
+from Training.TrainQLearningMaze import train_qlearning_maze
+from Training.TrainQLearningVec import train_qlearning_vec
+
+EPISODES = 40
+
+LEGACY = {
+    "farol": lambda out: train_qlearning_lighthouse(C.FAROL_MAP, out_policy=out, plot=False, episodes=EPISODES),
+    "maze": lambda out: train_qlearning_maze(C.MAZE_MAP, out_policy=out, plot=False, episodes=EPISODES),
+}
+
+
+@pytest.mark.parametrize("seed", [0, 7])
+@pytest.mark.parametrize("task", ["farol", "maze"])
+def test_single_env_matches_legacy(tmp_path, task, seed):
+    legacy_path = str(tmp_path / "legacy.qpol")
+    vec_path = str(tmp_path / "vec.qpol")
+
+    random.seed(seed)
+    _, legacy_rewards = LEGACY[task](legacy_path)
+    _, vec_rewards = train_qlearning_vec(
+        task, out_policy=vec_path, episodes=EPISODES, n_envs=1, seed=seed, rng="python"
+    )
+
+    assert vec_rewards == legacy_rewards
+
+    legacy, vec = QLearningBrain(), QLearningBrain()
+    legacy.load(legacy_path)
+    vec.load(vec_path)
+    assert vec.Q == legacy.Q